@@ -55,31 +55,14 @@ n_train = int(0.9 * N_data)
 
 
 # for each data point in the raw data add a new parameter
-# zeta = A66/A11 * (b/h)^2
+# zeta = A66/A11 * (b/h)^2, computed for all rows at once
+# verified that different b values don't influence non-dim buckling load
 materials = df["material"].to_numpy()
-zeta = np.zeros((materials.shape[0],))
 ply_angles = df["ply_angle"].to_numpy()
-
-for i in range(materials.shape[0]):
-    material_name = materials[i]
-    ply_angle = ply_angles[i]
-    h = 1.0
-    b = (
-        h * X[i, 2]
-    )  # verified that different b values don't influence non-dim buckling load
-    AR = 1.0
-    a = b * AR
-    material = mlb.UnstiffenedPlateAnalysis.get_material_from_str(material_name)
-    new_plate: mlb.UnstiffenedPlateAnalysis = material(
-        comm,
-        bdf_file="plate.bdf",
-        a=a,
-        b=b,
-        h=h,
-        ply_angle=ply_angle,
-    )
-
-    zeta[i] = new_plate.zeta
+_h = 1.0
+_b = _h * X[:, 2]
+features = mlb.unstiffened_plate_features(materials, ply_angles, a=_b, b=_b, h=_h)
+zeta = features["zeta"]
 
 
 # REMOVE THE OUTLIERS in local 4d regions
@@ -128,109 +111,45 @@ affine_AR = X[:, 1]
 slenderness = X[:, 2]
 kx0 = Y[:, 0]
 
-n_data = Dstar.shape[0]
-# print(f"n data = {n_data}")
-global_outlier_mask = np.full((n_data,), False, dtype=bool)
-
-plt_ct = 0
-
-for ibin, bin in enumerate(slender_bins):
-    if ibin < len(slender_bins) - 1:
-        mask1 = np.logical_and(bin[0] <= slenderness, slenderness < bin[1])
-    else:
-        mask1 = np.logical_and(bin[0] <= slenderness, slenderness <= bin[1])
-    if np.sum(mask1) == 0:
-        continue
-
-    for iDstar, Dstar_bin in enumerate(Dstar_bins):
-        if iDstar < len(Dstar_bins) - 1:
-            mask2 = np.logical_and(Dstar_bin[0] <= Dstar, Dstar < Dstar_bin[1])
-        else:
-            mask2 = np.logical_and(Dstar_bin[0] <= Dstar, Dstar <= Dstar_bin[1])
-
-        # limit to local regions in D*, slenderness
-        layer2_mask = np.logical_and(mask1, mask2)
-
-        for iAR, AR_bin in enumerate(aff_AR_bins):
-            if iAR < len(aff_AR_bins) - 1:
-                mask3 = np.logical_and(AR_bin[0] <= affine_AR, affine_AR < AR_bin[1])
-            else:
-                mask3 = np.logical_and(AR_bin[0] <= affine_AR, affine_AR <= AR_bin[1])
-
-            mask = np.logical_and(layer2_mask, mask3)
-            # and also now in affine_AR
-            N = np.sum(mask)
-
-            # print(f"aspect ratio bin = {AR_bin}, N = {N}")
-
-            if N < 5:
-                continue
-
-            local_indices = np.where(mask)[0]
-
-            # compute a local polynomial fit - mean and covariance
-            # eliminate local outliers
-            X_local = X[mask, :]
-            t_local = Y[mask, :]
-
-            loc_AR = X_local[:, 1:2]
-            X_fit = np.concatenate([np.ones((N, 1)), loc_AR, loc_AR ** 2], axis=1)
-            # print(f"X_fit shape = {X_fit.shape}")
-            # print(f"t_local shape = {t_local.shape}")
-            w_hat = np.linalg.solve(X_fit.T @ X_fit, X_fit.T @ t_local)
-            # print(f"w_hat shape = {w_hat.shape}")
-
-            # compute the local noise
-            t_pred = X_fit @ w_hat
-            resids = t_local - t_pred
-            variance = float(1 / N * resids.T @ resids)
-            sigma = np.sqrt(variance)
-
-            # compute plotted model
-            if _plot_outliers:
-                plot_AR = np.linspace(AR_bin[0], AR_bin[1], 20).reshape((20, 1))
-                X_plot = np.concatenate(
-                    [np.ones((20, 1)), plot_AR, plot_AR ** 2], axis=1
-                )
-                t_plot = X_plot @ w_hat
+# local quadratic fits in a0/b0 over each (slenderness, D*, a0/b0) bin
+# in one grouped least-squares pass, points outside +- 2 sigma are outliers
+global_outlier_mask = mlb.binned_outlier_mask(
+    bin_values=[slenderness, Dstar, affine_AR],
+    bin_intervals=[slender_bins, Dstar_bins, aff_AR_bins],
+    x=affine_AR,
+    y=kx0,
+    degree=2,
+    min_count=5,
+    z_max=2.0,
+)
 
-                # plot the local polynomial model and its variance range
-                plt.figure("temp")
-                ax = plt.subplot(111)
-                plt.margins(x=0.05, y=0.05)
-                plt.title(
-                    f"b/h - [{bin[0]},{bin[1]}], D* - [{Dstar_bin[0]},{Dstar_bin[1]}]"
-                )
-                plt.plot(loc_AR, t_local, "ko")
-                plt.plot(plot_AR, t_plot - 2 * sigma, "r--", label=r"$\mu-2 \sigma$")
-                plt.plot(plot_AR, t_plot, "b-", label=r"$\mu$")
-                plt.plot(plot_AR, t_plot + 2 * sigma, "b--", label=r"$\mu+2 \sigma$")
-                plt.legend()
-                plt.xlabel(r"$a_0/b_0$")
-                plt.ylabel(r"$k_{x_0}$")
-                plt.savefig(
-                    os.path.join(
-                        wo_outliers_folder, f"slender{ibin}_Dstar{iDstar}_AR{iAR}.png"
-                    ),
-                    dpi=400,
+if _plot_outliers:
+    # plot the local polynomial models with the outliers indicated for sanity check
+    memberships = [
+        mlb.interval_membership(values, bins)
+        for values, bins in zip(
+            [slenderness, Dstar, affine_AR], [slender_bins, Dstar_bins, aff_AR_bins]
+        )
+    ]
+    for ibin, bin in enumerate(slender_bins):
+        for iDstar, Dstar_bin in enumerate(Dstar_bins):
+            for iAR, AR_bin in enumerate(aff_AR_bins):
+                mask = (
+                    memberships[0][:, ibin]
+                    & memberships[1][:, iDstar]
+                    & memberships[2][:, iAR]
                 )
-                plt_ct += 1
-                plt.close("temp")
-
-            # get all of the datapoints that lie outside the +- 2 sigma bounds
-            z_scores = abs(resids[:, 0]) / sigma
-            # print(f"zscores = {z_scores}")
-            outlier_mask = z_scores >= 2.0
-            if np.sum(outlier_mask) == 0:
-                continue  # no outliers found so exit
-            X_outliers = X_local[outlier_mask, :]
+                N = np.sum(mask)
+                if N < 5:
+                    continue
+                loc_AR = affine_AR[mask]
+                t_local = kx0[mask]
+                w_hat = np.polyfit(loc_AR, t_local, deg=2)
+                sigma = np.sqrt(np.mean((t_local - np.polyval(w_hat, loc_AR)) ** 2))
+                plot_AR = np.linspace(AR_bin[0], AR_bin[1], 20)
+                t_plot = np.polyval(w_hat, plot_AR)
+                outlier_mask = global_outlier_mask[mask]
 
-            # now show plot with outliers indicated for sanity check
-            if _plot_outliers:
-                loc_AR_noout = loc_AR[np.logical_not(outlier_mask), :]
-                t_local_noout = t_local[np.logical_not(outlier_mask), :]
-                loc_AR_out = loc_AR[outlier_mask, :]
-                t_local_out = t_local[outlier_mask, :]
                 plt.figure("temp", figsize=(8, 6))
                 ax = plt.subplot(111)
                 plt.margins(x=0.05, y=0.05)
@@ -238,22 +157,17 @@ for ibin, bin in enumerate(slender_bins):
                     f"b/h - [{bin[0]},{bin[1]}], D* - [{Dstar_bin[0]},{Dstar_bin[1]}]"
                 )
                 ax.fill_between(
-                    plot_AR[:, 0],
-                    t_plot[:, 0] - 2 * sigma,
-                    t_plot[:, 0] + 2 * sigma,
-                    color="g",
+                    plot_AR, t_plot - 2 * sigma, t_plot + 2 * sigma, color="g"
                 )
                 ax.plot(plot_AR, t_plot + 2 * sigma, "b--", label=r"$\mu+2 \sigma$")
                 ax.plot(plot_AR, t_plot, "b-", label=r"$\mu$")
                 ax.plot(plot_AR, t_plot - 2 * sigma, "r--", label=r"$\mu-2 \sigma$")
-                ax.plot(loc_AR_noout, t_local_noout, "ko", label="data")
-                ax.plot(loc_AR_out, t_local_out, "ro", label="outlier")
-                plt.legend()
+                ax.plot(loc_AR[~outlier_mask], t_local[~outlier_mask], "ko", label="data")
+                ax.plot(loc_AR[outlier_mask], t_local[outlier_mask], "ro", label="outlier")
                 plt.xlabel(r"$a_0/b_0$")
                 plt.ylabel(r"$k_{x_0}$")
                 box = ax.get_position()
                 ax.set_position([box.x0, box.y0, box.width * 0.8, box.height])
-                # Put a legend to the right of the current axis
                 ax.legend(loc="center left", bbox_to_anchor=(1, 0.5))
                 plt.savefig(
                     os.path.join(
@@ -261,42 +175,32 @@ for ibin, bin in enumerate(slender_bins):
                     ),
                     dpi=400,
                 )
-                plt_ct += 1
                 plt.close("temp")
 
-            # now record the outliers to the global outlier indices and remove them
-            n_outliers = np.sum(outlier_mask)
-            # print(f"local indices = {local_indices[:3]} type {type(local_indices)}")
-            # print(f"outlier mask = {outlier_mask} type {type(outlier_mask)} shape = {outlier_mask.shape}")
-            _outlier_indices = local_indices[outlier_mask]
-            # print(f"local outlier indices = {_outlier_indices} shape = {_outlier_indices.shape}")
-            for _outlier in _outlier_indices:
-                global_outlier_mask[_outlier] = True
-
 # print(f"global outlier mask = {global_outlier_mask}")
 print(f"num outliers = {np.sum(global_outlier_mask)}")
 # exit()
 
-# replace X[0] xi with log(1+xi)
-X[:, 0] += 1.0
-
-# replace X[2] the b/h slenderness column with zeta
-X[:, 2] = 1.0 + 1000.0 * zeta[:]
-
 # remove the outliers from the dataset
 keep_mask = np.logical_not(global_outlier_mask)
-X = X[keep_mask, :]
 Y = Y[keep_mask, :]
 
 # double the shear raw data since it was wrong eps_12 vs gamma_12
 if args.load == "Nxy":
     Y[:, :] *= 2.0
 
-# convert xi, a0/b0, b/h and kmin to log space
-X[:, :] = np.log(X[:, :])
+# convert xi, a0/b0, zeta and kmin to log space
+log_X = mlb.log_features(
+    xi=Dstar[keep_mask], rho_0=affine_AR[keep_mask], zeta=zeta[keep_mask]
+)
 Y[:, 0:] = np.log(Y[:, 0:])
 
-data_dict = {"x0": X[:, 0], "x1": X[:, 1], "x2": X[:, 2], "y": Y[:, 0]}
+data_dict = {
+    "x0": log_X["log(1+xi)"],
+    "x1": log_X["log(rho_0)"],
+    "x2": log_X["log(1+10^3*zeta)"],
+    "y": Y[:, 0],
+}
 
 # write out to csv file in _data folder
 new_df = pd.DataFrame(data_dict)
@@ -19,6 +19,10 @@ import argparse
 
 # choose the aspect ratio and gamma values to evaluate on the panel
 parent_parser = argparse.ArgumentParser(add_help=False)
+# coarse mesh screening before the fine solve, rejected panels go to the log file
+parent_parser.add_argument(
+    "--screen", default=False, action=argparse.BooleanOptionalAction
+)
 args = parent_parser.parse_args()
 
 
@@ -83,37 +87,21 @@ def axial_load(rho0, gamma, solve_buckling=True, first=False):
         plate_material=plate_material,
     )
 
-    _nelems = 2000
-    # MIN_Y = 20 / geometry.num_local
-    MIN_Y = 5
-    MIN_Z = 5  # 5
-    N = geometry.num_local
-    AR_s = geometry.a / geometry.h_w
-    # print(f"AR = {AR}, AR_s = {AR_s}")
-    nx = np.ceil(np.sqrt(_nelems / (1.0 / AR + (N - 1) / AR_s)))
-    den = 1.0 / AR + (N - 1) * 1.0 / AR_s
-    ny = max([np.ceil(nx / AR / N), MIN_Y])
-    # nz = max([np.ceil(nx / AR_s), MIN_Z])
-    nz = 3
-
-    # my_list = [np.ceil(nx / AR / N), MIN_Y]
-    # print(f"{my_list=}")
-
-    # print(f"{nx=} {ny=} {nz=}")
+    # smallest mesh resolving the closed-form global and local half-waves
+    mesh_sizes = stiff_analysis.adaptive_mesh_sizes(
+        shear=False, nx_stiff_mult=2, min_ny=5, min_nz=3
+    )
 
-    if solve_buckling:
-        stiff_analysis.pre_analysis(
-            nx_plate=int(nx),  # 90
-            ny_plate=int(ny),  # 30
-            nz_stiff=int(nz),  # 5
-            nx_stiff_mult=2,
-            exx=stiff_analysis.affine_exx,
-            exy=0.0,
-            clamped=False,
-            # _make_rbe=args.rbe,
-            _make_rbe=False,
-            _explicit_poisson_exp=True,
-        )
+    pre_analysis_kwargs = dict(
+        exx=stiff_analysis.affine_exx,
+        exy=0.0,
+        clamped=False,
+        # _make_rbe=args.rbe,
+        _make_rbe=False,
+        _explicit_poisson_exp=True,
+    )
+    if solve_buckling and not args.screen:
+        stiff_analysis.pre_analysis(**mesh_sizes, **pre_analysis_kwargs)
 
     comm.Barrier()
 
@@ -123,19 +111,26 @@ def axial_load(rho0, gamma, solve_buckling=True, first=False):
 
     if solve_buckling:
 
-        tacs_eigvals, errors = stiff_analysis.run_buckling_analysis(
-            sigma=5.0, num_eig=50, write_soln=True  # 50, 100
-        )
-
-        # if args.static:
-        # stiff_analysis.run_static_analysis(write_soln=True)
-        stiff_analysis.post_analysis()
-
-        global_lambda_star = stiff_analysis.get_mac_global_mode(
-            axial=True,
-            min_similarity=0.7,  # 0.5
-            local_mode_tol=0.7,
-        )
+        if args.screen:
+            global_lambda_star = stiff_analysis.run_screened_buckling_analysis(
+                axial=True,
+                mesh_sizes=mesh_sizes,
+                min_similarity=0.7,
+                local_mode_tol=0.7,
+                log_file="axial_rejected.csv",
+                write_soln=True,
+                **pre_analysis_kwargs,
+            )
+        else:
+            # shift from the closed-form global load, more eigenpairs only if no global mode
+            global_lambda_star = stiff_analysis.run_guided_buckling_analysis(
+                axial=True,
+                num_eig=10,
+                max_num_eig=50,
+                min_similarity=0.7,
+                local_mode_tol=0.7,
+                write_soln=True,
+            )
         # global_lambda_star = stiff_analysis.min_global_mode_eigenvalue
 
         if global_lambda_star is None:
@@ -35,6 +35,10 @@ parent_parser.add_argument(
 )
 
 parent_parser.add_argument("--nelems", type=int, default=2000)
+# extrapolated shift and interpolated previous mode along each rho0 chain
+parent_parser.add_argument(
+    "--continuation", default=False, action=argparse.BooleanOptionalAction
+)
 
 parent_parser.add_argument("--nrho0", type=int, default=20)
 parent_parser.add_argument("--rho0Min", type=float, default=0.2)
@@ -77,6 +81,7 @@ def get_buckling_load(
     plyAngle, 
     _nstiff, 
     prev_dict=None,
+    path=None,
     solve_buckling=True, 
     first=False
 ):
@@ -158,7 +163,19 @@ def get_buckling_load(
 
     comm.Barrier()
 
-    if solve_buckling:
+    if solve_buckling and path is not None:
+        global_lambda_star = stiff_analysis.run_continuation_buckling_analysis(
+            path,
+            param=stiff_analysis.affine_aspect_ratio,
+            axial=args.axial,
+            local_mode_tol=0.75,
+            write_soln=True,
+        )
+        if comm.rank == 0:
+            stiff_analysis.print_mode_classification()
+            print(stiff_analysis)
+
+    elif solve_buckling:
 
         tacs_eigvals, errors = stiff_analysis.run_buckling_analysis(
             sigma=5.0, num_eig=100, write_soln=True  # 50, 100
@@ -252,6 +269,7 @@ if __name__ == "__main__":
         for igamma, gamma in enumerate(gamma_vec):
             # rho0 is inner loop so that we can track the 
             eig_dict = None
+            path = mlb.ContinuationPath() if args.continuation else None
             for irho0, rho0 in enumerate(rho0_vec[::-1]):
             
                 # for nstiff in range(5, 15+1, 2):
@@ -261,7 +279,8 @@ if __name__ == "__main__":
                     gamma=gamma, 
                     plyAngle=plyAngle, 
                     _nstiff=9, # want a large # of stiffeners so that the modes are more global at low rho0
-                    prev_dict=eig_dict
+                    prev_dict=eig_dict,
+                    path=path,
                 )
 
                 if comm.rank == 0:
@@ -81,30 +81,14 @@ def shear_load(rho0, gamma, solve_buckling=True, first=False):
         plate_material=plate_material,
     )
 
-    _nelems = 2000
-    # MIN_Y = 20 / geometry.num_local
-    MIN_Y = 5
-    MIN_Z = 5  # 5
-    N = geometry.num_local
-    AR_s = geometry.a / geometry.h_w
-    # print(f"AR = {AR}, AR_s = {AR_s}")
-    nx = np.ceil(np.sqrt(_nelems / (1.0 / AR + (N - 1) / AR_s)))
-    den = 1.0 / AR + (N - 1) * 1.0 / AR_s
-    ny = max([np.ceil(nx / AR / N), MIN_Y])
-    # nz = max([np.ceil(nx / AR_s), MIN_Z])
-    nz = 3
-
-    # my_list = [np.ceil(nx / AR / N), MIN_Y]
-    # print(f"{my_list=}")
-
-    # print(f"{nx=} {ny=} {nz=}")
+    # smallest mesh resolving the closed-form global and local half-waves
+    mesh_sizes = stiff_analysis.adaptive_mesh_sizes(
+        shear=True, nx_stiff_mult=2, min_ny=5, min_nz=3
+    )
 
     if solve_buckling:
         stiff_analysis.pre_analysis(
-            nx_plate=int(nx),  # 90
-            ny_plate=int(ny),  # 30
-            nz_stiff=int(nz),  # 5
-            nx_stiff_mult=2,
+            **mesh_sizes,
             # exx=stiff_analysis.affine_exx,
             exx=0.0,
             exy=stiff_analysis.affine_exy,
@@ -122,18 +106,13 @@ def shear_load(rho0, gamma, solve_buckling=True, first=False):
 
     if solve_buckling:
 
-        tacs_eigvals, errors = stiff_analysis.run_buckling_analysis(
-            sigma=5.0, num_eig=100, write_soln=True  # 50, 100
-        )
-
-        # if args.static:
-        # stiff_analysis.run_static_analysis(write_soln=True)
-        stiff_analysis.post_analysis()
-
-        global_lambda_star = stiff_analysis.get_mac_global_mode(
+        # shift from the closed-form global load, more eigenpairs only if no global mode
+        global_lambda_star = stiff_analysis.run_guided_buckling_analysis(
             axial=False,
-            # min_similarity=0.7, #0.5
+            num_eig=10,
+            max_num_eig=100,
             local_mode_tol=0.7,
+            write_soln=True,
         )
         # global_lambda_star = stiff_analysis.min_global_mode_eigenvalue
 
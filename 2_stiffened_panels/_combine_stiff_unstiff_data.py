@@ -36,21 +36,16 @@ if not os.path.exists(data_folder) and comm.rank == 0:
 stiffened_csv = os.path.join(raw_data_folder, args.load + "_raw_stiffened.csv")
 stiff_df = pd.read_csv(stiffened_csv)
 
-X = stiff_df[["xi", "rho_0", "zeta", "gamma", "eig_FEA"]].to_numpy()
-
-# convert xi to log(1+xi)
-X[:, 0] = np.log(1.0 + X[:, 0])
-# convert rho_0 to log(rho_0)
-X[:, 1] = np.log(X[:, 1])
-# convert zeta to log(1+10^3*zeta)
-X[:, 2] = np.log(1.0 + 1e3 * X[:, 2])
-# convert gamma to log(1+gamma)
-X[:, 3] = np.log(1.0 + X[:, 3])
+# convert xi, rho_0, zeta, gamma to the log-space inputs
+log_X = mlb.log_features(
+    xi=stiff_df["xi"].to_numpy(),
+    rho_0=stiff_df["rho_0"].to_numpy(),
+    zeta=stiff_df["zeta"].to_numpy(),
+    gamma=stiff_df["gamma"].to_numpy(),
+)
+X_stiff = np.stack(list(log_X.values()), axis=1)
 # convert eig_FEA to log(eig_FEA)
-X[:, 4] = np.log(X[:, 4])
-
-Y_stiff = X[:, 4:5]
-X_stiff = X[:, :4]
+Y_stiff = np.log(stiff_df[["eig_FEA"]].to_numpy())
 
 unstiffened_csv = os.path.join(data_folder, args.load + "_unstiffened.csv")
 unstiff_df = pd.read_csv(unstiffened_csv)  # , skiprows=1)
@@ -1,14 +1,47 @@
 from .archived_model_files import *
 from .composite_material_utility import *
+from .material_registry import *
 
 import importlib
+import importlib.util
 
 tacs_loader = importlib.util.find_spec("tacs")
-if tacs_loader is not None:
-    from .unstiffened_plate_analysis import *
-    from .stiffened_plate_analysis import *
+
+# the analysis classes are imported on first access, so the materials, closed-form
+# and dataset utilities import without pyTACS, caps2tacs or MPI. Without TACS the
+# analyses only run with the scipy backend
+_LAZY_ATTRS = {
+    "UnstiffenedPlateAnalysis": ".unstiffened_plate_analysis",
+    "exp_kernel1": ".unstiffened_plate_analysis",
+    "StiffenedPlateAnalysis": ".stiffened_plate_analysis",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
+
 
 from .composite_material import *
 from .stiffened_plate_geometry import *
+from .dataset_features import *
+from .closed_form import *
+from .mesh_sizing import *
+from .mesh_convergence import *
+from .panel_mesh import *
+from .bdf_writer import *
+from .workspace import *
+from .solver_context import *
+from .continuation import *
+from .rayleigh_ritz import *
+from .sparse_shell import *
 from .plot_utils import *
 from .symbolic import *
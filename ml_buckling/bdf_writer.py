@@ -0,0 +1,179 @@
+"""
+Bulk formatting of Nastran bulk data cards from numpy arrays, each card type is
+formatted with one string operation and the whole deck is written in one call.
+"""
+__all__ = [
+    "BDF_HEADER",
+    "grid_cards",
+    "cquad4_cards",
+    "spc_cards",
+    "rbe2_cards",
+    "shell_property_cards",
+    "write_bdf",
+    "bdf_deck",
+    "nastran_model",
+]
+
+import numpy as np
+
+BDF_HEADER = (
+    "$ Input file for a square axial/shear-disp BC plate\nSOL 103\nCEND\nBEGIN BULK\n"
+)
+
+# large field GRID* with the constant fields (coord ids, seid) filled in once
+_GRID_FMT = (
+    "%-8s" % "GRID*"
+    + "%16d"
+    + "%16d" % 0
+    + "%16.9e%16.9e*       \n"
+    + "*       %16.9e"
+    + "%16d%16s%16d        \n" % (0, " ", 0)
+)
+_CQUAD4_FMT = "%-8s" % "CQUAD4" + "%8d" * 6 + "\n"
+_SPC_FMT = "%-8s%8d" % ("SPC", 1) + "%8d%8s%8.6f\n"
+_SPC_WIDE_FMT = "%-8s%16d" % ("SPC*", 1) + "%16d%16s%16.9f\n"
+
+
+def _interleave(*columns) -> tuple:
+    """row-major tuple of the columns for one %-format of many cards"""
+    rows = np.empty((len(columns[0]), len(columns)), dtype=object)
+    for icol, column in enumerate(columns):
+        rows[:, icol] = list(column)
+    return tuple(rows.ravel().tolist())
+
+
+def grid_cards(node_ids, xyz) -> str:
+    """GRID* cards of each node"""
+    node_ids = np.asarray(node_ids)
+    xyz = np.asarray(xyz, dtype=float)
+    if node_ids.shape[0] == 0:
+        return ""
+    return (_GRID_FMT * node_ids.shape[0]) % _interleave(
+        node_ids.tolist(), xyz[:, 0].tolist(), xyz[:, 1].tolist(), xyz[:, 2].tolist()
+    )
+
+
+def cquad4_cards(elem_ids, part_ids, conn) -> str:
+    """CQUAD4 cards from the (num_elems, 4) node id connectivity"""
+    values = np.concatenate(
+        [
+            np.asarray(elem_ids)[:, None],
+            np.broadcast_to(np.asarray(part_ids), (len(elem_ids),))[:, None],
+            np.asarray(conn),
+        ],
+        axis=1,
+    ).astype(int)
+    return (_CQUAD4_FMT * values.shape[0]) % tuple(values.ravel().tolist())
+
+
+def spc_cards(node_ids, dofs, values, wide=False) -> str:
+    """
+    SPC (or large field SPC* where wide) cards in set 1, dofs are the dof strings,
+    dofs, values and wide may be scalars or arrays for each card
+    """
+    node_ids = np.asarray(node_ids)
+    n = node_ids.shape[0]
+    if n == 0:
+        return ""
+    dofs = np.broadcast_to(np.asarray(dofs, dtype=str), (n,))
+    values = np.broadcast_to(np.asarray(values, dtype=float), (n,))
+    wide = np.broadcast_to(np.asarray(wide, dtype=bool), (n,))
+    fmt = "".join(np.where(wide, _SPC_WIDE_FMT, _SPC_FMT).tolist())
+    return fmt % _interleave(node_ids.tolist(), dofs.tolist(), values.tolist())
+
+
+def rbe2_cards(elem_ids, control_nodes, dependent_nodes, dof=23) -> str:
+    """RBE2 cards, dependent_nodes is a list of node id arrays for each element"""
+    cards = []
+    for eid, control_node, nodes in zip(elem_ids, control_nodes, dependent_nodes):
+        cards += [
+            "%-8s%8d%8d%8d" % ("RBE2", int(eid), int(control_node), dof)
+            + ("%8d" * len(nodes)) % tuple(int(_) for _ in nodes)
+            + "\n"
+        ]
+    return "".join(cards)
+
+
+def shell_property_cards(stiffener=True) -> str:
+    """MAT1 and PSHELL placeholder cards, the properties are set in the elemCallBack"""
+    cards = (
+        "MAT1*                 1              0.                              0. *0      \n"
+        "*0                   0.                                                 *1      \n"
+        "*1                   1.              0.              0. \n"
+        "$ Femap Property  : panel\n"
+        "PSHELL*               1               1           1.E-2               1 *0      \n"
+        "*0                   1.               1 0.8333333333333 \n"
+    )
+    if stiffener:
+        cards += (
+            "$ Femap Property  : stiff\n"
+            "PSHELL*               2               1  4.472135955E-4               1 *0      \n"
+            "*0                   1.               1 0.8333333333333 \n"
+        )
+    return cards
+
+
+def write_bdf(filename, cards):
+    """write the list of formatted card blocks to the file in one call"""
+    with open(filename, "w") as fp:
+        fp.write("".join(cards))
+
+
+def bdf_deck(mesh, stiffener=True) -> list:
+    """card blocks of the whole bdf file of a PanelMesh and its constraints"""
+    return [
+        BDF_HEADER,
+        grid_cards(mesh.node_ids, mesh.xyz),
+        cquad4_cards(mesh.elem_ids, mesh.part_ids, mesh.conn),
+        rbe2_cards(mesh.rbe_elem_ids, mesh.rbe_control_nodes, mesh.rbe_dependent_nodes),
+        spc_cards(
+            mesh.spc_node_ids, mesh.spc_dofs, mesh.spc_values, wide=mesh.spc_wide
+        ),
+        shell_property_cards(stiffener=stiffener),
+        "ENDDATA\n",
+    ]
+
+
+def nastran_model(mesh, stiffener=True):
+    """
+    in-memory pyNastran BDF model of a PanelMesh and its constraints with the
+    same cards as the written deck, can be passed to pyTACS in place of a file name
+    """
+    from pyNastran.bdf.bdf import BDF
+
+    model = BDF(debug=False)
+    for node_id, xyz in zip(mesh.node_ids.tolist(), mesh.xyz.tolist()):
+        model.add_grid(node_id, xyz)
+    for elem_id, part_id, nodes in zip(
+        mesh.elem_ids.tolist(), mesh.part_ids.tolist(), mesh.conn.tolist()
+    ):
+        model.add_cquad4(elem_id, part_id, nodes)
+    for eid, control_node, nodes in zip(
+        mesh.rbe_elem_ids.tolist(),
+        mesh.rbe_control_nodes.tolist(),
+        mesh.rbe_dependent_nodes,
+    ):
+        model.add_rbe2(eid, control_node, "23", nodes.tolist())
+    if mesh.spc_node_ids.shape[0] > 0:
+        model.add_spc(
+            1,
+            mesh.spc_node_ids.tolist(),
+            mesh.spc_dofs.tolist(),
+            mesh.spc_values.tolist(),
+        )
+
+    # placeholder properties, the elemCallBack finds components by the Femap comment
+    model.add_mat1(1, 1.0, None, 0.3)
+    model.add_pshell(
+        1, mid1=1, t=1e-2, mid2=1, mid3=1, comment=" Femap Property  : panel"
+    )
+    if stiffener:
+        model.add_pshell(
+            2,
+            mid1=1,
+            t=4.472135955e-4,
+            mid2=1,
+            mid3=1,
+            comment=" Femap Property  : stiff",
+        )
+    return model
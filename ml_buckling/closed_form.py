@@ -0,0 +1,309 @@
+"""
+Batched closed-form buckling predictions and stiffener sizing for stiffened panels.
+All functions broadcast over numpy arrays of panels so whole wings can be
+evaluated (or pre-sized) at once, scalars give the same results as StiffenedPlateAnalysis.
+"""
+__all__ = [
+    "laminate_coefficients",
+    "laminate_arrays",
+    "stiffened_panel_parameters",
+    "global_axial_load",
+    "shear_mode_parameters",
+    "global_shear_load",
+    "crippling_strain",
+    "size_stiffeners",
+]
+
+import numpy as np
+from .material_registry import material_registry
+
+# through-thickness moments of the ply stiffnesses, keyed by CompositeMaterialSpec
+_LAMINATE_CACHE = {}
+
+
+def laminate_coefficients(material) -> np.ndarray:
+    """
+    (3,4) array of the thickness moments [d1, d2, d3] of [Q11, Q12, Q22, Q66] for a unit
+    thickness laminate with z in [-1/2, 1/2], so that for thickness h and z-offset c
+        A = h * d1,  D(c) = h^3 * d3 - c * h^2 * d2 + c^2 * h * d1
+    """
+    spec = material.spec if hasattr(material, "spec") else material
+    if spec in _LAMINATE_CACHE:
+        return _LAMINATE_CACHE[spec]
+
+    props = material_registry.lookup(spec, spec.ply_angles)
+    Q = np.array([props["Q11"], props["Q12"], props["Q22"], props["Q66"]])
+    # fractions are paired ply by ply with the angles, extra fractions are unused
+    ply_fractions = spec.ply_fractions[: spec.ply_angles.shape[0]]
+    z = np.concatenate([[0.0], np.cumsum(ply_fractions)]) - 0.5
+    zL = z[:-1]
+    zU = z[1:]
+    coeffs = np.array(
+        [
+            Q @ (zU - zL),
+            Q @ (zU ** 2 - zL ** 2),
+            Q @ (zU ** 3 - zL ** 3) / 3.0,
+        ]
+    )
+    coeffs.flags.writeable = False
+    _LAMINATE_CACHE[spec] = coeffs
+    return coeffs
+
+
+def laminate_arrays(material, thickness, z_offset=0.0):
+    """
+    Aarray, Darray [11,12,22,66] with shape (4,) + broadcast shape of thickness and z_offset,
+    D is about the plane z_offset above the laminate midplane
+    """
+    d1, d2, d3 = laminate_coefficients(material)
+    h = np.asarray(thickness, dtype=float)[None]
+    c = np.asarray(z_offset, dtype=float)[None]
+    d1, d2, d3 = [_.reshape((4,) + (1,) * (h.ndim - 1)) for _ in [d1, d2, d3]]
+    Aarray = d1 * h
+    Darray = d3 * h ** 3 - c * d2 * h ** 2 + c ** 2 * d1 * h
+    return Aarray, Darray
+
+
+def stiffened_panel_parameters(
+    plate_material,
+    stiffener_material,
+    a,
+    b,
+    h,
+    h_w,
+    t_w,
+    s_p,
+    num_stiff,
+    w_b=0.0,
+    t_b=0.0,
+) -> dict:
+    """
+    non-dimensional parameters of blade stiffened panels for arrays of panels,
+    same formulas as the StiffenedPlateAnalysis properties (D11 of the plate about the
+    modulus weighted centroid, D12, D22, D66 about the plate midplane)
+    """
+    a, b, h, h_w, t_w, s_p, num_stiff, w_b, t_b = np.broadcast_arrays(
+        *[
+            np.asarray(_, dtype=float)
+            for _ in [a, b, h, h_w, t_w, s_p, num_stiff, w_b, t_b]
+        ]
+    )
+    E_P = plate_material.E_eff
+    E_S = stiffener_material.E_eff
+    A_W = t_w * h_w
+    A_B = w_b * t_b
+    A_S = A_W + A_B
+    A_P = b * h
+    has_stiff = num_stiff > 0
+
+    # modulus weighted centroid
+    _z_base = (t_b + h) / 2.0
+    _z_wall = (h_w + h) / 2.0
+    z_cen = (
+        E_S
+        * (A_B * _z_base + A_W * _z_wall)
+        * num_stiff
+        / (E_S * A_S * num_stiff + E_P * A_P)
+    )
+
+    Aarray, Darray = laminate_arrays(plate_material, h)
+    _, Darray_cen = laminate_arrays(plate_material, h, z_offset=z_cen)
+    D11 = Darray_cen[0]
+    D12, D22, D66 = Darray[1], Darray[2], Darray[3]
+    A11, A12, A22, A66 = Aarray
+    A11_eff = A11 - A12 ** 2 / A22
+
+    # stiffener bending stiffness about the centroid
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_s = E_S * (A_B * _z_base + A_W * _z_wall) / (E_S * A_S)
+        I_S = (w_b ** 3 * t_b + t_w * h_w ** 3) / 12.0
+        EI_s = E_S * I_S + E_S * A_S * (z_s - z_cen) ** 2
+        gamma = np.where(has_stiff, EI_s / s_p / D11, 0.0)
+        delta = np.where(has_stiff, E_S * A_S / (E_P * s_p * h), 0.0)
+
+    Aarray_stiff, _ = laminate_arrays(stiffener_material, t_w)
+    return {
+        "xi": (D12 + 2 * D66) / np.sqrt(D11 * D22),
+        "rho_0": a / b * (D22 / D11) ** 0.25,
+        "gamma": gamma,
+        "delta": delta,
+        "zeta_plate": A11 / A66 * (h / b) ** 2,
+        "zeta_stiff": Aarray_stiff[0] / Aarray_stiff[3] * (t_w / h_w) ** 2,
+        "centroid": z_cen,
+        "affine_exx": np.pi ** 2 * np.sqrt(D11 * D22) / b ** 2 / (1 + delta) / A11_eff,
+        "affine_exy": np.pi ** 2 * (D11 * D22 ** 3) ** 0.25 / b ** 2 / A66,
+    }
+
+
+def global_axial_load(xi, rho_0, gamma, m_max=49):
+    """
+    closed-form global mode axial load lambda* = min_m (1+gamma) m^2/rho_0^2 + rho_0^2/m^2 + 2 xi
+    returns the load and the number of half-waves m in the x-direction
+    """
+    xi, rho_0, gamma = np.broadcast_arrays(
+        *[np.asarray(_, dtype=float) for _ in [xi, rho_0, gamma]]
+    )
+    m = np.arange(1, m_max + 1).reshape((m_max,) + (1,) * xi.ndim)
+    loads = (1 + gamma) * m ** 2 / rho_0 ** 2 + rho_0 ** 2 / m ** 2 + 2 * xi
+    imin = np.argmin(loads, axis=0)
+    return np.take_along_axis(loads, imin[None], axis=0)[0], imin + 1
+
+
+def _shear_resid(s2, xi, gamma):
+    s1 = (1.0 + 2.0 * s2 ** 2 * xi + s2 ** 4 + gamma) ** 0.25
+    term1 = s2 ** 2 + s1 ** 2 + xi / 3
+    term2 = ((3 + xi) / 9.0 + 4.0 / 3.0 * s1 ** 2 * xi + 4.0 / 3.0 * s1 ** 4) ** 0.5
+    return term1 - term2
+
+
+def shear_mode_parameters(xi, gamma, s2_init=1.0, rtol=1e-12, max_iter=100):
+    """
+    mode parameters (s1, s2) of the high aspect ratio shear mode
+    w = sin(pi eta) sin(pi s1 (xi - s2 eta)) in affine coordinates, s2 is solved
+    for all panels at once with Newton's method (finite difference slopes)
+    """
+    xi, gamma = np.broadcast_arrays(*[np.asarray(_, dtype=float) for _ in [xi, gamma]])
+    s2 = np.full(xi.shape, float(s2_init))
+    for _ in range(max_iter):
+        resid = _shear_resid(s2, xi, gamma)
+        ds = 1e-7 * np.maximum(np.abs(s2), 1.0)
+        slope = (
+            _shear_resid(s2 + ds, xi, gamma) - _shear_resid(s2 - ds, xi, gamma)
+        ) / (2 * ds)
+        step = resid / slope
+        s2 = s2 - step
+        if np.all(np.abs(step) <= rtol * np.maximum(np.abs(s2), 1.0)):
+            break
+
+    s1 = (1.0 + 2.0 * s2 ** 2 * xi + s2 ** 4 + gamma) ** 0.25
+    return s1, s2
+
+
+def global_shear_load(xi, rho_0, gamma, s2_init=1.0, rtol=1e-12, max_iter=100):
+    """
+    closed-form global mode shear load of the high aspect ratio solution
+    (scaled by 1/rho_0^2 for low aspect ratios), see shear_mode_parameters
+    """
+    xi, rho_0, gamma = np.broadcast_arrays(
+        *[np.asarray(_, dtype=float) for _ in [xi, rho_0, gamma]]
+    )
+    s1, s2 = shear_mode_parameters(
+        xi, gamma, s2_init=s2_init, rtol=rtol, max_iter=max_iter
+    )
+    N12cr_highAR = (
+        (
+            1.0
+            + gamma
+            + s1 ** 4
+            + 6 * s1 ** 2 * s2 ** 2
+            + s2 ** 4
+            + 2 * xi * (s1 ** 2 + s2 ** 2)
+        )
+        / 2.0
+        / s1 ** 2
+        / s2
+    )
+    N12cr_lowAR = N12cr_highAR / rho_0 ** 2
+    return np.maximum(N12cr_highAR, N12cr_lowAR)
+
+
+def crippling_strain(stiffener_material, a, h_w, t_w):
+    """
+    axial strain at which the stiffener web cripples, the web is a long orthotropic
+    plate simply supported along the skin with one free edge
+        N_crip = 12 D66 / h_w^2 + pi^2 D11 / a^2
+    """
+    Aarray, Darray = laminate_arrays(stiffener_material, t_w)
+    N_crip = 12.0 * Darray[3] / h_w ** 2 + np.pi ** 2 * Darray[0] / a ** 2
+    return N_crip / Aarray[0]
+
+
+def size_stiffeners(
+    plate_material,
+    stiffener_material,
+    a,
+    b,
+    h,
+    s_p,
+    num_stiff,
+    gamma,
+    safety_factor=10.0,
+    shear=False,
+    stiff_AR_bounds=(1.0, 100.0),
+    num_iter=60,
+):
+    """
+    size the stiffener web height and thickness of arrays of panels so that the stiffener
+    to plate bending ratio hits the target gamma, and the crippling strain of the web is
+    at least safety_factor times the closed-form global buckling strain.
+    The most slender web (largest h_w/t_w in stiff_AR_bounds) satisfying crippling is chosen,
+    found by bisection in the web aspect ratio with an inner bisection in h_w for gamma.
+    Returns a dict of arrays h_w, t_w, stiff_AR, gamma, lambda_global and feasible.
+    """
+    a, b, h, s_p, num_stiff, gamma, safety_factor = np.broadcast_arrays(
+        *[
+            np.asarray(_, dtype=float)
+            for _ in [a, b, h, s_p, num_stiff, gamma, safety_factor]
+        ]
+    )
+    assert np.all(num_stiff > 0) and np.all(gamma > 0.0)
+
+    def _parameters(h_w, stiff_AR):
+        return stiffened_panel_parameters(
+            plate_material,
+            stiffener_material,
+            a,
+            b,
+            h,
+            h_w,
+            h_w / stiff_AR,
+            s_p,
+            num_stiff,
+        )
+
+    def _web_height(stiff_AR):
+        # gamma increases monotonically with h_w at a fixed web aspect ratio
+        log_lo = np.log(1e-3 * h)
+        log_hi = np.log(10.0 * b)
+        for _ in range(num_iter):
+            log_mid = 0.5 * (log_lo + log_hi)
+            too_stiff = _parameters(np.exp(log_mid), stiff_AR)["gamma"] > gamma
+            log_hi = np.where(too_stiff, log_mid, log_hi)
+            log_lo = np.where(too_stiff, log_lo, log_mid)
+        return np.exp(0.5 * (log_lo + log_hi))
+
+    def _margin(stiff_AR):
+        h_w = _web_height(stiff_AR)
+        params = _parameters(h_w, stiff_AR)
+        if shear:
+            lam = global_shear_load(params["xi"], params["rho_0"], params["gamma"])
+            global_strain = lam * params["affine_exy"]
+        else:
+            lam = global_axial_load(params["xi"], params["rho_0"], params["gamma"])[0]
+            global_strain = lam * params["affine_exx"]
+        crip = crippling_strain(stiffener_material, a, h_w, h_w / stiff_AR)
+        return crip - safety_factor * global_strain, h_w, params, lam
+
+    # crippling margin decreases as the web gets more slender
+    log_lo = np.full(a.shape, np.log(stiff_AR_bounds[0]))
+    log_hi = np.full(a.shape, np.log(stiff_AR_bounds[1]))
+    feasible = _margin(np.exp(log_lo))[0] >= 0.0
+    slender_ok = _margin(np.exp(log_hi))[0] >= 0.0
+    for _ in range(num_iter):
+        log_mid = 0.5 * (log_lo + log_hi)
+        ok = _margin(np.exp(log_mid))[0] >= 0.0
+        log_lo = np.where(ok, log_mid, log_lo)
+        log_hi = np.where(ok, log_hi, log_mid)
+
+    stiff_AR = np.exp(log_lo)
+    stiff_AR = np.where(slender_ok, stiff_AR_bounds[1], stiff_AR)
+    stiff_AR = np.where(feasible, stiff_AR, stiff_AR_bounds[0])
+    _, h_w, params, lam = _margin(stiff_AR)
+    return {
+        "h_w": h_w,
+        "t_w": h_w / stiff_AR,
+        "stiff_AR": stiff_AR,
+        "gamma": params["gamma"],
+        "lambda_global": lam,
+        "feasible": feasible,
+    }
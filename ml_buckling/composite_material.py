@@ -1,10 +1,131 @@
-__all__ = ["CompositeMaterial"]
+__all__ = ["CompositeMaterial", "CompositeMaterialSpec"]
 
-from .composite_material_utility import CompositeMaterialUtility
+from .material_registry import material_registry
 import numpy as np
 
 
+class CompositeMaterialSpec:
+    """
+    immutable, hashable value type of a composite laminate with the full
+    ply stack (symmetric half mirrored) precomputed as read-only arrays
+    """
+
+    __slots__ = (
+        "E11",
+        "nu12",
+        "E22",
+        "G12",
+        "G23",
+        "G13",
+        "isotropic",
+        "material_name",
+        "symmetric",
+        "ref_axis",
+        "ply_angles",
+        "rad_ply_angles",
+        "ply_fractions",
+        "num_plies",
+        "_key",
+        "_hash",
+    )
+
+    def __init__(
+        self,
+        E11,
+        nu12,
+        E22=None,
+        G12=None,
+        G23=None,
+        G13=None,
+        ply_angles=None,
+        ply_fractions=None,
+        material_name=None,
+        symmetric=True,
+        ref_axis=None,
+    ):
+        _set = lambda name, value: object.__setattr__(self, name, value)
+        _set("E11", float(E11))
+        _set("nu12", float(nu12))
+        _set("isotropic", E22 is None)
+        _set("E22", self.E11 if E22 is None else float(E22))
+        _set("G12", self.E11 / 2.0 / (1 + self.nu12) if G12 is None else float(G12))
+        _set("G23", None if G23 is None else float(G23))
+        _set("G13", None if G13 is None else float(G13))
+        _set("material_name", material_name)
+        _set("symmetric", bool(symmetric))
+        _set("ref_axis", None if ref_axis is None else tuple(float(_) for _ in ref_axis))
+
+        half_angles = np.array(
+            [] if ply_angles is None else ply_angles, dtype=float
+        )
+        half_fractions = np.array(
+            [] if ply_fractions is None else ply_fractions, dtype=float
+        )
+        if symmetric:
+            angles = np.concatenate([half_angles, half_angles[::-1]])
+            fractions = 0.5 * np.concatenate([half_fractions, half_fractions[::-1]])
+        else:
+            angles = half_angles
+            fractions = half_fractions
+        rad_angles = np.deg2rad(angles)
+        for arr in [angles, rad_angles, fractions]:
+            arr.flags.writeable = False
+        _set("ply_angles", angles)
+        _set("rad_ply_angles", rad_angles)
+        _set("ply_fractions", fractions)
+
+        # None if the ply angles and fractions are inconsistent (only checked on use)
+        valid = angles.shape[0] == fractions.shape[0] and np.sum(fractions) == 1.0
+        _set("num_plies", angles.shape[0] if valid else None)
+
+        # key holds the constructor arguments so the spec can be rebuilt when unpickled
+        key = (
+            self.E11,
+            self.nu12,
+            None if self.isotropic else self.E22,
+            self.G12,
+            self.G23,
+            self.G13,
+            tuple(half_angles.tolist()),
+            tuple(half_fractions.tolist()),
+            self.material_name,
+            self.symmetric,
+            self.ref_axis,
+        )
+        _set("_key", key)
+        _set("_hash", hash(key))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable, can't set {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable, can't delete {name}")
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, CompositeMaterialSpec):
+            return NotImplemented
+        return self._hash == other._hash and self._key == other._key
+
+    def __reduce__(self):
+        return (CompositeMaterialSpec, self._key)
+
+    def __repr__(self):
+        return (
+            f"CompositeMaterialSpec(material_name={self.material_name}, E11={self.E11}, "
+            f"E22={self.E22}, nu12={self.nu12}, G12={self.G12}, "
+            f"ply_angles={self.ply_angles.tolist()}, ply_fractions={self.ply_fractions.tolist()})"
+        )
+
+
 class CompositeMaterial:
+    """
+    mutable facade over CompositeMaterialSpec, the frozen spec is rebuilt
+    lazily after any attribute is changed
+    """
+
     def __init__(
         self,
         E11,
@@ -31,33 +152,68 @@ class CompositeMaterial:
         self.symmetric = symmetric
         self.ref_axis = np.array(ref_axis)
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != "_spec":
+            object.__setattr__(self, "_spec", None)
+
+    @property
+    def spec(self) -> CompositeMaterialSpec:
+        """frozen, hashable value of this material"""
+        if self._spec is None:
+            ref_axis = None if self.ref_axis.ndim == 0 else self.ref_axis
+            self._spec = CompositeMaterialSpec(
+                E11=self.E11,
+                nu12=self.nu12,
+                E22=self._E22,
+                G12=self._G12,
+                G23=self._G23,
+                G13=self._G13,
+                ply_angles=self._ply_angles,
+                ply_fractions=self._ply_fractions,
+                material_name=self.material_name,
+                symmetric=self.symmetric,
+                ref_axis=ref_axis,
+            )
+        return self._spec
+
+    @classmethod
+    def from_spec(cls, spec: CompositeMaterialSpec):
+        """make a facade over an existing spec"""
+        E11, nu12, E22, G12, G23, G13, half_angles, half_fractions = spec._key[:8]
+        return cls(
+            E11=E11,
+            nu12=nu12,
+            E22=E22,
+            G12=G12,
+            _G23=G23,
+            _G13=G13,
+            ply_angles=list(half_angles),
+            ply_fractions=list(half_fractions),
+            material_name=spec.material_name,
+            symmetric=spec.symmetric,
+            ref_axis=spec.ref_axis,
+        )
+
     @property
     def num_plies(self) -> int:
-        assert len(self.ply_angles) == len(self.ply_fractions)
-        assert sum(self.ply_fractions) == 1.0
-        return len(self.ply_angles)
+        assert self.spec.num_plies is not None
+        return self.spec.num_plies
 
     @property
-    def ply_angles(self) -> list:
-        if self.symmetric:
-            return self._ply_angles + self._ply_angles[::-1]
-        else:
-            return self._ply_angles
+    def ply_angles(self) -> np.ndarray:
+        return self.spec.ply_angles
 
     @property
-    def rad_ply_angles(self) -> list:
-        return np.deg2rad(self.ply_angles)
+    def rad_ply_angles(self) -> np.ndarray:
+        return self.spec.rad_ply_angles
 
     @property
-    def ply_fractions(self) -> list:
-        if self.symmetric:
-            half_fractions = [_ * 0.5 for _ in self._ply_fractions]
-            return half_fractions + half_fractions[::-1]
-        else:
-            return self._ply_fractions
+    def ply_fractions(self) -> np.ndarray:
+        return self.spec.ply_fractions
 
     def get_ply_thicknesses(self, thickness):
-        return [thickness * frac for frac in self.ply_fractions]
+        return thickness * self.spec.ply_fractions
 
     @property
     def nu21(self) -> float:
@@ -66,33 +222,26 @@ class CompositeMaterial:
 
     @property
     def E22(self) -> float:
-        if self._E22 is None:
-            return self.E11
-        else:
-            return self._E22
+        return self.spec.E22
 
     @property
     def G12(self) -> float:
-        if self._G12 is None:
-            return self.E11 / 2.0 / (1 + self.nu12)
-        else:
-            return self._G12
+        return self.spec.G12
 
     @property
     def Q_array(self):
-        _array = np.zeros((4,))
-        for iply, ply_angle in enumerate(self.ply_angles):
-            ply_frac = self.ply_fractions[iply]
-            util = CompositeMaterialUtility(
-                E11=self.E11, E22=self.E22, nu12=self.nu12, G12=self.G12
-            ).rotate_ply(ply_angle)
-
-            nu_denom = 1 - util.nu12 * util.nu21
-            _array[0] += util.E11 / nu_denom * ply_frac  # Q11
-            _array[1] += util.E22 * util.nu12 / nu_denom * ply_frac  # Q12
-            _array[2] += util.E22 / nu_denom * ply_frac  # Q22
-            _array[3] += util.G12 * ply_frac  # Q66
-        return _array
+        ply_angles = self.ply_angles
+        props = material_registry.lookup(self, ply_angles)
+        # fractions are paired ply by ply with the angles, extra fractions are unused
+        ply_fracs = self.ply_fractions[: ply_angles.shape[0]]
+        return np.array(
+            [
+                np.dot(props["Q11"], ply_fracs),
+                np.dot(props["Q12"], ply_fracs),
+                np.dot(props["Q22"], ply_fracs),
+                np.dot(props["Q66"], ply_fracs),
+            ]
+        )
 
     @property
     def Q11(self) -> float:
@@ -27,32 +27,37 @@ class CompositeMaterialUtility:
         self.nu12 = nu12
         self.G12 = G12
 
-    def rotate_ply(self, angle=0.0):
+    @classmethod
+    def rotated_properties(cls, E11, E22, nu12, G12, angles):
         """
-        compute the properties at a general angle
-        assume the input angle is in degrees
+        vectorized form of rotate_ply, angles in degrees can be any numpy array
+        returns the tuple (E11, E22, nu12, G12) of arrays at each angle
         """
-        # copy previous properties at 0 deg into temp variables
-        E11 = self.E11 * 1.0
-        E22 = self.E22 * 1.0
-        nu12 = self.nu12 * 1.0
-        G12 = self.G12 * 1.0
-
-        # perform rotation to new axis system
-        angle_rad = np.deg2rad(angle)
+        angle_rad = np.deg2rad(np.asarray(angles, dtype=float))
         C = np.cos(angle_rad)
         S = np.sin(angle_rad)
         C2 = np.cos(2 * angle_rad)
         S2 = np.sin(2 * angle_rad)
-        self.E11 = (
+        rot_E11 = (
             C ** 4 / E11 + S ** 4 / E22 + 0.25 * (1.0 / G12 - 2 * nu12 / E11) * S2 ** 2
         ) ** (-1)
-        self.E22 = (
+        rot_E22 = (
             S ** 4 / E11 + C ** 4 / E22 + 0.25 * (1.0 / G12 - 2 * nu12 / E11) * S2 ** 2
         ) ** (-1)
         _temp1 = 1.0 / E11 + 2.0 * nu12 / E11 + 1.0 / E22
-        self.G12 = (_temp1 - (_temp1 - 1.0 / G12) * C2 ** 2) ** (-1)
-        self.nu12 = self.E11 * (nu12 / E11 - 0.25 * (_temp1 - 1.0 / G12) * S2 ** 2)
+        rot_G12 = (_temp1 - (_temp1 - 1.0 / G12) * C2 ** 2) ** (-1)
+        rot_nu12 = rot_E11 * (nu12 / E11 - 0.25 * (_temp1 - 1.0 / G12) * S2 ** 2)
+        return rot_E11, rot_E22, rot_nu12, rot_G12
+
+    def rotate_ply(self, angle=0.0):
+        """
+        compute the properties at a general angle
+        assume the input angle is in degrees
+        """
+        # perform rotation to new axis system
+        self.E11, self.E22, self.nu12, self.G12 = self.rotated_properties(
+            self.E11 * 1.0, self.E22 * 1.0, self.nu12 * 1.0, self.G12 * 1.0, angle
+        )
         return self
 
     @property
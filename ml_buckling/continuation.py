@@ -0,0 +1,98 @@
+"""
+Mode tracking along parametric continuation paths (e.g. the rho0 sweeps), the shift of
+the next buckling solve is extrapolated from the previous eigenvalues and the previous
+mode is interpolated onto the new mesh to find the same mode again.
+"""
+__all__ = ["extrapolate_eigenvalue", "interpolate_modes", "ContinuationPath"]
+
+import numpy as np
+
+
+def extrapolate_eigenvalue(params, eigvals, param, order=2) -> float:
+    """
+    polynomial extrapolation of the tracked eigenvalue to the continuation parameter
+    param from the last order+1 (params, eigvals) points, lower order on short paths
+    """
+    params = np.asarray(params, dtype=float)
+    eigvals = np.real(np.asarray(eigvals))
+    assert params.shape == eigvals.shape and params.shape[0] > 0
+    npts = min(order + 1, params.shape[0])
+    if npts == 1:
+        return float(eigvals[-1])
+    coeffs = np.polyfit(params[-npts:], eigvals[-npts:], npts - 1)
+    return float(np.polyval(coeffs, param))
+
+
+def interpolate_modes(nondim_X, modes, new_nondim_X, dof_per_node=6) -> np.ndarray:
+    """
+    modes (num_modes, dof_per_node * N) on the nodes nondim_X (N, 3) interpolated onto
+    the nodes new_nondim_X of another mesh (nearest node), as unit vectors
+    """
+    from scipy.interpolate import NearestNDInterpolator
+
+    nondim_X = np.asarray(nondim_X, dtype=float)
+    new_nondim_X = np.asarray(new_nondim_X, dtype=float)
+    modes = np.real(np.atleast_2d(np.asarray(modes)))
+    num_nodes = nondim_X.shape[0]
+    # nodal values of each mode and dof as columns
+    values = modes[:, : dof_per_node * num_nodes].reshape(
+        (modes.shape[0], num_nodes, dof_per_node)
+    )
+    values = values.transpose((1, 0, 2)).reshape((num_nodes, -1))
+
+    interp = NearestNDInterpolator(nondim_X, values)
+    new_values = interp(new_nondim_X).reshape(
+        (new_nondim_X.shape[0], modes.shape[0], dof_per_node)
+    )
+    new_modes = new_values.transpose((1, 0, 2)).reshape((modes.shape[0], -1))
+    norms = np.linalg.norm(new_modes, axis=1, keepdims=True)
+    return new_modes / np.maximum(norms, 1e-30)
+
+
+class ContinuationPath:
+    """
+    tracked mode of a continuation path, the last max_history (parameter, eigenvalue)
+    pairs and the last mode with its non-dimensional node coordinates
+    """
+
+    def __init__(self, max_history=3, order=2):
+        self.max_history = max_history
+        self.order = order
+        self.reset()
+
+    def reset(self):
+        """start a new path"""
+        self.params = []
+        self.eigvals = []
+        self.nondim_X = None
+        self.mode = None
+
+    def __len__(self):
+        return len(self.params)
+
+    def append(self, param, eigval, nondim_X, mode):
+        """add the converged tracked mode at the continuation parameter param"""
+        self.params = (self.params + [float(param)])[-self.max_history :]
+        self.eigvals = (self.eigvals + [float(np.real(eigval))])[-self.max_history :]
+        self.nondim_X = np.asarray(nondim_X)
+        self.mode = np.real(np.asarray(mode))
+
+    def shift(self, param) -> float:
+        """extrapolated eigenvalue at param, None on an empty path"""
+        if len(self) == 0:
+            return None
+        return extrapolate_eigenvalue(
+            self.params, self.eigvals, param, order=self.order
+        )
+
+    def seed(self, nondim_X) -> np.ndarray:
+        """
+        last mode interpolated onto the nodes nondim_X (with the same dofs per node),
+        None on an empty path
+        """
+        if self.mode is None:
+            return None
+        dof_per_node = self.mode.shape[0] // self.nondim_X.shape[0]
+        return interpolate_modes(
+            self.nondim_X, self.mode, nondim_X, dof_per_node=dof_per_node
+        )[0]
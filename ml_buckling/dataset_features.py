@@ -0,0 +1,143 @@
+"""
+Vectorized feature computation for the buckling datasets,
+used by the outlier removal and the stiffened/unstiffened combine scripts.
+"""
+__all__ = [
+    "unstiffened_plate_features",
+    "log_features",
+    "interval_membership",
+    "binned_outlier_mask",
+]
+
+import numpy as np
+from .material_registry import material_registry
+
+
+def unstiffened_plate_features(materials, ply_angles, a, b, h, registry=None) -> dict:
+    """
+    non-dimensional parameters of single ply plates for whole columns at once, same
+    formulas as UnstiffenedPlateAnalysis (xi = D*, rho_0 = affine AR, zeta, b/h)
+    materials : material name or array of names, ply_angles in deg, a, b, h arrays or scalars
+    """
+    registry = material_registry if registry is None else registry
+    ply_angles = np.asarray(ply_angles, dtype=float)
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    h = np.asarray(h, dtype=float)
+    props = registry.lookup(materials, ply_angles)
+
+    # Q entries already include the 1/(1-nu12*nu21) factor
+    D11 = props["Q11"] * h ** 3 / 12.0
+    D22 = props["Q22"] * h ** 3 / 12.0
+    D12 = props["nu12"] * D22
+    D66 = props["G12"] * h ** 3 / 12.0
+    A11 = D11 * 12.0 / h ** 2
+    A66 = D66 * 12.0 / h ** 2
+
+    xi = (D12 + 2 * D66) / np.sqrt(D11 * D22)
+    return {
+        "xi": xi,
+        "rho_0": (D22 / D11) ** 0.25 * a / b,
+        "zeta": A11 / A66 * (h / b) ** 2,
+        "b/h": b / h,
+        "gen_poisson": 1.0 / xi * D12 / np.sqrt(D11 * D22),
+    }
+
+
+def log_features(xi, rho_0, zeta, gamma=None) -> dict:
+    """log-space surrogate inputs, keys are the dataset column names"""
+    features = {
+        "log(1+xi)": np.log(1.0 + np.asarray(xi, dtype=float)),
+        "log(rho_0)": np.log(np.asarray(rho_0, dtype=float)),
+        "log(1+10^3*zeta)": np.log(1.0 + 1e3 * np.asarray(zeta, dtype=float)),
+    }
+    if gamma is not None:
+        features["log(1+gamma)"] = np.log(1.0 + np.asarray(gamma, dtype=float))
+    return features
+
+
+def interval_membership(values, intervals) -> np.ndarray:
+    """
+    (n, nbins) boolean membership of each value in each [lo, hi) interval, the last
+    interval in the list is closed [lo, hi]. Intervals may overlap, values are binned
+    once with np.digitize over the elementary intervals between all the edges.
+    """
+    values = np.asarray(values, dtype=float)
+    intervals = np.asarray(intervals, dtype=float)
+    edges = np.unique(intervals.ravel())
+
+    # elementary interval k+1 is [edges[k], edges[k+1]), 0 and len(edges) are outside
+    elem = np.digitize(values, edges)
+    elem_lo = np.concatenate([[-np.inf], edges])
+    elem_hi = np.concatenate([edges, [np.inf]])
+    table = np.logical_and(
+        intervals[None, :, 0] <= elem_lo[:, None], elem_hi[:, None] <= intervals[None, :, 1]
+    )
+    member = table[elem]
+    member[:, -1] = np.logical_or(member[:, -1], values == intervals[-1, 1])
+    return member
+
+
+def binned_outlier_mask(
+    bin_values, bin_intervals, x, y, degree=2, min_count=5, z_max=2.0
+) -> np.ndarray:
+    """
+    local polynomial outlier removal in one grouped least-squares pass.
+    Each sample belongs to every bin combination of bin_values[d] in bin_intervals[d],
+    a degree polynomial in x is fit to y within each bin with at least min_count samples,
+    and samples with |resid| / sigma >= z_max in any bin are flagged as outliers.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float).ravel()
+    n = x.shape[0]
+
+    # (sample, bin combination) pairs from the membership in each binned dimension
+    memberships = [
+        interval_membership(values, intervals)
+        for values, intervals in zip(bin_values, bin_intervals)
+    ]
+    shape = tuple(member.shape[1] for member in memberships)
+    combined = np.ones((n,) + shape, dtype=bool)
+    for idim, member in enumerate(memberships):
+        expand = [slice(None)] + [None] * len(shape)
+        expand[idim + 1] = slice(None)
+        combined &= member[tuple(expand)]
+    pair_indices = np.nonzero(combined)
+    sample = pair_indices[0]
+    group = np.ravel_multi_index(pair_indices[1:], shape)
+    num_groups = int(np.prod(shape))
+
+    # grouped normal equations from power sums of x
+    xs = x[sample]
+    ys = y[sample]
+    powers = xs[None, :] ** np.arange(2 * degree + 1)[:, None]
+    power_sums = np.array(
+        [np.bincount(group, weights=pw, minlength=num_groups) for pw in powers]
+    )
+    rhs = np.array(
+        [
+            np.bincount(group, weights=ys * powers[k], minlength=num_groups)
+            for k in range(degree + 1)
+        ]
+    ).T
+    orders = np.arange(degree + 1)
+    lhs = power_sums[orders[:, None] + orders[None, :]].transpose(2, 0, 1)
+    counts = np.bincount(group, minlength=num_groups)
+
+    fit_groups = counts >= min_count
+    coeffs = np.zeros((num_groups, degree + 1))
+    coeffs[fit_groups] = np.einsum(
+        "gij,gj->gi", np.linalg.pinv(lhs[fit_groups]), rhs[fit_groups]
+    )
+
+    # local noise and z-scores of each pair
+    resids = ys - np.sum(coeffs[group] * powers[: degree + 1].T, axis=1)
+    variance = np.bincount(group, weights=resids ** 2, minlength=num_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma = np.sqrt(variance / counts)
+        z_scores = np.abs(resids) / sigma[group]
+    outlier_pairs = np.logical_and(fit_groups[group], z_scores >= z_max)
+
+    outlier_mask = np.full((n,), False, dtype=bool)
+    outlier_mask[sample[outlier_pairs]] = True
+    return outlier_mask
@@ -0,0 +1,167 @@
+"""
+Registry of rotated ply properties for the composite materials
+so Monte Carlo loops don't recompute the ply rotation for every sample.
+"""
+__all__ = ["MaterialRegistry", "material_registry", "NIAR_MATERIALS"]
+
+import numpy as np
+from .composite_material_utility import CompositeMaterialUtility
+
+# NIAR dataset Room Temperature Dry (RTD) mean properties, units in Pa, ND
+# (E11, E22, nu12, G12), same values as the CompositeMaterial classmethods
+NIAR_MATERIALS = {
+    "solvay5320": (138.461e9, 9.177e9, 0.326, 4.957e9),
+    "solvayMTM45": (129.5e9, 7.936e9, 0.313, 4.764e9),
+    "torayBT250E": (44.74e9, 11.36e9, 0.278, 3.77e9),
+    "victrexAE": (131.69e9, 9.694e9, 0.3192, 4.524e9),
+    "hexcelIM7": (158.51e9, 8.96e9, 0.316, 4.688e9),
+}
+
+
+class MaterialRegistry:
+    """
+    precomputes the rotated E11, E22, nu12, G12 and the Q11, Q12, Q22, Q66 entries
+    of each registered material on a fine angle grid over [0, 180) deg.
+    Angles on the grid are table lookups, any other angle is evaluated exactly
+    (not interpolated) and cached by (material, angle). Unregistered materials
+    have no table, all of their angles are evaluated exactly.
+    """
+
+    PROPERTY_NAMES = ("E11", "E22", "nu12", "G12", "Q11", "Q12", "Q22", "Q66")
+
+    def __init__(self, angle_step=0.5, max_cache_size=100000):
+        self.angle_step = angle_step
+        self.max_cache_size = max_cache_size
+        self._grid = np.arange(0.0, 180.0, angle_step)
+        self._base = {}
+        self._tables = {}
+        self._cache = {}
+
+    @classmethod
+    def compute_properties(cls, E11, E22, nu12, G12, angles) -> np.ndarray:
+        """exact rotated properties, returns (8, nangles) array in PROPERTY_NAMES order"""
+        rE11, rE22, rnu12, rG12 = CompositeMaterialUtility.rotated_properties(
+            E11, E22, nu12, G12, angles
+        )
+        nu21 = rnu12 * rE22 / rE11
+        nu_denom = 1 - rnu12 * nu21
+        return np.array(
+            [
+                rE11,
+                rE22,
+                rnu12,
+                rG12,
+                rE11 / nu_denom,  # Q11
+                rE22 * rnu12 / nu_denom,  # Q12
+                rE22 / nu_denom,  # Q22
+                rG12 * np.ones_like(rE11),  # Q66
+            ]
+        )
+
+    def register(self, name, E11, E22, nu12, G12):
+        """add a material and build its angle table"""
+        self._base[name] = (E11, E22, nu12, G12)
+        self._tables[name] = self.compute_properties(E11, E22, nu12, G12, self._grid)
+        return self
+
+    def _key(self, material):
+        """
+        registered name or the property tuple of any object with E11, E22, nu12, G12
+        attributes (e.g. a CompositeMaterial), which is not registered
+        """
+        if isinstance(material, str):
+            if material not in self._base:
+                raise KeyError(f"material {material} is not in the registry")
+            return material
+        key = (
+            float(material.E11),
+            float(material.E22),
+            float(material.nu12),
+            float(material.G12),
+        )
+        return key
+
+    @property
+    def material_names(self) -> list:
+        return [key for key in self._base if isinstance(key, str)]
+
+    def base_properties(self, material) -> tuple:
+        """unrotated (E11, E22, nu12, G12)"""
+        key = self._key(material)
+        return self._base.get(key, key)
+
+    def _grid_index(self, angles):
+        """index into the angle table and mask of angles which land on the grid"""
+        reduced = np.mod(angles, 180.0)
+        fidx = reduced / self.angle_step
+        idx = np.rint(fidx).astype(int)
+        on_grid = np.abs(fidx - idx) < 1e-9
+        return np.mod(idx, self._grid.shape[0]), on_grid
+
+    def rotated_properties(self, material, angle) -> dict:
+        """dict of the rotated ply properties at a single angle in degrees"""
+        key = self._key(material)
+        cache_key = (key, float(angle))
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+
+        idx, on_grid = self._grid_index(np.array([angle], dtype=float))
+        if on_grid[0] and key in self._tables:
+            values = self._tables[key][:, idx[0]]
+        else:
+            values = self.compute_properties(*self._base.get(key, key), angle)
+        props = {name: float(values[i]) for i, name in enumerate(self.PROPERTY_NAMES)}
+
+        if len(self._cache) >= self.max_cache_size:
+            self._cache.clear()
+        self._cache[cache_key] = props
+        return props
+
+    def lookup(self, materials, angles) -> dict:
+        """
+        bulk lookup for sampling, materials is a single material or an array of
+        material names with the same shape as angles. Returns a dict of arrays
+        with the shape of angles for each name in PROPERTY_NAMES.
+        """
+        angles = np.asarray(angles, dtype=float)
+        out = np.zeros((len(self.PROPERTY_NAMES),) + angles.shape)
+
+        if isinstance(materials, str) or not hasattr(materials, "__len__"):
+            groups = [(self._key(materials), np.full(angles.shape, True))]
+        else:
+            materials = np.asarray(materials)
+            assert materials.shape == angles.shape
+            groups = [
+                (self._key(str(name)), materials == name)
+                for name in np.unique(materials)
+            ]
+
+        for key, mask in groups:
+            sub_angles = angles[mask]
+            if key not in self._tables:
+                out[:, mask] = self.compute_properties(*key, sub_angles)
+                continue
+            idx, on_grid = self._grid_index(sub_angles)
+            values = np.zeros((len(self.PROPERTY_NAMES), sub_angles.shape[0]))
+            values[:, on_grid] = self._tables[key][:, idx[on_grid]]
+            off_grid = np.logical_not(on_grid)
+            if np.any(off_grid):
+                values[:, off_grid] = self.compute_properties(
+                    *self._base[key], sub_angles[off_grid]
+                )
+            out[:, mask] = values
+
+        return {name: out[i] for i, name in enumerate(self.PROPERTY_NAMES)}
+
+    def __str__(self):
+        mystr = "Material registry object\n"
+        mystr += f"\tangle step = {self.angle_step} deg\n"
+        mystr += f"\tmaterials = {self.material_names}\n"
+        mystr += f"\tcached angles = {len(self._cache)}\n"
+        return mystr
+
+
+# default registry with the NIAR materials
+material_registry = MaterialRegistry()
+for _name, _props in NIAR_MATERIALS.items():
+    material_registry.register(_name, *_props)
@@ -0,0 +1,273 @@
+"""
+Mesh convergence of the buckling eigenvalues, the mesh is refined geometrically
+until the Richardson extrapolated discretization error is below a tolerance.
+"""
+__all__ = ["richardson_extrapolate", "MeshConvergence"]
+
+import numpy as np
+import hashlib
+import json
+import os
+
+
+def richardson_extrapolate(h, f, order=2.0, order_bounds=(0.5, 4.0)):
+    """
+    extrapolated h -> 0 value and convergence order from the values f on meshes of
+    element size h (coarse to fine). The last three meshes give the observed order
+    (non-constant refinement ratios included), two meshes or oscillating convergence
+    use the assumed order. Returns (f_ext, order).
+    """
+    h = np.asarray(h, dtype=float)
+    f = np.asarray(f, dtype=float)
+    assert h.shape[0] >= 2 and h.shape == f.shape
+
+    p = float(order)
+    if h.shape[0] >= 3:
+        r21, r32 = h[-3] / h[-2], h[-2] / h[-1]
+        e21, e32 = f[-2] - f[-3], f[-1] - f[-2]
+        if e21 * e32 > 0.0 and abs(e32) < abs(e21):
+            # fixed point iteration for the order with unequal refinement ratios
+            # e21 / e32 = r32^p (r21^p - 1) / (r32^p - 1)
+            p_obs = np.log(abs(e21 / e32)) / np.log(r32)
+            for _ in range(50):
+                p_obs = max(p_obs, 1e-3)
+                q = np.log((r21 ** p_obs - 1.0) / (r32 ** p_obs - 1.0))
+                p_obs = (np.log(abs(e21 / e32)) - q) / np.log(r32)
+            if np.isfinite(p_obs):
+                p = float(np.clip(p_obs, *order_bounds))
+
+    r = h[-2] / h[-1]
+    return f[-1] + (f[-1] - f[-2]) / (r ** p - 1.0), p
+
+
+class MeshConvergence:
+    """
+    geometric mesh refinement study, solve(**sizes) returns the eigenvalue of one mesh.
+    The refine_keys of base_sizes (element counts, or node counts if node_counts) are
+    multiplied by ratio each level and the study stops once the relative difference of
+    the finest eigenvalue and the Richardson extrapolation is below rtol.
+    Solves are cached by mesh sizes (and in the json cache_file if given), so repeated
+    or extended studies only solve the new meshes. The entries of the cache_file are
+    tagged by study_key (the panel, materials and load of unstiffened / stiffened), the
+    ones of other studies are kept in the file but never reused.
+    """
+
+    def __init__(
+        self,
+        solve,
+        base_sizes: dict,
+        refine_keys=None,
+        ratio=1.5,
+        rtol=1e-3,
+        max_levels=6,
+        order=2.0,
+        node_counts=False,
+        cache_file=None,
+        study_key: str = None,
+        comm=None,
+    ):
+        self.solve = solve
+        self.base_sizes = dict(base_sizes)
+        self.refine_keys = (
+            list(base_sizes) if refine_keys is None else list(refine_keys)
+        )
+        self.ratio = ratio
+        self.rtol = rtol
+        self.max_levels = max_levels
+        self.order = order
+        self.node_counts = node_counts
+        self.cache_file = cache_file
+        self.study_key = study_key
+        self.comm = comm
+        self.num_solves = 0
+
+        self._cache = {}
+        self._other_entries = []
+        if cache_file is not None and os.path.exists(cache_file):
+            with open(cache_file, "r") as fp:
+                for entry in json.load(fp):
+                    if entry.get("study") != study_key:
+                        self._other_entries += [entry]
+                        continue
+                    self._cache[self._key(entry["sizes"])] = entry["eigenvalue"]
+
+    @classmethod
+    def unstiffened(
+        cls,
+        plate,
+        nx=10,
+        ny=10,
+        exx=0.0,
+        eyy=0.0,
+        exy=0.0,
+        clamped=False,
+        sigma=5.0,
+        num_eig=5,
+        imode=0,
+        **kwargs,
+    ):
+        """study of the imode eigenvalue of an UnstiffenedPlateAnalysis"""
+
+        def solve(nx, ny):
+            plate.generate_bdf(nx=nx, ny=ny, exx=exx, eyy=eyy, exy=exy, clamped=clamped)
+            eigvals, _ = plate.run_buckling_analysis(
+                sigma=sigma, num_eig=num_eig, write_soln=False
+            )
+            return float(np.real(eigvals[imode]))
+
+        kwargs.setdefault("comm", plate.comm)
+        kwargs.setdefault(
+            "study_key",
+            cls.study_hash(
+                "unstiffened",
+                [
+                    plate.a,
+                    plate.b,
+                    plate.h,
+                    plate.E11,
+                    plate.E22,
+                    plate.nu12,
+                    plate.G12,
+                ],
+                plate.ply_angle,
+                plate.backend,
+                [exx, eyy, exy, clamped, sigma, num_eig, imode],
+            ),
+        )
+        return cls(solve, {"nx": nx, "ny": ny}, **kwargs)
+
+    @classmethod
+    def stiffened(
+        cls,
+        analysis,
+        exx=0.0,
+        exy=0.0,
+        sizes=None,
+        sigma=5.0,
+        num_eig=20,
+        global_mode=True,
+        pre_analysis_kwargs=None,
+        **kwargs,
+    ):
+        """
+        study of the lowest global mode (or the lowest) eigenvalue of a
+        StiffenedPlateAnalysis, from the adaptive mesh sizes unless sizes are given
+        """
+        if sizes is None:
+            sizes = analysis.adaptive_mesh_sizes(shear=exy != 0.0)
+        pre_analysis_kwargs = {} if pre_analysis_kwargs is None else pre_analysis_kwargs
+
+        def solve(**mesh_sizes):
+            analysis.pre_analysis(**mesh_sizes, exx=exx, exy=exy, **pre_analysis_kwargs)
+            analysis.run_buckling_analysis(sigma=sigma, num_eig=num_eig)
+            analysis.post_analysis()
+            if global_mode:
+                eigval = analysis.min_global_mode_eigenvalue
+            else:
+                eigval = analysis.eigenvalues[0]
+            return np.nan if eigval is None else float(np.real(eigval))
+
+        kwargs.setdefault("comm", analysis.comm)
+        kwargs.setdefault(
+            "study_key",
+            cls.study_hash(
+                "stiffened",
+                analysis.geometry.spec._key,
+                analysis.plate_material.spec._key,
+                analysis.stiffener_material.spec._key,
+                analysis.backend,
+                [exx, exy, sigma, num_eig, global_mode],
+                # mesh caches and other objects don't change the eigenvalues
+                sorted(
+                    (key, value)
+                    for key, value in pre_analysis_kwargs.items()
+                    if isinstance(value, (bool, int, float, str, dict, type(None)))
+                ),
+            ),
+        )
+        kwargs.setdefault("refine_keys", ["nx_plate", "ny_plate", "nz_stiff"])
+        kwargs.setdefault("node_counts", True)
+        return cls(solve, sizes, **kwargs)
+
+    @staticmethod
+    def study_hash(*values) -> str:
+        """study_key of the values describing a study (panel, materials, load, solver)"""
+        return hashlib.sha256(repr(values).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _key(sizes) -> tuple:
+        return tuple(sorted((key, int(value)) for key, value in sizes.items()))
+
+    def level_sizes(self, level) -> dict:
+        """mesh sizes of a refinement level, level 0 is the base mesh"""
+        offset = 1 if self.node_counts else 0
+        sizes = dict(self.base_sizes)
+        for key in self.refine_keys:
+            num_elems = self.base_sizes[key] - offset
+            sizes[key] = int(round(num_elems * self.ratio ** level)) + offset
+        return sizes
+
+    def element_size(self, sizes) -> float:
+        """relative element size of a mesh from its first refined dimension"""
+        offset = 1 if self.node_counts else 0
+        return 1.0 / (sizes[self.refine_keys[0]] - offset)
+
+    def eigenvalue(self, sizes) -> float:
+        """cached eigenvalue of one mesh"""
+        key = self._key(sizes)
+        if key not in self._cache:
+            self._cache[key] = self.solve(**sizes)
+            self.num_solves += 1
+            self._save()
+        return self._cache[key]
+
+    def _save(self):
+        if self.cache_file is None:
+            return
+        if self.comm is None or self.comm.rank == 0:
+            entries = self._other_entries + [
+                {"study": self.study_key, "sizes": dict(key), "eigenvalue": value}
+                for key, value in self._cache.items()
+            ]
+            with open(self.cache_file, "w") as fp:
+                json.dump(entries, fp, indent=2)
+
+    def run(self) -> dict:
+        """
+        refine until converged or max_levels, returns a dict with the finest eigenvalue,
+        the extrapolated eigenvalue, the estimated relative error, the order, whether it
+        converged and the sizes, element sizes and eigenvalues of each level
+        """
+        levels = []
+        h = []
+        eigvals = []
+        result = {
+            "eigenvalue": None,
+            "extrapolated": None,
+            "error": np.inf,
+            "order": self.order,
+            "converged": False,
+        }
+        for level in range(self.max_levels):
+            sizes = self.level_sizes(level)
+            if levels and sizes == levels[-1]:
+                continue  # rounding gave the same mesh
+            levels += [sizes]
+            h += [self.element_size(sizes)]
+            eigvals += [self.eigenvalue(sizes)]
+            result["eigenvalue"] = eigvals[-1]
+            if len(eigvals) < 2:
+                continue
+
+            f_ext, order = richardson_extrapolate(h, eigvals, order=self.order)
+            result["extrapolated"] = f_ext
+            result["order"] = order
+            result["error"] = abs(f_ext - eigvals[-1]) / max(abs(f_ext), 1e-14)
+            if result["error"] < self.rtol:
+                result["converged"] = True
+                break
+
+        result["sizes"] = levels
+        result["element_sizes"] = h
+        result["eigenvalues"] = eigvals
+        return result
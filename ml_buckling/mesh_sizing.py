@@ -0,0 +1,100 @@
+"""
+Mesh sizes of stiffened panels from the closed-form mode shapes, so each
+eigensolve uses the fewest elements that resolve the expected half-waves.
+"""
+__all__ = ["predicted_half_waves", "panel_mesh_sizes", "mode_half_waves"]
+
+import numpy as np
+from .closed_form import (
+    stiffened_panel_parameters,
+    global_axial_load,
+    shear_mode_parameters,
+)
+
+
+def predicted_half_waves(
+    plate_material, stiffener_material, geometry, shear=False
+) -> dict:
+    """
+    closed-form number of half-waves along x of the global mode and of the local
+    skin mode between the stiffeners (one half-wave across each stiffener pitch)
+    """
+    spec = geometry.spec
+    params = stiffened_panel_parameters(
+        plate_material,
+        stiffener_material,
+        spec.a,
+        spec.b,
+        spec.h,
+        spec.h_w,
+        spec.t_w,
+        spec.s_p,
+        spec.num_stiff,
+    )
+    xi, rho_0, gamma = params["xi"], params["rho_0"], params["gamma"]
+    # affine aspect ratio of the skin between two stiffeners
+    rho_local = rho_0 * spec.b / spec.s_p
+
+    if shear:
+        # half wavelength 1/s1 of the inclined waves in affine x
+        s1_global, _ = shear_mode_parameters(xi, gamma)
+        s1_local, _ = shear_mode_parameters(xi, 0.0)
+        m_global = np.ceil(rho_0 * s1_global)
+        m_local = np.ceil(rho_local * s1_local)
+    else:
+        _, m_global = global_axial_load(xi, rho_0, gamma)
+        _, m_local = global_axial_load(xi, rho_local, 0.0)
+    return {"m_global": int(m_global), "m_local": int(m_local)}
+
+
+def panel_mesh_sizes(
+    plate_material,
+    stiffener_material,
+    geometry,
+    shear=False,
+    elems_per_half_wave=8,
+    nx_stiff_mult=1,
+    max_element_AR=3.0,
+    min_ny=3,
+    min_nz=3,
+) -> dict:
+    """
+    smallest nx_plate, ny_plate, nz_stiff with elems_per_half_wave elements along each
+    predicted half-wave in x (global or local mode) and across each skin section, then
+    refined so no element is more than max_element_AR times longer than it is wide.
+    Returns the mesh keyword arguments of StiffenedPlateAnalysis.pre_analysis.
+    """
+    spec = geometry.spec
+    half_waves = predicted_half_waves(
+        plate_material, stiffener_material, geometry, shear=shear
+    )
+    m_max = max(half_waves["m_global"], half_waves["m_local"])
+
+    # element counts along x and across the widest skin section
+    width = max(spec.s_p, spec.boundary_s_p) if spec.num_stiff > 0 else spec.b
+    nex = int(np.ceil(elems_per_half_wave * m_max))
+    ney = max(int(np.ceil(elems_per_half_wave)), min_ny - 1)
+    nex = max(nex, int(np.ceil(spec.a / width * ney / max_element_AR)))
+    ney = max(ney, int(np.ceil(width / spec.a * nex / max_element_AR)))
+
+    # stiffener web elements, no longer than max_element_AR times the web dx
+    nez = min_nz - 1
+    if spec.num_stiff > 0:
+        dx_stiff = spec.a / nex / nx_stiff_mult
+        nez = max(nez, int(np.ceil(spec.h_w / dx_stiff / max_element_AR)))
+    return {
+        "nx_plate": nex + 1,
+        "ny_plate": ney + 1,
+        "nz_stiff": nez + 1,
+        "nx_stiff_mult": nx_stiff_mult,
+    }
+
+
+def mode_half_waves(xi, w, tol=1e-3) -> int:
+    """
+    a-posteriori number of half-waves of a mode along a line of nodes, from the sign
+    changes of w sorted by xi (entries below tol times the max |w| are ignored)
+    """
+    w = np.real(np.asarray(w))[np.argsort(xi, kind="stable")]
+    w = w[np.abs(w) > tol * np.max(np.abs(w))]
+    return int(np.sum(np.sign(w[1:]) != np.sign(w[:-1]))) + 1
@@ -0,0 +1,644 @@
+"""
+Structured CQUAD4 meshes of blade stiffened panels held as numpy arrays.
+Node ids come from an integer lattice so the mesh is built in linear time.
+"""
+__all__ = [
+    "PanelMesh",
+    "PanelNodeSets",
+    "MeshTemplateCache",
+    "CapsMeshCache",
+    "SYMMETRY_DOFS",
+    "mirror_modes",
+]
+
+import numpy as np
+import hashlib
+import json
+import os
+import tempfile
+from functools import cached_property
+
+
+class PanelMesh:
+    """
+    node coordinates and quad connectivity of a stiffened panel
+        xyz : (num_nodes, 3) coordinates, node ids are 1,...,num_nodes in row order
+        conn : (num_elems, 4) node ids of each CQUAD4, element ids are 1,...,num_elems
+        part_ids : (num_elems,) 1 for the skin and 2 for the stiffeners
+        stiff_locations : (num_stiff,) y-coordinates of the stiffeners
+    the single point constraints and RBE2 elements of the analysis are kept with
+    the mesh, so the FEA model can be built without re-reading the BDF file
+    """
+
+    def __init__(self, xyz, conn, part_ids, stiff_locations=None, node_ids=None):
+        self.xyz = np.asarray(xyz, dtype=float)
+        self.conn = np.asarray(conn, dtype=int).reshape((-1, 4))
+        self.part_ids = np.asarray(part_ids, dtype=int)
+        self.stiff_locations = np.array(
+            [] if stiff_locations is None else stiff_locations, dtype=float
+        )
+        self._node_ids = None if node_ids is None else np.asarray(node_ids, dtype=int)
+        # (num_nodes, 3) non-dimensional (xi, eta, zeta) coordinates, set by the analysis
+        self.nondim_xyz = None
+        self.set_constraints([], [], [])
+
+    @classmethod
+    def stiffened(
+        cls, geometry, nx_plate=30, ny_plate=30, nz_stiff=10, nx_stiff_mult=1, tol=1e-10
+    ):
+        """
+        skin sections between the stiffeners plus each stiffener web, with the same
+        element order and node numbering (order of first use) as the original
+        pre_analysis mesher. Seam nodes at the stiffener roots and between skin
+        sections are shared through their integer (x, y, z) lattice index.
+        """
+        N = geometry.num_local
+        mult = nx_stiff_mult
+        Lx = geometry.a
+        Lz_stiff = geometry.h_w
+        dx = Lx / (nx_plate - 1)
+        dx_stiff = dx / mult
+        dz = Lz_stiff / (nz_stiff - 1)
+
+        # y of each skin grid row, sections have ny_plate - 1 rows of elements
+        ystarts = np.zeros((N,))
+        Lys = np.full((N,), geometry.s_p)
+        Lys[[0, N - 1]] = geometry.boundary_s_p
+        if N > 1:
+            ystarts[1] = geometry.boundary_s_p
+            ystarts[2:] = geometry.boundary_s_p + geometry.s_p * np.arange(1, N - 1)
+        nyl = ny_plate - 1
+        row_y = np.zeros((N * nyl + 1,))
+        for ilocal in range(N):
+            dy = Lys[ilocal] / (ny_plate - 1)
+            row_y[ilocal * nyl : (ilocal + 1) * nyl + 1] = (
+                dy * np.arange(ny_plate) + ystarts[ilocal]
+            )
+        # rows at the same y (e.g. zero width boundary sections) share nodes
+        row_idx = np.concatenate([[0], np.cumsum(np.abs(np.diff(row_y)) >= tol)])
+        num_rows = row_idx[-1] + 1
+
+        # lattice index = (row * nz_stiff + iz) * nxl + ix in units of dx_stiff
+        nxl = (nx_plate - 1) * mult + 1
+        ix_quad = np.array([0, 1, 1, 0])
+        iw_quad = np.array([0, 0, 1, 1])
+
+        keys = []
+        part_ids = []
+        stiff_locations = []
+        ix = np.arange(nx_plate - 1)
+        for ilocal in range(N):
+            # skin elements of this section, loop order iy then ix
+            iy = np.arange(nyl)[:, None, None] + ilocal * nyl
+            x_key = (ix[None, :, None] + ix_quad) * mult
+            y_key = row_idx[iy + iw_quad]
+            keys += [(y_key * nz_stiff * nxl + x_key).reshape((-1, 4))]
+            part_ids += [np.full((nyl * (nx_plate - 1),), 1)]
+
+            # stiffener web elements, loop order iz, ix, istiff_mult
+            if ilocal == N - 1:
+                continue
+            stiff_locations += [ystarts[ilocal] + Lys[ilocal]]
+            irow = row_idx[(ilocal + 1) * nyl]
+            iz = np.arange(nz_stiff - 1)[:, None, None]
+            ix_stiff = np.arange((nx_plate - 1) * mult)[None, :, None]
+            x_key = ix_stiff + ix_quad
+            z_key = iz + iw_quad
+            keys += [((irow * nz_stiff + z_key) * nxl + x_key).reshape((-1, 4))]
+            part_ids += [np.full(((nz_stiff - 1) * (nx_plate - 1) * mult,), 2)]
+
+        keys = np.concatenate(keys, axis=0)
+        part_ids = np.concatenate(part_ids)
+
+        # number the nodes in order of first use, in linear time
+        flat_keys = keys.ravel()
+        num_keys = num_rows * nz_stiff * nxl
+        first_use = np.full((num_keys,), flat_keys.shape[0])
+        np.minimum.at(first_use, flat_keys, np.arange(flat_keys.shape[0]))
+        is_first = first_use[flat_keys] == np.arange(flat_keys.shape[0])
+        node_keys = flat_keys[is_first]
+        node_of_key = np.zeros((num_keys,), dtype=int)
+        node_of_key[node_keys] = np.arange(1, node_keys.shape[0] + 1)
+        conn = node_of_key[keys]
+
+        # coordinates of each node from its lattice index
+        x_idx = node_keys % nxl
+        z_idx = (node_keys // nxl) % nz_stiff
+        r_idx = node_keys // (nxl * nz_stiff)
+        _, first_row = np.unique(row_idx, return_index=True)
+        xyz = np.zeros((node_keys.shape[0], 3))
+        xyz[:, 0] = dx * (x_idx // mult) + dx_stiff * (x_idx % mult)
+        xyz[:, 1] = row_y[first_row[r_idx]]
+        xyz[:, 2] = dz * z_idx
+        return cls(xyz, conn, part_ids, stiff_locations)
+
+    @property
+    def num_nodes(self) -> int:
+        return self.xyz.shape[0]
+
+    @property
+    def num_elements(self) -> int:
+        return self.conn.shape[0]
+
+    @property
+    def node_ids(self) -> np.ndarray:
+        if self._node_ids is not None:
+            return self._node_ids
+        return np.arange(1, self.num_nodes + 1)
+
+    @property
+    def elem_ids(self) -> np.ndarray:
+        return np.arange(1, self.num_elements + 1)
+
+    @property
+    def max_node_id(self) -> int:
+        return int(np.max(self.node_ids, initial=0))
+
+    @property
+    def max_elem_id(self) -> int:
+        return self.num_elements
+
+    @property
+    def node_dicts(self) -> list:
+        return [
+            {"x": x, "y": y, "z": z, "id": node_id}
+            for node_id, (x, y, z) in zip(self.node_ids.tolist(), self.xyz.tolist())
+        ]
+
+    def set_constraints(
+        self,
+        spc_node_ids,
+        spc_dofs,
+        spc_values,
+        rbe_elem_ids=(),
+        rbe_control_nodes=(),
+        rbe_dependent_nodes=(),
+        spc_wide=False,
+    ):
+        """
+        SPC cards (one node, dof string and enforced value each) and
+        RBE2 elements (control node and dependent node array each) of the analysis,
+        spc_wide marks the SPCs written as large field cards in the bdf file
+        """
+        self.spc_node_ids = np.asarray(spc_node_ids, dtype=int)
+        self.spc_dofs = np.asarray(spc_dofs, dtype=str)
+        self.spc_values = np.asarray(spc_values, dtype=float)
+        self.spc_wide = np.array(
+            np.broadcast_to(np.asarray(spc_wide, dtype=bool), self.spc_node_ids.shape)
+        )
+        self.rbe_elem_ids = np.asarray(rbe_elem_ids, dtype=int)
+        self.rbe_control_nodes = np.asarray(rbe_control_nodes, dtype=int)
+        self.rbe_dependent_nodes = [
+            np.asarray(_, dtype=int) for _ in rbe_dependent_nodes
+        ]
+        return self
+
+    def clipped(self, x_max=None, y_max=None, tol=1e-10):
+        """
+        mesh of the elements with all nodes at x <= x_max and y <= y_max (e.g. a half
+        or quarter panel), nodes renumbered 1,...,N in their order in this mesh.
+        Returns the mesh and the indices of its nodes in this mesh.
+        """
+        keep = np.ones((self.num_nodes,), dtype=bool)
+        if x_max is not None:
+            keep &= self.xyz[:, 0] <= x_max + tol
+        if y_max is not None:
+            keep &= self.xyz[:, 1] <= y_max + tol
+        node_index = np.zeros((self.num_nodes + 1,), dtype=int)
+        node_index[self.node_ids] = np.arange(self.num_nodes)
+        conn_index = node_index[self.conn]
+        elems = np.all(keep[conn_index], axis=1)
+
+        full_nodes = np.unique(conn_index[elems])
+        new_id = np.zeros((self.num_nodes,), dtype=int)
+        new_id[full_nodes] = np.arange(1, full_nodes.shape[0] + 1)
+        mesh = PanelMesh(
+            self.xyz[full_nodes],
+            new_id[conn_index[elems]],
+            self.part_ids[elems],
+            self.stiff_locations,
+        )
+        return mesh, full_nodes
+
+    def save(self, filename):
+        """
+        write the mesh, constraints and non-dimensional coordinates to a compressed
+        npz file, a few percent of the size of the bdf file and read back without parsing
+        """
+        arrays = dict(
+            xyz=self.xyz,
+            conn=self.conn,
+            part_ids=self.part_ids,
+            stiff_locations=self.stiff_locations,
+            spc_node_ids=self.spc_node_ids,
+            spc_dofs=self.spc_dofs,
+            spc_values=self.spc_values,
+            spc_wide=self.spc_wide,
+            rbe_elem_ids=self.rbe_elem_ids,
+            rbe_control_nodes=self.rbe_control_nodes,
+            rbe_lengths=np.array([len(_) for _ in self.rbe_dependent_nodes], dtype=int),
+            rbe_dependent_nodes=np.concatenate([[]] + self.rbe_dependent_nodes).astype(
+                int
+            ),
+        )
+        if self._node_ids is not None:
+            arrays["node_ids"] = self._node_ids
+        if self.nondim_xyz is not None:
+            arrays["nondim_xyz"] = self.nondim_xyz
+        np.savez_compressed(filename, **arrays)
+
+    @classmethod
+    def load(cls, filename):
+        """read a mesh written by PanelMesh.save"""
+        data = np.load(filename)
+        mesh = cls(
+            data["xyz"],
+            data["conn"],
+            data["part_ids"],
+            data["stiff_locations"],
+            node_ids=data["node_ids"] if "node_ids" in data else None,
+        )
+        splits = np.cumsum(data["rbe_lengths"])[:-1]
+        mesh.set_constraints(
+            data["spc_node_ids"],
+            data["spc_dofs"],
+            data["spc_values"],
+            rbe_elem_ids=data["rbe_elem_ids"],
+            rbe_control_nodes=data["rbe_control_nodes"],
+            rbe_dependent_nodes=(
+                np.split(data["rbe_dependent_nodes"], splits)
+                if data["rbe_lengths"].shape[0] > 0
+                else []
+            ),
+            spc_wide=data["spc_wide"],
+        )
+        if "nondim_xyz" in data:
+            mesh.nondim_xyz = data["nondim_xyz"]
+        return mesh
+
+    def __str__(self):
+        mystr = "Panel mesh object\n"
+        mystr += f"\tnum nodes = {self.num_nodes}\n"
+        mystr += f"\tnum elements = {self.num_elements}\n"
+        mystr += f"\tstiffener locations = {self.stiff_locations.tolist()}\n"
+        mystr += f"\tnum SPCs = {self.spc_node_ids.shape[0]}\n"
+        mystr += f"\tnum RBE2s = {self.rbe_elem_ids.shape[0]}\n"
+        return mystr
+
+
+class PanelNodeSets:
+    """
+    index sets of the panel nodes on each edge, in the skin and along each stiffener,
+    built once from vectorized coordinate comparisons. Nodes near a y-value are found
+    from a sorted y index, so each stiffener line is a binary search not a full scan.
+    Used with dimensional coordinates or the non-dimensional ones and a = b = 1.
+    """
+
+    # index arrays that carry over unchanged when the coordinates are rescaled
+    _INDEX_SETS = (
+        "x_left",
+        "x_right",
+        "y_bot",
+        "y_top",
+        "boundary",
+        "skin",
+        "stiffener_roots",
+    )
+
+    def __init__(self, x, y, z, a=1.0, b=1.0, stiff_locations=(), tol=1e-5):
+        self.tol = tol
+        self._set_coordinates(x, y, z)
+
+        self.x_left = self._near(self.x, 0.0)
+        self.x_right = self._near(self.x, a)
+        self.y_bot = self._near(self.y, 0.0)
+        self.y_top = self._near(self.y, b)
+        self.boundary = np.unique(
+            np.concatenate([self.x_left, self.x_right, self.y_bot, self.y_top])
+        )
+        self.skin = self._near(self.z, 0.0)
+
+        self.stiff_lines = [self.near_y(yval) for yval in stiff_locations]
+        self.stiffener_roots = np.intersect1d(
+            np.concatenate([[]] + self.stiff_lines).astype(int), self.skin
+        )
+
+    def _set_coordinates(self, x, y, z, y_order=None):
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.z = np.asarray(z)
+        # sorted y index for the stiffener lines and other y = const lines
+        if y_order is None:
+            y_order = np.argsort(self.y, kind="stable")
+        self._y_order = y_order
+        self._y_sorted = self.y[self._y_order]
+        self._nearest = {}
+        for name in ["skin_middle", "skin_spacing"]:
+            self.__dict__.pop(name, None)
+
+    @classmethod
+    def from_indices(cls, x, y, z, stiff_lines, tol=1e-5, y_order=None, **index_sets):
+        """rebuild the node sets from saved index arrays without classifying the nodes"""
+        node_sets = cls.__new__(cls)
+        node_sets.tol = tol
+        node_sets._set_coordinates(x, y, z, y_order=y_order)
+        for name in cls._INDEX_SETS:
+            setattr(node_sets, name, np.asarray(index_sets[name], dtype=int))
+        node_sets.stiff_lines = [np.asarray(_, dtype=int) for _ in stiff_lines]
+        return node_sets
+
+    def scaled(self, sx, sy, sz, tol=None):
+        """
+        same index sets for the coordinates scaled by positive factors, which
+        keep the sorted y order so no comparisons or sorts are redone
+        """
+        return PanelNodeSets.from_indices(
+            self.x * sx,
+            self.y * sy,
+            self.z * sz,
+            stiff_lines=self.stiff_lines,
+            tol=self.tol if tol is None else tol,
+            y_order=self._y_order,
+            **{name: getattr(self, name) for name in self._INDEX_SETS},
+        )
+
+    def _near(self, values, ref):
+        return np.nonzero(np.abs(values - ref) < self.tol)[0]
+
+    def near_y(self, yval) -> np.ndarray:
+        """sorted indices of the nodes with |y - yval| < tol"""
+        lo = np.searchsorted(self._y_sorted, yval - self.tol, side="right")
+        hi = np.searchsorted(self._y_sorted, yval + self.tol, side="left")
+        return np.sort(self._y_order[lo:hi])
+
+    def line_end(self, iline, xval) -> np.ndarray:
+        """nodes of stiffener line iline at the x = xval end"""
+        line = self.stiff_lines[iline]
+        return line[np.abs(self.x[line] - xval) < self.tol]
+
+    @cached_property
+    def skin_middle(self) -> np.ndarray:
+        """skin nodes on the grid line closest to (but not below) y = 1/2"""
+        middle_dist = np.min(np.abs(0.5 - self.y))
+        return np.intersect1d(self.near_y(0.5 + middle_dist), self.skin)
+
+    @cached_property
+    def skin_spacing(self) -> tuple:
+        """first x and y grid spacing of the skin nodes"""
+        dx = np.diff(np.unique(self.x[self.skin]))[0]
+        dy = np.diff(np.unique(self.y[self.skin]))[0]
+        return dx, dy
+
+    def nearest(self, x0, y0, z0=0.0) -> int:
+        """node closest to the point in the 1-norm, cached since the mesh doesn't change"""
+        key = (x0, y0, z0)
+        if key not in self._nearest:
+            dist = np.abs(self.x - x0) + np.abs(self.y - y0) + np.abs(self.z - z0)
+            self._nearest[key] = int(np.argmin(dist))
+        return self._nearest[key]
+
+
+# constrained dofs on the x = a/2 and y = b/2 planes of symmetric (S) and
+# antisymmetric (A) modes, and the sign of each dof (u, v, w, thx, thy, thz)
+# of the symmetric mirror image
+SYMMETRY_DOFS = {
+    ("x", "S"): "156",
+    ("x", "A"): "234",
+    ("y", "S"): "246",
+    ("y", "A"): "135",
+}
+_MIRROR_SIGNS = {
+    "x": np.array([-1.0, 1.0, 1.0, 1.0, -1.0, -1.0]),
+    "y": np.array([1.0, -1.0, 1.0, -1.0, 1.0, -1.0]),
+}
+
+
+def mirror_modes(
+    nondim_xyz, full_nondim_xyz, modes, symmetry, tol=1e-8, dofs=(0, 1, 2, 3, 4, 5)
+) -> list:
+    """
+    modes (the dofs of each node, all 6 by default) of a half or quarter panel model
+    with the nodes nondim_xyz, mirrored onto the full panel nodes full_nondim_xyz.
+    symmetry holds the class of each plane, e.g. {"x": "S", "y": "A"} for the planes
+    xi = 1/2 and eta = 1/2
+    """
+    nondim_xyz = np.asarray(nondim_xyz, dtype=float)
+    mirrored = np.array(full_nondim_xyz, dtype=float)
+    signs = np.ones((mirrored.shape[0], 6))
+    for plane, sym_class in symmetry.items():
+        axis = 0 if plane == "x" else 1
+        flip = mirrored[:, axis] > 0.5 + tol
+        mirrored[flip, axis] = 1.0 - mirrored[flip, axis]
+        sign = 1.0 if sym_class == "S" else -1.0
+        signs[flip] *= sign * _MIRROR_SIGNS[plane]
+
+    # node of the reduced model at each mirrored full panel node
+    digits = int(-np.log10(tol))
+    lookup = {
+        key: inode for inode, key in enumerate(map(tuple, np.round(nondim_xyz, digits)))
+    }
+    index = np.array([lookup[key] for key in map(tuple, np.round(mirrored, digits))])
+
+    dofs = list(dofs)
+    num_dof = len(dofs) * nondim_xyz.shape[0]
+    return [
+        (
+            np.asarray(mode)[:num_dof].reshape((-1, len(dofs)))[index] * signs[:, dofs]
+        ).ravel()
+        for mode in modes
+    ]
+
+
+class MeshTemplateCache:
+    """
+    normalized panel meshes and node sets keyed by the mesh topology, for parametric
+    sweeps where consecutive panels only differ in a, b and h_w. The first panel of each
+    topology is meshed and classified, the later ones are an affine scaling of the
+    coordinates in the unit (x/a, y/b, z/h_w) template. With a cache_dir, the templates
+    are also saved as npz files and reused across runs.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._templates = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def topology_key(geometry, nx_plate, ny_plate, nz_stiff, nx_stiff_mult) -> tuple:
+        """mesh sizes, number of stiffeners and relative width of the boundary sections"""
+        spec = geometry.spec
+        return (
+            int(nx_plate),
+            int(ny_plate),
+            int(nz_stiff),
+            int(nx_stiff_mult),
+            spec.num_stiff,
+            round(spec.boundary_s_p / spec.b, 12),
+        )
+
+    @staticmethod
+    def _scales(geometry) -> np.ndarray:
+        h_w = geometry.spec.h_w
+        return np.array([geometry.spec.a, geometry.spec.b, h_w if h_w > 0 else 1.0])
+
+    def _file(self, key):
+        key_hash = hashlib.sha256(repr(key).encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"mesh_template_{key_hash}.npz")
+
+    def _save(self, key, mesh, node_sets):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        stiff_lines = node_sets.stiff_lines
+        np.savez(
+            self._file(key),
+            key=np.array(repr(key)),
+            xyz=mesh.xyz,
+            conn=mesh.conn,
+            part_ids=mesh.part_ids,
+            stiff_locations=mesh.stiff_locations,
+            tol=node_sets.tol,
+            y_order=node_sets._y_order,
+            stiff_line_lengths=np.array([len(_) for _ in stiff_lines], dtype=int),
+            stiff_lines=np.concatenate([[]] + stiff_lines).astype(int),
+            **{name: getattr(node_sets, name) for name in PanelNodeSets._INDEX_SETS},
+        )
+
+    def _load(self, key):
+        filename = self._file(key)
+        if not os.path.exists(filename):
+            return None
+        data = np.load(filename)
+        if str(data["key"]) != repr(key):
+            return None
+        mesh = PanelMesh(
+            data["xyz"], data["conn"], data["part_ids"], data["stiff_locations"]
+        )
+        splits = np.cumsum(data["stiff_line_lengths"])[:-1]
+        node_sets = PanelNodeSets.from_indices(
+            *mesh.xyz.T,
+            stiff_lines=np.split(data["stiff_lines"], splits),
+            tol=float(data["tol"]),
+            y_order=data["y_order"],
+            **{name: data[name] for name in PanelNodeSets._INDEX_SETS},
+        )
+        return mesh, node_sets
+
+    def get(
+        self, geometry, nx_plate=30, ny_plate=30, nz_stiff=10, nx_stiff_mult=1, tol=1e-5
+    ):
+        """
+        panel mesh (without constraints) and its node sets for this geometry,
+        tol is the dimensional tolerance of the node classification
+        """
+        key = self.topology_key(geometry, nx_plate, ny_plate, nz_stiff, nx_stiff_mult)
+        scales = self._scales(geometry)
+
+        if key not in self._templates and self.cache_dir is not None:
+            template = self._load(key)
+            if template is not None:
+                self._templates[key] = template
+
+        if key in self._templates:
+            self.hits += 1
+            unit_mesh, unit_sets = self._templates[key]
+            mesh = PanelMesh(
+                unit_mesh.xyz * scales,
+                unit_mesh.conn,
+                unit_mesh.part_ids,
+                unit_mesh.stiff_locations * scales[1],
+            )
+            return mesh, unit_sets.scaled(*scales, tol=tol)
+
+        # first panel of this topology, mesh and classify it then store the unit template
+        self.misses += 1
+        mesh = PanelMesh.stiffened(
+            geometry,
+            nx_plate=nx_plate,
+            ny_plate=ny_plate,
+            nz_stiff=nz_stiff,
+            nx_stiff_mult=nx_stiff_mult,
+        )
+        node_sets = PanelNodeSets(
+            *mesh.xyz.T,
+            a=geometry.spec.a,
+            b=geometry.spec.b,
+            stiff_locations=mesh.stiff_locations,
+            tol=tol,
+        )
+        unit_mesh = PanelMesh(
+            mesh.xyz / scales,
+            mesh.conn,
+            mesh.part_ids,
+            mesh.stiff_locations / scales[1],
+        )
+        unit_sets = node_sets.scaled(*(1.0 / scales))
+        self._templates[key] = (unit_mesh, unit_sets)
+        if self.cache_dir is not None:
+            self._save(key, unit_mesh, unit_sets)
+        return mesh, node_sets
+
+    def clear(self):
+        self._templates = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._templates)
+
+
+class CapsMeshCache:
+    """
+    content addressed store of the ESP/CAPS generated panel meshes, keyed by a sha256
+    of the CSM design parameters (a, b, num_stiff, h_w), the mesh settings and the
+    CSM file. Meshes are PanelMesh npz files written atomically, so concurrent runs
+    can share a cache_dir.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(geometry, csm_file, **mesh_settings) -> str:
+        spec = geometry.spec
+        with open(csm_file, "rb") as fp:
+            csm_hash = hashlib.sha256(fp.read()).hexdigest()
+        content = {
+            "a": spec.a,
+            "b": spec.b,
+            "num_stiff": spec.num_stiff,
+            "h_w": spec.h_w,
+            "mesh": {name: float(value) for name, value in mesh_settings.items()},
+            "csm": csm_hash,
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.cache_dir, f"caps_mesh_{key}.npz")
+
+    def load(self, key):
+        """stored mesh (without constraints) or None"""
+        if not os.path.exists(self._file(key)):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return PanelMesh.load(self._file(key))
+
+    def store(self, key, mesh):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=self.cache_dir, suffix=".npz", delete=False
+        ) as fp:
+            tmp_file = fp.name
+        PanelMesh(
+            mesh.xyz,
+            mesh.conn,
+            mesh.part_ids,
+            mesh.stiff_locations,
+            node_ids=mesh.node_ids,
+        ).save(tmp_file)
+        os.replace(tmp_file, self._file(key))
+
+    def __contains__(self, key):
+        return os.path.exists(self._file(key))
@@ -0,0 +1,172 @@
+"""
+Batched Rayleigh-Ritz buckling loads of simply supported stiffened panels from the
+non-dimensional parameters, a mid-fidelity estimate between the closed-form loads and
+the FEA. Sine series trial functions w = sum A_mn sin(m pi x/a) sin(n pi y/b) with
+smeared or discrete blade stiffeners give small dense stiffness and geometric stiffness
+matrices, solved for many panels at once with batched numpy eigensolves (no TACS or MPI).
+"""
+__all__ = ["ritz_basis", "ritz_matrices", "rayleigh_ritz_buckling"]
+
+import numpy as np
+
+# shear correction factor of the skin transverse shear stiffness
+_KAPPA = 5.0 / 6.0
+
+
+def ritz_basis(m_max, n_max) -> np.ndarray:
+    """(m_max * n_max, 2) half-wave numbers (m, n) of the sine terms, n fastest"""
+    m, n = np.meshgrid(np.arange(1, m_max + 1), np.arange(1, n_max + 1), indexing="ij")
+    return np.stack([m.ravel(), n.ravel()], axis=1)
+
+
+def _stiffener_coupling(n1, n2, num_stiff):
+    """
+    sum over num_stiff equally spaced stiffeners of 2/(N+1) sin(n1 pi y_k) sin(n2 pi y_k),
+    1 on the diagonal like a smeared stiffener plus the aliasing of the discrete ones
+    """
+    period = 2 * (np.asarray(num_stiff)[..., None, None] + 1)
+    return ((n1 - n2) % period == 0).astype(float) - ((n1 + n2) % period == 0)
+
+
+def ritz_matrices(
+    rho_0,
+    xi,
+    gamma=0.0,
+    delta=0.0,
+    zeta=0.0,
+    num_stiff=None,
+    axial=True,
+    m_max=10,
+    n_max=5,
+):
+    """
+    non-dimensional (K, KG) of the sine terms of ritz_basis for arrays of panels, with
+    shape (..., m_max * n_max, m_max * n_max). The eigenvalues of K x = lambda KG x are
+    the loads of global_axial_load (axial) or global_shear_load (shear), the stiffeners
+    are smeared (num_stiff None) or discrete and equally spaced. The skin terms have the
+    Mindlin factor 1 + pi^2 zeta (m^2/rho_0^2 + n^2) / (12 kappa) for transverse shear.
+    """
+    rho_0, xi, gamma, delta, zeta = np.broadcast_arrays(
+        *[np.asarray(_, dtype=float) for _ in [rho_0, xi, gamma, delta, zeta]]
+    )
+    rho_0, xi, gamma, delta, zeta = [
+        _[..., None, None] for _ in [rho_0, xi, gamma, delta, zeta]
+    ]
+    basis = ritz_basis(m_max, n_max).astype(float)
+    m1, n1 = basis[:, 0][:, None], basis[:, 1][:, None]
+    m2, n2 = basis[:, 0][None, :], basis[:, 1][None, :]
+    same_m = m1 == m2
+    eye = np.eye(basis.shape[0])
+
+    # skin bending and its transverse shear flexibility
+    skin = m1 ** 4 / rho_0 ** 2 + 2 * xi * m1 ** 2 * n1 ** 2 + rho_0 ** 2 * n1 ** 4
+    skin = skin / (
+        1.0 + np.pi ** 2 * zeta * (m1 ** 2 / rho_0 ** 2 + n1 ** 2) / 12.0 / _KAPPA
+    )
+
+    # stiffener bending along x couples the n terms of the same m
+    if num_stiff is None:
+        coupling = eye
+    else:
+        coupling = same_m * _stiffener_coupling(n1, n2, num_stiff)
+    K = skin * eye + gamma * m1 ** 4 / rho_0 ** 2 * coupling
+
+    if axial:
+        # the stiffeners carry delta / (1 + delta) of the axial load
+        KG = m1 ** 2 * (eye + delta * coupling) / (1.0 + delta)
+    else:
+        # in-plane shear of the skin, sine products with m + p and n + q odd
+        odd = ((m1 + m2) % 2 == 1) & ((n1 + n2) % 2 == 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            B = np.where(
+                odd,
+                4 * m1 * n1 * m2 * n2 / ((m2 ** 2 - m1 ** 2) * (n1 ** 2 - n2 ** 2)),
+                0.0,
+            )
+        KG = 8.0 * rho_0 / np.pi ** 2 * B
+    K, KG = np.broadcast_arrays(K, KG)
+    return K, KG
+
+
+def _lowest_eigenpairs(K, KG, num_eig):
+    """
+    lowest positive eigenvalues of K x = lambda KG x for stacks of symmetric matrices
+    with K positive definite, from the largest eigenvalues 1 / lambda of K^-1/2 KG K^-1/2
+    """
+    d, V = np.linalg.eigh(K)
+    W = V / np.sqrt(d)[..., None, :]
+    mu, Y = np.linalg.eigh(np.swapaxes(W, -1, -2) @ KG @ W)
+    mu = mu[..., ::-1][..., :num_eig]
+    modes = (W @ Y[..., ::-1])[..., :num_eig]
+    with np.errstate(divide="ignore"):
+        eigvals = np.where(mu > 0.0, 1.0 / mu, np.inf)
+    return eigvals, np.swapaxes(modes, -1, -2)
+
+
+def rayleigh_ritz_buckling(
+    rho_0,
+    xi,
+    gamma=0.0,
+    delta=0.0,
+    zeta=0.0,
+    num_stiff=None,
+    axial=True,
+    m_max=None,
+    n_max=None,
+    num_eig=1,
+    return_modes=False,
+):
+    """
+    lowest num_eig Rayleigh-Ritz buckling loads with shape (...) + (num_eig,) for arrays
+    of panels, see ritz_matrices. m_max and n_max default to enough half-waves for the
+    largest rho_0 and the discrete stiffener spacing. Axial loads don't couple the m terms
+    so each m is solved on its own. With return_modes also returns the sine coefficients
+    (..., num_eig, m_max * n_max) of each mode and the ritz_basis.
+    """
+    rho_max = float(np.max(rho_0))
+    if m_max is None:
+        m_max = max(8, int(np.ceil((2.5 if axial else 3.0) * rho_max)) + 4)
+    if n_max is None:
+        n_max = 5 if num_stiff is None else max(5, int(np.max(num_stiff)) + 2)
+    K, KG = ritz_matrices(
+        rho_0,
+        xi,
+        gamma=gamma,
+        delta=delta,
+        zeta=zeta,
+        num_stiff=num_stiff,
+        axial=axial,
+        m_max=m_max,
+        n_max=n_max,
+    )
+    basis = ritz_basis(m_max, n_max)
+    batch_shape = K.shape[:-2]
+
+    if axial:
+        # (..., m_max, n_max, n_max) blocks of each m
+        shape = batch_shape + (m_max, n_max, m_max, n_max)
+        idx = np.arange(m_max)
+        K_m = K.reshape(shape)[..., idx, :, idx, :]
+        KG_m = KG.reshape(shape)[..., idx, :, idx, :]
+        K_m, KG_m = [np.moveaxis(_, 0, -3) for _ in [K_m, KG_m]]
+        eig_m, modes_m = _lowest_eigenpairs(K_m, KG_m, min(num_eig, n_max))
+
+        # lowest loads over all m
+        eigvals = eig_m.reshape(batch_shape + (-1,))
+        order = np.argsort(eigvals, axis=-1, kind="stable")[..., :num_eig]
+        eigvals = np.take_along_axis(eigvals, order, axis=-1)
+        if not return_modes:
+            return eigvals
+        num_per_m = eig_m.shape[-1]
+        modes = np.zeros(batch_shape + (order.shape[-1], m_max, n_max))
+        coeffs = modes_m.reshape(batch_shape + (-1, n_max))
+        coeffs = np.take_along_axis(coeffs, order[..., None], axis=-2)
+        np.put_along_axis(
+            modes, (order // num_per_m)[..., None, None], coeffs[..., None, :], axis=-2
+        )
+        return eigvals, modes.reshape(batch_shape + (order.shape[-1], -1)), basis
+
+    eigvals, modes = _lowest_eigenpairs(K, KG, num_eig)
+    if not return_modes:
+        return eigvals
+    return eigvals, modes, basis
@@ -0,0 +1,196 @@
+"""
+Persistent pyTACS solver context of the stiffened panel analyses, the assembler and
+problems are kept across the panels of a sweep and updated in place when only the
+panel dimensions, the isotropic shell thicknesses and the prescribed displacements change.
+"""
+__all__ = ["TacsSolverContext"]
+
+import hashlib
+import numpy as np
+
+
+class TacsSolverContext:
+    """
+    pyTACS assembler and buckling / static problems shared by the analyses of a sweep.
+    The assembler is reused while the mesh topology, boundary condition pattern, materials
+    and thicknesses are unchanged. The nodes of a reused problem are scaled in place to the
+    new a, b, h_w and prescribed displacements proportional to the built ones (factor c > 0)
+    are solved through the built ones, the solution is linear in the prescribed values so
+    eigenvalues are divided by c and static results multiplied by c. The thicknesses of
+    isotropic components are design variables set in the kept problems, the ply-by-ply
+    composite shells have no thickness design variable so their thicknesses are part of
+    the signature. Any other change rebuilds the assembler.
+    """
+
+    def __init__(self, rtol=1e-10):
+        self.rtol = rtol
+        self.fea_assembler = None
+        self.num_builds = 0
+        self.num_reuses = 0
+        self._signature = None
+        self._ref_scales = None
+        self._ref_xyz = None
+        self._ref_spc_values = None
+        self._scales = None
+        self._ref_nodes = None
+        self._problems = {}
+        self._dv_components = {}
+        self._design_vars = None
+
+    @staticmethod
+    def signature(analysis) -> tuple:
+        """everything the assembler depends on besides the node coordinates and bc values"""
+        mesh = analysis.mesh
+        digest = hashlib.sha256()
+        for array in [
+            mesh.node_ids,
+            mesh.elem_ids,
+            mesh.part_ids,
+            mesh.conn,
+            mesh.rbe_elem_ids,
+            mesh.rbe_control_nodes,
+            mesh.spc_node_ids,
+        ]:
+            array = np.ascontiguousarray(array, dtype=np.int64)
+            digest.update(str(array.shape).encode())
+            digest.update(array.tobytes())
+        for nodes in mesh.rbe_dependent_nodes:
+            digest.update(np.ascontiguousarray(nodes, dtype=np.int64).tobytes())
+        spc_dofs = np.broadcast_to(np.asarray(mesh.spc_dofs), mesh.spc_node_ids.shape)
+        digest.update(",".join(spc_dofs.astype(str).tolist()).encode())
+
+        # thicknesses of the composite components, the isotropic ones are design variables
+        geometry = analysis.geometry
+        thicknesses = []
+        if not analysis.plate_material.spec.isotropic:
+            thicknesses += [
+                geometry.component_thickness(comp) for comp in ["panel", "rib"]
+            ]
+        if not analysis.stiffener_material.spec.isotropic:
+            thicknesses += [
+                geometry.component_thickness(comp) for comp in ["base", "stiff"]
+            ]
+        thicknesses = tuple(thicknesses)
+        return (
+            digest.hexdigest(),
+            analysis.plate_material.spec,
+            analysis.stiffener_material.spec,
+            thicknesses,
+        )
+
+    @staticmethod
+    def _geometry_scales(geometry) -> np.ndarray:
+        h_w = geometry.h_w if geometry.num_stiff > 0 else 1.0
+        return np.array([geometry.a, geometry.b, h_w], dtype=float)
+
+    def _load_factor(self, spc_values):
+        """c with spc_values = c * built values, None if not proportional"""
+        ref = self._ref_spc_values
+        values = np.asarray(spc_values, dtype=float)
+        ref_norm2 = float(np.dot(ref, ref))
+        if ref_norm2 == 0.0:
+            return 1.0 if not np.any(values) else None
+        c = float(np.dot(values, ref)) / ref_norm2
+        atol = self.rtol * np.max(np.abs(values))
+        if c <= 0.0 or not np.allclose(values, c * ref, rtol=self.rtol, atol=atol):
+            return None
+        return c
+
+    def _is_affine(self, xyz, scales) -> bool:
+        """whether the new node coordinates are the built ones scaled per axis"""
+        expected = self._ref_xyz * (scales / self._ref_scales)
+        atol = self.rtol * np.max(np.abs(xyz))
+        return np.allclose(xyz, expected, rtol=self.rtol, atol=atol)
+
+    def _thickness_design_vars(self, geometry) -> np.ndarray:
+        """local design variables of the assembler with the thicknesses of the geometry"""
+        x = np.array(self.fea_assembler.getOrigDesignVars())
+        local_dv_nums = self.fea_assembler.getGlobalToLocalDVNums()
+        for dv_num, comp in self._dv_components.items():
+            if dv_num in local_dv_nums:
+                x[local_dv_nums[dv_num]] = geometry.component_thickness(comp)
+        return x
+
+    def prepare(self, analysis, build) -> float:
+        """
+        ready the assembler for the analysis, build() is called (collectively) to make
+        a new initialized pyTACS assembler when it can't be reused.
+        Returns the load factor c of the prescribed displacements.
+        """
+        mesh = analysis.mesh
+        scales = self._geometry_scales(analysis.geometry)
+        signature = self.signature(analysis)
+
+        c = None
+        if self.fea_assembler is not None and signature == self._signature:
+            c = self._load_factor(mesh.spc_values)
+            if c is not None and not self._is_affine(mesh.xyz, scales):
+                c = None
+
+        if c is None:
+            self.fea_assembler = build()
+            self.num_builds += 1
+            self._signature = signature
+            self._ref_scales = scales
+            self._ref_xyz = np.array(mesh.xyz, dtype=float)
+            self._ref_spc_values = np.array(mesh.spc_values, dtype=float)
+            self._ref_nodes = None
+            self._problems = {}
+            self._dv_components = dict(analysis._thickness_dvs)
+            self._design_vars = None
+            c = 1.0
+        else:
+            self.num_reuses += 1
+            if self._dv_components:
+                self._design_vars = self._thickness_design_vars(analysis.geometry)
+        self._scales = scales
+        return c
+
+    def _problem(self, kind, key, create):
+        """
+        kept problem of one kind, remade when its key changes, nodes and thickness
+        design variables set in place
+        """
+        if kind not in self._problems or self._problems[kind][0] != key:
+            self._problems[kind] = (key, create())
+            if self._ref_nodes is None:
+                # local node coordinates of the built geometry, before any update
+                self._ref_nodes = np.array(self._problems[kind][1].getNodes())
+        problem = self._problems[kind][1]
+        ratio = self._scales / self._ref_scales
+        problem.setNodes((self._ref_nodes.reshape((-1, 3)) * ratio).ravel())
+        if self._design_vars is not None:
+            problem.setDesignVars(self._design_vars)
+        return problem
+
+    def buckling_problem(self, sigma, num_eig, name="buckle"):
+        """buckling problem of the current assembler, kept while sigma and num_eig match"""
+        return self._problem(
+            "buckle",
+            (float(sigma), int(num_eig), name),
+            lambda: self.fea_assembler.createBucklingProblem(
+                name=name, sigma=sigma, numEigs=num_eig
+            ),
+        )
+
+    def static_problem(self, name="static"):
+        """static problem of the current assembler"""
+        return self._problem(
+            "static",
+            name,
+            lambda: self.fea_assembler.createStaticProblem(name=name),
+        )
+
+    def clear(self):
+        """drop the assembler and problems"""
+        self.fea_assembler = None
+        self._signature = None
+        self._ref_nodes = None
+        self._problems = {}
+        self._dv_components = {}
+        self._design_vars = None
+
+    def __str__(self):
+        return (
+            f"TACS solver context, {self.num_builds} builds, {self.num_reuses} reuses"
+        )
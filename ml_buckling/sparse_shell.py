@@ -0,0 +1,385 @@
+"""
+In-process linear buckling of the panel meshes without TACS. Flat four node Mindlin
+shells (bilinear membrane and bending, MITC4 transverse shear, drilling penalty) are
+assembled with vectorized element kernels into scipy sparse matrices, the prestress
+comes from a static solve of the prescribed displacements and the buckling eigenpairs
+from scipy.sparse.linalg.eigsh in shift-invert (buckling) mode.
+"""
+__all__ = ["shell_laminate", "SparseShellModel"]
+
+import numpy as np
+
+# natural coordinates of the quad nodes, the 2x2 Gauss points and the MITC4 tying
+# points of the transverse shear strains (g_xi on eta = -1, 1 and g_eta on xi = -1, 1)
+_QUAD_NODES = np.array([[-1.0, -1.0], [1.0, -1.0], [1.0, 1.0], [-1.0, 1.0]])
+_GAUSS_PTS = _QUAD_NODES / np.sqrt(3.0)
+_TYING_PTS = np.array([[0.0, -1.0], [0.0, 1.0], [-1.0, 0.0], [1.0, 0.0]])
+
+# drilling stiffness over the mean transverse shear stiffness, as in the TACS shells
+_DRILL_REGULARIZATION = 10.0
+
+
+def shell_laminate(material, thickness, kcorr=5.0 / 6.0):
+    """
+    (6,6) ABD matrix about the midplane and (2,2) transverse shear stiffness of the
+    ply stack of a CompositeMaterial, in the material frame of its ref_axis.
+    G13 and G23 default to G12 like the TACS element callbacks.
+    """
+    spec = material.spec if hasattr(material, "spec") else material
+    E11, E22, nu12, G12 = spec.E11, spec.E22, spec.nu12, spec.G12
+    G13 = G12 if spec.G13 is None else spec.G13
+    G23 = G12 if spec.G23 is None else spec.G23
+    if spec.isotropic or spec.num_plies is None:
+        angles, fractions = np.zeros((1,)), np.ones((1,))
+    else:
+        angles, fractions = spec.rad_ply_angles, spec.ply_fractions
+
+    nu21 = nu12 * E22 / E11
+    Q = np.zeros((3, 3))
+    Q[0, 0], Q[1, 1] = E11 / (1 - nu12 * nu21), E22 / (1 - nu12 * nu21)
+    Q[0, 1] = Q[1, 0] = nu12 * Q[1, 1]
+    Q[2, 2] = G12
+    # ply stiffness in the laminate axes Qbar = T^T Q T, T the engineering strain rotation
+    c, s = np.cos(angles), np.sin(angles)
+    T = np.zeros((angles.shape[0], 3, 3))
+    T[:, 0] = np.stack([c ** 2, s ** 2, c * s], axis=1)
+    T[:, 1] = np.stack([s ** 2, c ** 2, -c * s], axis=1)
+    T[:, 2] = np.stack([-2 * c * s, 2 * c * s, c ** 2 - s ** 2], axis=1)
+    Qbar = np.swapaxes(T, 1, 2) @ Q @ T
+
+    # transverse shear in the (xz, yz) order of the shear strains
+    Qs = np.zeros((angles.shape[0], 2, 2))
+    Qs[:, 0, 0] = G13 * c ** 2 + G23 * s ** 2
+    Qs[:, 1, 1] = G13 * s ** 2 + G23 * c ** 2
+    Qs[:, 0, 1] = Qs[:, 1, 0] = (G13 - G23) * c * s
+
+    z = thickness * (np.concatenate([[0.0], np.cumsum(fractions)]) - 0.5)
+    dz1, dz2, dz3 = [(z[1:] ** k - z[:-1] ** k) / k for k in [1, 2, 3]]
+    ABD = np.zeros((6, 6))
+    ABD[:3, :3] = np.einsum("p,pij->ij", dz1, Qbar)
+    ABD[:3, 3:] = ABD[3:, :3] = np.einsum("p,pij->ij", dz2, Qbar)
+    ABD[3:, 3:] = np.einsum("p,pij->ij", dz3, Qbar)
+    As = kcorr * np.einsum("p,pij->ij", dz1, Qs)
+    return ABD, As
+
+
+def _shape_functions(pts):
+    """(P,4) bilinear shape functions and (P,2,4) natural derivatives at points (P,2)"""
+    xi, eta = pts[:, :1], pts[:, 1:]
+    xa, ya = _QUAD_NODES[:, 0], _QUAD_NODES[:, 1]
+    N = 0.25 * (1 + xi * xa) * (1 + eta * ya)
+    dN = 0.25 * np.stack([xa * (1 + eta * ya), ya * (1 + xi * xa)], axis=1)
+    return N, dN
+
+
+class SparseShellModel:
+    """
+    sparse stiffness, geometric stiffness and constraints of a PanelMesh. laminates maps
+    each part id to its (ABD, As) and ref_axes to the material 1-direction (projected onto
+    each element, global x by default). The SPCs and RBE2 elements of the mesh are
+    eliminated with a sparse map u = P_f q + P_p u_p of the free dofs q and the prescribed
+    values u_p, RBE2 dofs which also have an SPC keep the SPC.
+    """
+
+    def __init__(self, mesh, laminates: dict, ref_axes: dict = None):
+        self.mesh = mesh
+        self._node_order = np.argsort(mesh.node_ids)
+        self.num_dof = 6 * mesh.num_nodes
+
+        part_ids = np.unique(mesh.part_ids)
+        assert mesh.num_elements > 0, "the sparse backend needs the mesh elements"
+        assert set(part_ids.tolist()) <= set(laminates), "missing part laminates"
+        ref_axes = {} if ref_axes is None else ref_axes
+        index = np.searchsorted(part_ids, mesh.part_ids)
+        self._ABD = np.array([laminates[pid][0] for pid in part_ids])[index]
+        self._As = np.array([laminates[pid][1] for pid in part_ids])[index]
+        ref = [
+            [1.0, 0.0, 0.0] if ref_axes.get(pid) is None else ref_axes[pid]
+            for pid in part_ids
+        ]
+        self._ref = np.array(ref, dtype=float)[index]
+        self._k_drill = (
+            _DRILL_REGULARIZATION * 0.5 * (self._As[:, 0, 0] + self._As[:, 1, 1])
+        )
+
+        self._setup_elements()
+        self._setup_constraints()
+        self._K = None
+        self._K_ff = None
+        self._lu = None
+        self._u = None
+
+    def _node_rows(self, node_ids) -> np.ndarray:
+        """rows of the mesh nodes with these ids"""
+        sorted_ids = self.mesh.node_ids[self._node_order]
+        return self._node_order[np.searchsorted(sorted_ids, node_ids)]
+
+    @classmethod
+    def from_materials(cls, mesh, materials: dict, kcorr=5.0 / 6.0):
+        """model from a dict of part id to (CompositeMaterial, thickness)"""
+        laminates, ref_axes = {}, {}
+        for pid, (material, thickness) in materials.items():
+            laminates[pid] = shell_laminate(material, thickness, kcorr=kcorr)
+            ref_axis = np.asarray(material.ref_axis)
+            ref_axes[pid] = None if ref_axis.ndim == 0 else ref_axis
+        return cls(mesh, laminates, ref_axes)
+
+    def _setup_elements(self):
+        """local frames, shape function derivatives and strain matrices of all elements"""
+        self._conn_rows = self._node_rows(self.mesh.conn)
+        X = self.mesh.xyz[self._conn_rows]
+        normal = np.cross(X[:, 2] - X[:, 0], X[:, 3] - X[:, 1])
+        normal /= np.linalg.norm(normal, axis=1, keepdims=True)
+        e1 = self._ref - np.sum(self._ref * normal, axis=1, keepdims=True) * normal
+        edge = X[:, 1] - X[:, 0]
+        degenerate = np.linalg.norm(e1, axis=1) < 1e-8
+        e1[degenerate] = edge[degenerate]
+        e1 /= np.linalg.norm(e1, axis=1, keepdims=True)
+        e2 = np.cross(normal, e1)
+        # (E,3,3) rows are the local axes, local = R @ global
+        self._R = np.stack([e1, e2, normal], axis=1)
+        xl = np.einsum(
+            "eij,eaj->eai", self._R[:, :2], X - X.mean(axis=1, keepdims=True)
+        )
+
+        N, dN = _shape_functions(_GAUSS_PTS)
+        J = np.einsum("pia,eaj->epij", dN, xl)
+        self._detJ = np.linalg.det(J)
+        assert np.all(self._detJ > 0.0), "inverted or degenerate elements"
+        invJ = np.linalg.inv(J)
+        dNdx = np.einsum("epij,pja->epia", invJ, dN)
+        self._dNdx = dNdx
+
+        num_elem = X.shape[0]
+        num_gp = _GAUSS_PTS.shape[0]
+        Bm = np.zeros((num_elem, num_gp, 6, 4, 6))
+        # membrane [u_x, v_y, u_y + v_x]
+        Bm[:, :, 0, :, 0] = dNdx[:, :, 0]
+        Bm[:, :, 1, :, 1] = dNdx[:, :, 1]
+        Bm[:, :, 2, :, 0] = dNdx[:, :, 1]
+        Bm[:, :, 2, :, 1] = dNdx[:, :, 0]
+        # bending [thy_x, -thx_y, thy_y - thx_x]
+        Bm[:, :, 3, :, 4] = dNdx[:, :, 0]
+        Bm[:, :, 4, :, 3] = -dNdx[:, :, 1]
+        Bm[:, :, 5, :, 4] = dNdx[:, :, 1]
+        Bm[:, :, 5, :, 3] = -dNdx[:, :, 0]
+        self._Bmb = Bm.reshape((num_elem, num_gp, 6, 24))
+
+        # drilling thz - (v_x - u_y) / 2
+        Bd = np.zeros((num_elem, num_gp, 4, 6))
+        Bd[:, :, :, 5] = N
+        Bd[:, :, :, 1] = -0.5 * dNdx[:, :, 0]
+        Bd[:, :, :, 0] = 0.5 * dNdx[:, :, 1]
+        self._Bd = Bd.reshape((num_elem, num_gp, 24))
+
+        # MITC4 transverse shear, covariant strains at the tying points
+        Nt, dNt = _shape_functions(_TYING_PTS)
+        Jt = np.einsum("pia,eaj->epij", dNt, xl)
+        dNdxt = np.einsum("epij,pja->epia", np.linalg.inv(Jt), dNt)
+        Bt = np.zeros((num_elem, 4, 2, 4, 6))
+        Bt[:, :, 0, :, 2] = dNdxt[:, :, 0]
+        Bt[:, :, 0, :, 4] = Nt
+        Bt[:, :, 1, :, 2] = dNdxt[:, :, 1]
+        Bt[:, :, 1, :, 3] = -Nt
+        Bcov = np.einsum("etij,etjk->etik", Jt, Bt.reshape((num_elem, 4, 2, 24)))
+        xi, eta = _GAUSS_PTS[:, 0], _GAUSS_PTS[:, 1]
+        B_xi = 0.5 * (
+            (1 - eta)[None, :, None] * Bcov[:, None, 0, 0]
+            + (1 + eta)[None, :, None] * Bcov[:, None, 1, 0]
+        )
+        B_eta = 0.5 * (
+            (1 - xi)[None, :, None] * Bcov[:, None, 2, 1]
+            + (1 + xi)[None, :, None] * Bcov[:, None, 3, 1]
+        )
+        self._Bs = np.einsum("epij,epjk->epik", invJ, np.stack([B_xi, B_eta], axis=2))
+
+        # global dofs of each element
+        self._elem_dofs = (
+            6 * self._conn_rows[:, :, None] + np.arange(6)[None, None, :]
+        ).reshape((num_elem, 24))
+
+    def _setup_constraints(self):
+        """sparse maps of the free and prescribed dofs through the SPCs and RBE2s"""
+        from scipy.sparse import csr_matrix
+
+        mesh = self.mesh
+        spc_rows = self._node_rows(mesh.spc_node_ids)
+        spc_dofs = np.broadcast_to(np.asarray(mesh.spc_dofs), spc_rows.shape)
+        spc_values = np.broadcast_to(np.asarray(mesh.spc_values), spc_rows.shape)
+        prescribed = np.full((self.num_dof,), np.nan)
+        for row, dofs, value in zip(spc_rows, spc_dofs.tolist(), spc_values):
+            prescribed[6 * row + np.array([int(_) - 1 for _ in str(dofs)])] = value
+        is_spc = ~np.isnan(prescribed)
+
+        # dependent RBE2 dofs rigidly follow the control node (small rotations)
+        dep_dofs, ctrl_dofs, coeffs = [], [], []
+        for control, nodes in zip(mesh.rbe_control_nodes, mesh.rbe_dependent_nodes):
+            crow = self._node_rows(np.array([control]))[0]
+            for drow in self._node_rows(np.asarray(nodes)):
+                rx, ry, rz = mesh.xyz[drow] - mesh.xyz[crow]
+                # translations u_d = u_c + theta_c x r, rotations theta_d = theta_c
+                rigid = np.eye(6)
+                rigid[:3, 3:] = [[0.0, rz, -ry], [-rz, 0.0, rx], [ry, -rx, 0.0]]
+                for comp in [int(_) - 1 for _ in "23"]:
+                    if is_spc[6 * drow + comp]:
+                        continue
+                    nonzero = np.nonzero(rigid[comp])[0]
+                    dep_dofs += [6 * drow + comp] * nonzero.shape[0]
+                    ctrl_dofs += (6 * crow + nonzero).tolist()
+                    coeffs += rigid[comp, nonzero].tolist()
+        is_dep = np.zeros((self.num_dof,), dtype=bool)
+        is_dep[dep_dofs] = True
+        assert not np.any(is_dep[ctrl_dofs]), "chained RBE2 elements"
+
+        masters = np.nonzero(~is_dep)[0]
+        col = np.full((self.num_dof,), -1)
+        col[masters] = np.arange(masters.shape[0])
+        rows = np.concatenate([masters, np.array(dep_dofs, dtype=int)])
+        cols = np.concatenate([col[masters], col[np.array(ctrl_dofs, dtype=int)]])
+        vals = np.concatenate([np.ones(masters.shape), np.array(coeffs)])
+        P = csr_matrix((vals, (rows, cols)), shape=(self.num_dof, masters.shape[0]))
+
+        presc = is_spc[masters]
+        self._P_f = P[:, np.nonzero(~presc)[0]].tocsr()
+        self._P_p = P[:, np.nonzero(presc)[0]].tocsr()
+        self._u_p = prescribed[masters[presc]]
+
+    @property
+    def num_free(self) -> int:
+        return self._P_f.shape[1]
+
+    def _assemble(self, elem_mats):
+        from scipy.sparse import coo_matrix
+
+        dofs = self._elem_dofs
+        rows = np.broadcast_to(dofs[:, :, None], elem_mats.shape).ravel()
+        cols = np.broadcast_to(dofs[:, None, :], elem_mats.shape).ravel()
+        shape = (self.num_dof, self.num_dof)
+        return coo_matrix((elem_mats.ravel(), (rows, cols)), shape=shape).tocsr()
+
+    def _to_global(self, elem_mats):
+        """rotate (E,24,24) local element matrices to the global dofs"""
+        num_elem = elem_mats.shape[0]
+        mats = elem_mats.reshape((num_elem, 8, 3, 8, 3))
+        mats = np.einsum("eki,eakbl,elj->eaibj", self._R, mats, self._R, optimize=True)
+        return mats.reshape((num_elem, 24, 24))
+
+    def _local_dofs(self, u):
+        """(E,24) element dofs in the local frames from the global dof vector u"""
+        ue = u[self._elem_dofs].reshape((-1, 8, 3))
+        return np.einsum("eij,eaj->eai", self._R, ue).reshape((-1, 24))
+
+    @property
+    def stiffness(self):
+        """global sparse stiffness matrix (num_dof, num_dof), assembled once"""
+        if self._K is None:
+            # Gauss point sums of B^T C B as batched matmuls
+            wB = self._detJ[:, :, None, None] * self._Bmb
+            Ke = np.sum(
+                np.swapaxes(wB, -1, -2) @ (self._ABD[:, None] @ self._Bmb), axis=1
+            )
+            wB = self._detJ[:, :, None, None] * self._Bs
+            Ke += np.sum(
+                np.swapaxes(wB, -1, -2) @ (self._As[:, None] @ self._Bs), axis=1
+            )
+            wB = (self._k_drill[:, None] * self._detJ)[:, :, None] * self._Bd
+            Ke += np.swapaxes(wB, -1, -2) @ self._Bd
+            self._K = self._assemble(self._to_global(Ke))
+        return self._K
+
+    def stress_resultants(self, u) -> np.ndarray:
+        """
+        (E, 4, 9) resultants [N11, N22, N12, M11, M22, M12, Q13, Q23, drill] at the
+        Gauss points of each element in its local frame
+        """
+        q = self._local_dofs(u)
+        strains = np.einsum("epij,ej->epi", self._Bmb, q)
+        NM = np.einsum("eij,epj->epi", self._ABD, strains)
+        Q = np.einsum("eij,epjk,ek->epi", self._As, self._Bs, q)
+        drill = self._k_drill[:, None] * np.einsum("epj,ej->ep", self._Bd, q)
+        return np.concatenate([NM, Q, drill[:, :, None]], axis=2)
+
+    def geometric_stiffness(self, u):
+        """global sparse geometric stiffness of the membrane resultants of the state u"""
+        N = self.stress_resultants(u)
+        Nmat = np.stack(
+            [
+                np.stack([N[..., 0], N[..., 2]], -1),
+                np.stack([N[..., 2], N[..., 1]], -1),
+            ],
+            axis=-2,
+        )
+        S = np.einsum(
+            "ep,epia,epij,epjb->eab", self._detJ, self._dNdx, Nmat, self._dNdx
+        )
+        # same geometric stiffness for the three translations, invariant to the frame
+        Ge = np.zeros((S.shape[0], 4, 6, 4, 6))
+        for comp in range(3):
+            Ge[:, :, comp, :, comp] = S
+        return self._assemble(Ge.reshape((-1, 24, 24)))
+
+    def _factorize(self):
+        """reduced stiffness of the free dofs and its sparse LU factors, made once"""
+        from scipy.sparse.linalg import splu
+
+        if self._lu is None:
+            self._K_ff = (self._P_f.T @ self.stiffness @ self._P_f).tocsc()
+            self._lu = splu(self._K_ff)
+        return self._K_ff, self._lu
+
+    def solve_static(self) -> np.ndarray:
+        """(num_dof,) displacements of the prescribed SPC values, solved once"""
+        if self._u is None:
+            _, lu = self._factorize()
+            u_p = self._P_p @ self._u_p
+            q = lu.solve(-(self._P_f.T @ (self.stiffness @ u_p)))
+            self._u = self._P_f @ q + u_p
+        return self._u
+
+    def average_stresses(self, u=None, part_id=None) -> np.ndarray:
+        """area averaged stress resultants of one part (all elements if None)"""
+        u = self.solve_static() if u is None else u
+        N = self.stress_resultants(u)
+        weights = np.array(self._detJ)
+        if part_id is not None:
+            weights[self.mesh.part_ids != part_id] = 0.0
+        return np.einsum("ep,epi->i", weights, N) / np.sum(weights)
+
+    def solve_buckling(self, sigma=5.0, num_eig=5, u=None, v0=None):
+        """
+        num_eig eigenpairs of (K + lambda G) phi = 0 nearest the shift sigma, sorted by
+        eigenvalue. With sigma None the lowest positive eigenvalues come from the factorized
+        stiffness of the static solve (largest mu of -G phi = mu K phi, lambda = 1/mu)
+        instead of a new shift-invert factorization. v0 (num_dof,) starts the Lanczos
+        iterations, e.g. from a nearby mode of a continuation path. Returns the eigenvalues,
+        the (num_eig, num_dof) unit eigenvectors and the relative residuals
+        |(K + lambda G) phi| / |K phi|
+        """
+        from scipy.sparse.linalg import eigsh, LinearOperator
+
+        u = self.solve_static() if u is None else u
+        assert np.any(
+            u
+        ), "the buckling prestress needs nonzero prescribed displacements"
+        K_ff, lu = self._factorize()
+        G_ff = (self._P_f.T @ self.geometric_stiffness(u) @ self._P_f).tocsc()
+        num_eig = min(num_eig, self.num_free - 1)
+        if v0 is not None:
+            v0 = self._P_f.T @ np.real(np.asarray(v0, dtype=float))
+            v0 = v0 if np.any(v0) else None
+        if sigma is None:
+            Kinv = LinearOperator(K_ff.shape, matvec=lu.solve, dtype=float)
+            mu, vecs = eigsh(-G_ff, k=num_eig, M=K_ff, Minv=Kinv, which="LA", v0=v0)
+            eigvals = 1.0 / mu
+        else:
+            eigvals, vecs = eigsh(
+                K_ff, k=num_eig, M=-G_ff, sigma=sigma, mode="buckling", v0=v0
+            )
+
+        order = np.argsort(eigvals)
+        eigvals, vecs = eigvals[order], vecs[:, order]
+        Kv, Gv = K_ff @ vecs, G_ff @ vecs
+        errors = np.linalg.norm(Kv + eigvals * Gv, axis=0) / np.linalg.norm(Kv, axis=0)
+        eigvecs = (self._P_f @ vecs).T
+        eigvecs /= np.linalg.norm(eigvecs, axis=1, keepdims=True)
+        return eigvals, eigvecs, errors
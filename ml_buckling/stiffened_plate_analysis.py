@@ -1,17 +1,39 @@
 __all__ = ["StiffenedPlateAnalysis"]
 
 import numpy as np
-from tacs import pyTACS, constitutive, elements, utilities, caps2tacs, TACS
+try:
+    from tacs import pyTACS, constitutive, elements, utilities, caps2tacs, TACS
+except ImportError:  # only the scipy backend without TACS
+    pyTACS = constitutive = elements = utilities = caps2tacs = TACS = None
 import os
+import csv
 from pprint import pprint
 from .stiffened_plate_geometry import StiffenedPlateGeometry
+from .panel_mesh import (
+    PanelMesh,
+    PanelNodeSets,
+    MeshTemplateCache,
+    CapsMeshCache,
+    SYMMETRY_DOFS,
+    mirror_modes,
+)
+from .workspace import AnalysisWorkspace
+from .solver_context import TacsSolverContext
+from .continuation import ContinuationPath
+from .bdf_writer import spc_cards, rbe2_cards, write_bdf, bdf_deck, nastran_model
 from .composite_material import CompositeMaterial
 from .composite_material_utility import CompositeMaterialUtility
+from .closed_form import global_axial_load, global_shear_load, size_stiffeners
+from .mesh_sizing import panel_mesh_sizes, mode_half_waves
+from .rayleigh_ritz import rayleigh_ritz_buckling
+from .sparse_shell import SparseShellModel
 
 # from typing_extensions import Self
-from scipy.optimize import fsolve
 
-dtype = utilities.BaseUI.dtype
+dtype = float if utilities is None else utilities.BaseUI.dtype
+
+# dofs of each node kept in the eigenvectors by each eigvec_storage policy
+_EIGVEC_DOFS = {"full": (0, 1, 2, 3, 4, 5), "uvw": (0, 1, 2), "w": (2,)}
 
 
 def exp_kernel1(xp, xq, sigma_f, L):
@@ -28,8 +50,21 @@ class StiffenedPlateAnalysis:
         stiffener_material: CompositeMaterial,
         name=None,  # use the plate name to differentiate plate folder names
         _compress_stiff=False,  # whether to compress stiffeners to in axial case (TODO : figure this out => need to study static analysis)
+        workspace: AnalysisWorkspace = None,  # scratch directory instead of the cwd
+        solver_context: TacsSolverContext = None,  # reuse the TACS assembler across panels
+        backend: str = "tacs",  # or "scipy" for the in-process sparse shell solver
+        eigvec_storage: str = "full",  # or "uvw", "w" dofs kept in the eigenvectors
+        eigvec_dtype=np.float64,  # or np.float32 for the kept real eigenvectors
     ):
+        assert backend in ["tacs", "scipy"]
+        assert eigvec_storage in _EIGVEC_DOFS
+        assert np.dtype(eigvec_dtype) in [np.float64, np.float32]
         self.comm = comm
+        self.workspace = workspace
+        self.solver_context = solver_context
+        self.backend = backend
+        self.eigvec_storage = eigvec_storage
+        self.eigvec_dtype = np.dtype(eigvec_dtype)
         self.geometry = geometry
         self.plate_material = plate_material
         self.stiffener_material = stiffener_material
@@ -48,9 +83,18 @@ class StiffenedPlateAnalysis:
         self._eyy = None
 
         self._MAC_msg = "MAC not performed.."
+        self._nondim_sets = None
+        self._bdf_pending = False
+        self.eig_windows = []
+        self.screening = None
+        self.mode_symmetry = None
+        self._shell_model = None
+        self._global_mode_flags = None
+        self._w_fractions = None
+        self._thickness_dvs = {}
 
     @classmethod
-    def copy(cls, analysis, name=None):
+    def copy(cls, analysis, name=None, workspace=None, solver_context=None):
         return cls(
             comm=analysis.comm,
             geometry=analysis.geometry,
@@ -58,8 +102,34 @@ class StiffenedPlateAnalysis:
             stiffener_material=analysis.stiffener_material,
             name=analysis._name if name is None else name,
             _compress_stiff=analysis._compress_stiff_override,
+            workspace=workspace,
+            solver_context=solver_context,
+            backend=analysis.backend,
+            eigvec_storage=analysis.eigvec_storage,
+            eigvec_dtype=analysis.eigvec_dtype,
         )
 
+    @property
+    def work_dir(self) -> str:
+        """folder of the bdf file and solution output, the workspace or else the cwd"""
+        if self.workspace is not None:
+            return self.workspace.path
+        return os.getcwd()
+
+    def _solution_folder(self, base_path, folder_name) -> str:
+        """
+        folder of the solution files in base_path (default work_dir), made on the root proc.
+        None for in-memory workspaces without a base_path, which write no solution files
+        """
+        if base_path is None:
+            base_path = self.work_dir
+        if base_path is None:
+            return None
+        folder = os.path.join(base_path, folder_name)
+        if not os.path.exists(folder) and self.comm.rank == 0:
+            os.mkdir(folder)
+        return folder
+
     @property
     def buckling_folder_name(self) -> str:
         if self._name:
@@ -100,8 +170,7 @@ class StiffenedPlateAnalysis:
             tacs_dir = self._tacs_aim.root_analysis_dir
             return os.path.join(tacs_dir, "tacs.bdf")
         else:
-            cwd = os.getcwd()
-            return os.path.join(cwd, "_stiffened_panel.bdf")
+            return os.path.join(self.work_dir, "_stiffened_panel.bdf")
 
     @property
     def Darray_stiff(self) -> float:
@@ -607,11 +676,15 @@ class StiffenedPlateAnalysis:
         _make_rbe=True,
         _explicit_poisson_exp=False,
         side_support: bool = True,
+        write_bdf_file: bool = True,  # False builds the TACS model from the in-memory mesh
+        mesh_cache: MeshTemplateCache = None,  # reuse meshes of the same topology in sweeps
+        symmetry: dict = None,  # half / quarter panel class, e.g. {"x": "S", "y": "S"}
         # caps2tacs method settings
         use_caps=False,
         global_mesh_size=0.1,  # caps settings
         edge_pt_min=5,
         edge_pt_max=40,
+        caps_cache: CapsMeshCache = None,  # reuse CAPS meshes of the same design
     ):
         """
         Generate a stiffened plate mesh with CQUAD4 elements
@@ -627,12 +700,58 @@ class StiffenedPlateAnalysis:
 
         self._test_broadcast()
 
+        # symmetry reduced models keep the panel below the x = a/2 and y = b/2 planes
+        symmetry = {} if symmetry is None else dict(symmetry)
+        if symmetry:
+            assert exy == 0.0 and not use_caps, "symmetry models need axial loads, no CAPS"
+            assert set(symmetry) <= {"x", "y"}
+            # antisymmetric planes fix u there (x = a/2 frees it), the prestress and the
+            # eigenproblem share these BCs so it would lose or distort the compression
+            assert set(symmetry.values()) == {
+                "S"
+            }, "antisymmetric modes conflict with the axial prestress BCs"
+            if "y" in symmetry:
+                stiff_locations = self.geometry.spec.stiff_locations
+                assert np.all(
+                    np.abs(stiff_locations - self.geometry.b / 2.0) > 1e-8
+                ), "no stiffener on the y = b/2 symmetry plane (even num_stiff)"
+        self._symmetry = symmetry
+
         self._use_caps = use_caps
+        in_memory = self.workspace is not None and self.workspace.in_memory
+        assert not (use_caps and in_memory), "caps2tacs needs a workspace directory"
+        self._write_bdf = (write_bdf_file and not in_memory) or use_caps
+        self.mesh = None
+        node_sets = None
+
+        # CAPS meshes are stored by their design parameters and mesh settings,
+        # a cached mesh is then used like the structured mesh without running CAPS
+        problem_name = "capsStruct"
+        if use_caps and caps_cache is not None:
+            caps_key = caps_cache.key(
+                self.geometry,
+                self.csm_file,
+                global_mesh_size=global_mesh_size,
+                edge_pt_min=edge_pt_min,
+                edge_pt_max=edge_pt_max,
+            )
+            problem_name = os.path.join(self.work_dir, f"capsStruct_{caps_key[:16]}")
+            if self.comm.rank == 0:
+                self.mesh = caps_cache.load(caps_key)
+            if self.comm.bcast(self.mesh is not None, root=0):
+                use_caps = False
+                self._use_caps = False
+                self._write_bdf = write_bdf_file and not in_memory
+        # the CAPS dat and bdf files get the boundary conditions, unless the mesh is cached
+        edit_caps_files = use_caps and caps_cache is None
 
         if use_caps:
             # use caps2tacs to generate a stiffened panel
             tacs_model = caps2tacs.TacsModel.build(
-                csm_file=self.csm_file, comm=self.comm, active_procs=[0]
+                csm_file=self.csm_file,
+                comm=self.comm,
+                active_procs=[0],
+                problem_name=problem_name,
             )
             tacs_aim = tacs_model.tacs_aim
             self._tacs_aim = tacs_aim
@@ -678,224 +797,56 @@ class StiffenedPlateAnalysis:
             tacs_model.setup(include_aim=True)
             tacs_model.pre_analysis()
 
-        elif self.comm.rank == 0:  # make the bdf file without CAPS
-            if os.path.exists(self.bdf_file):
-                os.remove(self.bdf_file)
-
-            fp = open(self.bdf_file, "w")
-            fp.write("$ Input file for a square axial/shear-disp BC plate\n")
-            fp.write("SOL 103\nCEND\nBEGIN BULK\n")
-
-            nodes_dict = []
-            written_nodes = []
-            elem_dicts = []
-            node_id = 0
-            elem_id = 0
-
-            class Node:
-                TOL = 1e-10
-
-                def __init__(self, x, y, z, id):
-                    self.x = x
-                    self.y = y
-                    self.z = z
-                    self.id = id
-
-                @classmethod
-                def in_tol(cls, x1, x2):
-                    return abs(x1 - x2) < cls.TOL
-
-                def same_location(self, x, y, z):
-                    return (
-                        self.in_tol(x, self.x)
-                        and self.in_tol(y, self.y)
-                        and self.in_tol(z, self.z)
-                    )
-
-                @property
-                def node_dict(self) -> dict:
-                    return {
-                        "x": self.x,
-                        "y": self.y,
-                        "z": self.z,
-                        "id": self.id,
-                    }
-
-            class Element:
-                def __init__(self, id: int, part_id: int, nodes: list):
-                    self.id = id
-                    self.part_id = part_id
-                    self.nodes = nodes
-
-            class Mesh:
-                def __init__(self):
-                    self.nodes = []
-                    self.elements = []
-
-                @property
-                def max_node_id(self) -> int:
-                    if len(self.nodes) == 0:
-                        return 0
-                    else:
-                        return max([node.id for node in self.nodes])
-
-                @property
-                def max_elem_id(self) -> int:
-                    if len(self.elements) == 0:
-                        return 0
-                    else:
-                        return max([elem.id for elem in self.elements])
-
-                def add_node_at(self, x, y, z):
-                    _existing_node = False
-                    for node in self.nodes:
-                        if node.same_location(x, y, z):
-                            _existing_node = True
-                            break
-                    if _existing_node:
-                        _id = node.id
-                    else:
-                        _id = self.max_node_id + 1
-                    my_node = Node(x, y, z, _id)
-                    if not _existing_node:  # add new node if didn't exist yet
-                        self.nodes += [my_node]
-                    return my_node
-
-                def add_element(self, x_list, y_list, z_list, part_id: int):
-                    """each x_list, y_list, z_list are the coordinates of the element points (e.g. length-4 list if quad)"""
-                    nodes = []
-                    for i in range(len(x_list)):
-                        node = self.add_node_at(x_list[i], y_list[i], z_list[i])
-                        nodes += [node]
-
-                    elem_id = self.max_elem_id + 1
-                    my_elem = Element(id=elem_id, part_id=part_id, nodes=nodes)
-                    self.elements += [my_elem]
-                    return my_elem
-
-                @property
-                def node_dicts(self) -> list:
-                    return [node.node_dict for node in self.nodes]
-
-            # make a new mesh object
-            self.mesh = Mesh()
-
-            N = self.geometry.num_local
-            # make each local section and stiffener
-            print(f"{N=}")
-            stiff_locations = []
-            for ilocal in range(N):
-                # extra leftover
-                if ilocal == 0:
-                    ystart = 0
-                elif ilocal == 1:
-                    ystart += self.geometry.boundary_s_p
-                else:
-                    ystart += self.geometry.s_p
-
-                stiff_locations += [ystart]
-
-                # print(f"{ystart=}, {ilocal=}")
-                # if ilocal == N-1:
-                #     exit()
-
-                Ly = (
-                    self.geometry.s_p
-                    if not (ilocal in [0, N - 1])
-                    else self.geometry.boundary_s_p
-                )
-                # print(f"y from {ystart} to {ystart+Ly}")
-                Lx = self.geometry.a
-                Lz_stiff = self.geometry.h_w
-
-                # make the local section of the plate
-                dx = Lx / (nx_plate - 1)
-                dy = Ly / (ny_plate - 1)
-                for iy in range(ny_plate - 1):
-                    y1 = dy * iy + ystart
-                    y2 = y1 + dy
-                    for ix in range(nx_plate - 1):
-                        x1 = dx * ix
-                        x2 = x1 + dx
-
-                        self.mesh.add_element(
-                            x_list=[x1, x2, x2, x1],
-                            y_list=[y1, y1, y2, y2],
-                            z_list=[0.0] * 4,
-                            part_id=1,
-                        )
+        elif self.comm.rank == 0 and self.mesh is None and mesh_cache is not None:
+            # scale the cached template of this mesh topology
+            self.mesh, node_sets = mesh_cache.get(
+                self.geometry,
+                nx_plate=nx_plate,
+                ny_plate=ny_plate,
+                nz_stiff=nz_stiff,
+                nx_stiff_mult=nx_stiff_mult,
+            )
 
-                # make the stiffener if not last local section
-                if ilocal == N - 1:
-                    continue
-                dz = Lz_stiff / (nz_stiff - 1)
-                dx_stiff = dx / nx_stiff_mult
-                ystiffener = ystart + Ly
-
-                for iz in range(nz_stiff - 1):
-                    z1 = iz * dz
-                    z2 = z1 + dz
-                    for ix in range(nx_plate - 1):
-                        x_start = dx * ix
-                        for istiff_mult in range(nx_stiff_mult):
-                            x1 = x_start + istiff_mult * dx_stiff
-                            x2 = x1 + dx_stiff
-
-                            self.mesh.add_element(
-                                x_list=[x1, x2, x2, x1],
-                                y_list=[ystiffener] * 4,
-                                z_list=[z1, z1, z2, z2],
-                                part_id=2,  # for stiffener
-                            )
-
-            # write out all of the nodes
-            for node in self.mesh.nodes:
-                spc = " "
-                coord_disp = 0
-                coord_id = 0
-                seid = 0
-                fp.write(
-                    "%-8s%16d%16d%16.9e%16.9e*       \n"
-                    % ("GRID*", node.id, coord_id, node.x, node.y)
-                )
-                fp.write(
-                    "*       %16.9e%16d%16s%16d        \n"
-                    % (node.z, coord_disp, spc, seid)
-                )
+        elif self.comm.rank == 0 and self.mesh is None:  # make the mesh without CAPS
+            # make a new structured mesh object
+            self.mesh = PanelMesh.stiffened(
+                self.geometry,
+                nx_plate=nx_plate,
+                ny_plate=ny_plate,
+                nz_stiff=nz_stiff,
+                nx_stiff_mult=nx_stiff_mult,
+            )
 
-            # use the nodes_dict to write the CQUAD4 elements
-            for elem in self.mesh.elements:
-                fp.write(
-                    "%-8s%8d%8d%8d%8d%8d%8d\n"
-                    % (
-                        "CQUAD4",
-                        elem.id,
-                        elem.part_id,
-                        elem.nodes[0].id,
-                        elem.nodes[1].id,
-                        elem.nodes[2].id,
-                        elem.nodes[3].id,
-                    )
-                )
-            # fp.close()
+        if symmetry and self.comm.rank == 0:
+            full_mesh = self.mesh
+            self.mesh, _ = full_mesh.clipped(
+                x_max=self.geometry.a / 2.0 if "x" in symmetry else None,
+                y_max=self.geometry.b / 2.0 if "y" in symmetry else None,
+                tol=1e-8 * self.geometry.a,
+            )
+            assert (
+                2 ** len(symmetry) * self.mesh.num_elements == full_mesh.num_elements
+            ), "the mesh needs node lines on the symmetry planes (odd nx_plate / ny_plate)"
+            scales = [self.geometry.a, self.geometry.b, self.geometry.h_w]
+            self._full_nondim_xyz = full_mesh.xyz / np.array(scales)
+            node_sets = None
 
         self._test_broadcast()
 
-        # read the bdf file to get the boundary nodes
+        # get the node coordinates to find the boundary nodes
         # and then add custom BCs for axial or shear
-        if self.comm.rank == 0:
-
-            # read the BDF file
-            hdl = open(self.bdf_file, "r")
-            lines = hdl.readlines()
-            hdl.close()
-
-            next_line = False
-            nodes = []
-
         if self.comm.rank == 0:
 
             if self._use_caps:
+                # read the BDF file
+                hdl = open(self.bdf_file, "r")
+                lines = hdl.readlines()
+                hdl.close()
+
+                next_line = False
+                nodes = []
+                elems = []
+                max_eid = 0
                 for line in lines:
                     chunks = line.split(" ")
                     non_null_chunks = [_ for _ in chunks if not (_ == "" or _ == "\n")]
@@ -916,81 +867,83 @@ class StiffenedPlateAnalysis:
                             "y": float(y_chunk),
                             "z": None,
                         }
-            else:
-                nodes = self.mesh.node_dicts  # copy the list
-
-            # make nodes dict for nodes on the boundary
-            boundary_nodes = []
-
-            def in_tol(val1, val2):
-                return abs(val1 - val2) < 1e-5
-
-            for node_dict in nodes:
-                x_left = in_tol(node_dict["x"], 0.0)
-                x_right = in_tol(node_dict["x"], self.geometry.a)
-                y_bot = in_tol(node_dict["y"], 0.0)
-                y_top = in_tol(node_dict["y"], self.geometry.b)
-
-                # no longer enforce xy-plane since also want to constraint stringers like plate perimeter too!
-                # otherwise the stringers buckle strangely in shear. They need to be fixed to the rib/spar like the plate perimeter
-                # Update: changed this so that the stiffeners don't receive in-plane compressive disp BCs, but do receive shear perimeter disps
-                xy_plane = in_tol(node_dict["z"], 0.0)
-
-                on_bndry = x_left or x_right or y_bot or y_top
-                # on_bndry = on_bndry and xy_plane
-
-                if on_bndry:
-                    node_dict["xleft"] = x_left
-                    node_dict["xright"] = x_right
-                    node_dict["ybot"] = y_bot
-                    node_dict["ytop"] = y_top
-                    node_dict["xy_plane"] = xy_plane or self._compress_stiff_override
+                    elif "CQUAD4" in line:
+                        max_eid = max(max_eid, int(non_null_chunks[1]))
+                        if not edit_caps_files:
+                            assert "CQUAD4*" not in line, "needs small field CQUAD4"
+                            elems += [[int(_) for _ in non_null_chunks[3:7]]]
+
+                # the CAPS elements stay in the bdf file, only keep the nodes
+                self.mesh = PanelMesh(
+                    xyz=[[node["x"], node["y"], node["z"]] for node in nodes],
+                    conn=[],
+                    part_ids=[],
+                    stiff_locations=self.geometry.spec.stiff_locations,
+                    node_ids=[node["id"] for node in nodes],
+                )
 
-                    # print(f"boundary node dict = {node_dict}")
+                if not edit_caps_files:
+                    # keep the elements for the cache too, part 1 is the skin
+                    # in the xy-plane and part 2 the stiffeners
+                    node_ids = self.mesh.node_ids
+                    order = np.argsort(node_ids)
+                    elem_nodes = order[np.searchsorted(node_ids[order], elems)]
+                    in_skin = np.all(
+                        np.abs(self.mesh.xyz[elem_nodes, 2]) < 1e-5, axis=1
+                    )
+                    self.mesh.conn = np.array(elems, dtype=int).reshape((-1, 4))
+                    self.mesh.part_ids = np.where(in_skin, 1, 2)
+                    caps_cache.store(caps_key, self.mesh)
+                    max_eid = self.mesh.num_elements
+            else:
+                max_eid = self.mesh.num_elements
+            node_ids = self.mesh.node_ids
+            xyz = self.mesh.xyz
+
+            # classify the nodes on the boundary and along the stiffeners once
+            x, y, z = xyz[:, 0], xyz[:, 1], xyz[:, 2]
+            if node_sets is None:
+                node_sets = PanelNodeSets(
+                    x,
+                    y,
+                    z,
+                    a=self.geometry.a,
+                    b=self.geometry.b,
+                    stiff_locations=self.geometry.spec.stiff_locations,
+                )
 
-                    boundary_nodes += [node_dict]
+            def as_mask(indices):
+                mask = np.zeros((x.shape[0],), dtype=bool)
+                mask[indices] = True
+                return mask
+
+            x_left = as_mask(node_sets.x_left)
+            x_right = as_mask(node_sets.x_right)
+            y_bot = as_mask(node_sets.y_bot)
+            y_top = as_mask(node_sets.y_top)
+
+            # no longer enforce xy-plane since also want to constraint stringers like plate perimeter too!
+            # otherwise the stringers buckle strangely in shear. They need to be fixed to the rib/spar like the plate perimeter
+            # Update: changed this so that the stiffeners don't receive in-plane compressive disp BCs, but do receive shear perimeter disps
+            xy_plane = np.logical_or(
+                as_mask(node_sets.skin), self._compress_stiff_override
+            )
+            on_bndry = as_mask(node_sets.boundary)
 
             # need to read in the ESP/CAPS dat file
             # then append write the SPC cards to it
             # Set up the plate BCs so that it has u = uhat, for shear disp control
             # u = eps * y, v = eps * x, w = 0
-            if self._use_caps:
+            if edit_caps_files:
                 fp = open(self.dat_file, "r")
                 dat_lines = fp.readlines()
                 fp.close()
 
         self._test_broadcast()
 
-        self._xi = None
-        self._eta = None
-        self._zeta = None
-        self.num_nodes = None
-
         if self.comm.rank == 0:
 
-            # non-dimensional xyz coordinates of the plate
-            self._xi = []
-            self._eta = []
-            self._zeta = []
-
-            for node in nodes:
-                self._xi += [node["x"] / self.geometry.a]
-                self._eta += [node["y"] / self.geometry.b]
-                self._zeta += [node["z"] / self.geometry.h_w]
-            self._xi = np.array(self._xi)
-            self._eta = np.array(self._eta)
-            self._zeta = np.array(self._zeta)
-            self.num_nodes = len(nodes)
-
-        self._xi = self.comm.bcast(self._xi, root=0)
-        self._eta = self.comm.bcast(self._eta, root=0)
-        self._zeta = self.comm.bcast(self._zeta, root=0)
-        self.num_nodes = self.comm.bcast(self.num_nodes, root=0)
-        self.comm.Barrier()
-
-        if self.comm.rank == 0:
-
-            if self._use_caps:
+            if edit_caps_files:
                 post = False
                 pre_lines = []
                 post_lines = []
@@ -1002,242 +955,251 @@ class StiffenedPlateAnalysis:
                     else:
                         pre_lines += [line]
 
-            # make RBE2 elements
+            # make RBE2 elements tying each stiffener end to its root node in the plate
             all_rbe_control_nodes = []
+            rbe_eids = []
+            rbe_control_nodes = []
+            rbe_dependent_nodes = []
             if _make_rbe:
-                # open the bdf file to get the max # CQUAD4 elements
-                fp1 = open(self.bdf_file, "r")
-                lines_bdf = fp1.readlines()
-                fp1.close()
-                eid = 0
-                for line in lines_bdf:
-                    if "CQUAD4" in line:
-                        chunks = line.split(" ")
-                        no_empty_chunks = [_ for _ in chunks if not (_ == "")]
-                        # print(no_empty_chunks)
-                        _eid = int(no_empty_chunks[1])
-                        if _eid > eid:
-                            eid = _eid
-
-                fp1 = open(self.bdf_file, "a")
-                N = self.geometry.num_stiff + 1
-                for iy in range(1, self.geometry.num_stiff + 1):
-                    # yval = iy * self.geometry.b / N
-                    yval = stiff_locations[iy]
+                eid = max_eid
+                for istiff in range(len(node_sets.stiff_lines)):
                     for xval in [0, self.geometry.a]:
-                        rbe_nodes = []
-                        rbe_control_node = None
-
-                        for node_dict in boundary_nodes:
-                            if in_tol(node_dict["x"], xval) and in_tol(
-                                node_dict["y"], yval
-                            ):
-                                zval = node_dict["z"]
-                                xy_plane = node_dict["xy_plane"]
-                                if node_dict["xy_plane"]:
-                                    rbe_control_node = node_dict["id"]
-                                    all_rbe_control_nodes += [rbe_control_node]
-                                else:
-                                    rbe_nodes += [node_dict["id"]]
-
-                        # write the RBE element
+                        rbe_inds = node_sets.line_end(istiff, xval)
+                        control_nodes = node_ids[rbe_inds[xy_plane[rbe_inds]]]
+                        all_rbe_control_nodes += control_nodes.tolist()
+                        rbe_nodes = node_ids[rbe_inds[~xy_plane[rbe_inds]]]
+
                         eid += 1
-                        # print(f"{rbe_control_node=}")
-                        # print(f"{rbe_nodes=}")
-                        # exit()
                         if len(rbe_nodes) > 0:
-                            # print(f"writing {rbe_nodes=}")
-                            # exit()
-                            fp1.write(
-                                "%-8s%8d%8d%8d"
-                                % ("RBE2", int(eid), int(rbe_control_node), 23)
-                            )
-                            for rbe_node in rbe_nodes:
-                                fp1.write("%8d" % (rbe_node))
-                            fp1.write("\n")
-                fp1.close()
+                            rbe_eids += [eid]
+                            rbe_control_nodes += [control_nodes[-1]]
+                            rbe_dependent_nodes += [rbe_nodes]
 
-            if self._use_caps:
-                fp = open(self.dat_file, "w")
-                for line in pre_lines:
-                    fp.write(line)
+            # add displacement control boundary conditions
+            # still only apply BCs to xy plane, use RBEs to ensure this now
+            u = 0.5 * exy * y
+            v = 0.5 * exy * x
+            u_axial = np.logical_or(x_right, exy != 0)
+            v_axial = np.logical_and(np.logical_not(u_axial), y_top)
+            # half panels are compressed against the symmetry planes
+            x_ref = self.geometry.a / 2.0 if "x" in symmetry else 0.0
+            y_ref = self.geometry.b / 2.0 if "y" in symmetry else 0.0
+            if "x" in symmetry:
+                u_axial = np.logical_or(u_axial, x_left)
+            u = u - u_axial * exx * (x - x_ref)
+            v = v - v_axial * eyy * (y - y_ref)
+
+            # check on boundary, each node writes its active SPC slots in order
+            pinned = np.logical_or(clamped, np.logical_and(x_left, y_bot))
+            # no rotation of the rbe control node to stop rbe element
+            rbe_control = np.logical_and(
+                np.logical_not(pinned), np.isin(node_ids, all_rbe_control_nodes)
+            )
+            # side_support = False only supports the uniaxial / xx ends
+            simply_supported = np.logical_or(side_support, x_left | x_right)
+            simply_supported &= np.logical_not(pinned | rbe_control)
+            zeros = np.zeros_like(u)
+            slot_masks = [
+                pinned,  # w = theta_x = theta_y = 0
+                rbe_control,  # w = theta_z = 0
+                simply_supported,  # w = theta_z = 0
+                np.logical_or(exy != 0, x_left | x_right),  # u = eps_xy * y
+                np.logical_or(exy != 0.0, y_bot & (y_ref == 0.0)),  # v = eps_xy * x
+            ]
+            slot_dofs = ["3456", "346", "36", "1", "2"]
+            slot_values = [zeros, zeros, zeros, u, v]
+            slot_wide = [False, False, False, True, True]
 
             if _explicit_poisson_exp:
+                # vpoisson on stiffener ends
                 eyy_poisson = -1.0 * self.intended_Nxx / self.A12_eff
-                # print(f"{self.A12_eff=}")
-                # print(f"{eyy_poisson=}")
-                # exit()
-
-            # add displacement control boundary conditions
-            for node_dict in boundary_nodes:
-                # still only apply BCs to xy plane, use RBEs to ensure this now
-                # if not node_dict["xy_plane"]: continue
-                x = node_dict["x"]
-                y = node_dict["y"]
-                z = node_dict["z"]
-                nid = node_dict["id"]
-                u = 0.5 * exy * y
-                v = 0.5 * exy * x
-
-                if _explicit_poisson_exp:
-                    vpoisson = eyy_poisson * y
-
-                # print(f"boundary node = {nid}, x {x}, y {y}, z {x}")
-
-                # only enforce compressive displacements to plate, not stiffeners
-                # TODO : maybe I need to do this for the stiffener too, but unclear
-                # if node_dict["xy_plane"]:
-                if node_dict["xright"] or exy != 0:
-                    u -= exx * x
-                elif node_dict["ytop"]:
-                    v -= eyy * y
-                elif node_dict["xleft"] or node_dict["ybot"]:
-                    pass
-
-                # check on boundary
-                if clamped or (node_dict["xleft"] and node_dict["ybot"]):
-                    fp.write(
-                        "%-8s%8d%8d%8s%8.6f\n" % ("SPC", 1, nid, "3456", 0.0)
-                    )  # w = theta_x = theta_y
-                else:
-                    if (
-                        node_dict["id"] in all_rbe_control_nodes
-                    ):  # no rotation of the rbe control node to stop rbe element
-                        fp.write(
-                            "%-8s%8d%8d%8s%8.6f\n" % ("SPC", 1, nid, "346", 0.0)
-                        )  # w = theta_z = 0
-                    else:
-                        simply_supported = False
-                        if side_support:
-                            simply_supported = True
-                        else:  # only support uniaxial / xx ends
-                            simply_supported = node_dict["xleft"] or node_dict["xright"]
-
-                        if simply_supported:  # then all edges simply supported
-                            fp.write(
-                                "%-8s%8d%8d%8s%8.6f\n" % ("SPC", 1, nid, "36", 0.0)
-                            )  # w = theta_z = 0
-                # TODO : maybe I need to do this for the stiffener too for exx case, but unclear
-                # if node_dict["xy_plane"] or exy != 0:
-                if exy != 0 or node_dict["xleft"] or node_dict["xright"]:
-                    fp.write(
-                        "%-8s%16d%16d%16s%16.9f\n" % ("SPC*", 1, nid, "1", u)
-                    )  # u = eps_xy * y
-                # add to boundary nodes left and right of plate on the bottom of plate for v=0 axial case or all edges
-                # also all sides of exy case
-                if (
-                    exy != 0.0
-                    or node_dict["ybot"]
-                    # or (node_dict["xy_plane"] and not node_dict["ytop"])
-                ):
-
-                    fp.write(
-                        "%-8s%16d%16d%16s%16.9f\n" % ("SPC*", 1, nid, "2", v)
-                    )  # v = eps_xy * x
-
-                if (
-                    _explicit_poisson_exp
-                    and exx != 0
-                    and not (node_dict["xy_plane"])
-                    and (node_dict["xleft"] or node_dict["xright"])
-                ):
-                    # xy_plane = node_dict["xy_plane"]
-                    # print(f"{xy_plane=}")
-                    # print(f"{x=} {y=} {z=}")
-                    # print(f"{vpoisson=}"); exit()
-                    fp.write(
-                        "%-8s%16d%16d%16s%16.9f\n" % ("SPC*", 1, nid, "2", vpoisson)
-                    )  # vpoisson on stiffener ends
+                slot_masks += [np.logical_not(xy_plane) & (x_left | x_right) & (exx != 0)]
+                slot_dofs += ["2"]
+                slot_values += [eyy_poisson * (y - y_ref)]
+                slot_wide += [True]
+
+            masks = np.stack(slot_masks, axis=1) & on_bndry[:, None]
+
+            # symmetric / antisymmetric class constraints on the symmetry planes
+            for plane, sym_class in symmetry.items():
+                coord = x if plane == "x" else y
+                length = self.geometry.a if plane == "x" else self.geometry.b
+                on_plane = np.abs(coord - length / 2.0) < node_sets.tol
+                masks = np.concatenate([masks, on_plane[:, None]], axis=1)
+                slot_dofs += [SYMMETRY_DOFS[(plane, sym_class)]]
+                slot_values += [zeros]
+                slot_wide += [False]
+            self.mesh.set_constraints(
+                spc_node_ids=np.broadcast_to(node_ids[:, None], masks.shape)[masks],
+                spc_dofs=np.broadcast_to(np.array(slot_dofs), masks.shape)[masks],
+                spc_values=np.stack(slot_values, axis=1)[masks],
+                rbe_elem_ids=rbe_eids,
+                rbe_control_nodes=rbe_control_nodes,
+                rbe_dependent_nodes=rbe_dependent_nodes,
+                spc_wide=np.broadcast_to(np.array(slot_wide), masks.shape)[masks],
+            )
 
-            if self._use_caps:
-                for line in post_lines:
-                    fp.write(line)
-                fp.close()
-            else:  # not use caps
-                # write material and property cards
-                fp.write(
-                    "MAT1*                 1              0.                              0. *0      \n"
-                )
-                fp.write(
-                    "*0                   0.                                                 *1      \n"
+            if edit_caps_files:
+                spc_text = spc_cards(
+                    self.mesh.spc_node_ids,
+                    self.mesh.spc_dofs,
+                    self.mesh.spc_values,
+                    wide=self.mesh.spc_wide,
                 )
-                fp.write("*1                   1.              0.              0. \n")
-                fp.write("$ Femap Property  : panel\n")
-                fp.write(
-                    "PSHELL*               1               1           1.E-2               1 *0      \n"
-                )
-                fp.write("*0                   1.               1 0.8333333333333 \n")
-                if self.geometry.num_stiff > 0:
-                    fp.write("$ Femap Property  : stiff\n")
-                    fp.write(
-                        "PSHELL*               2               1  4.472135955E-4               1 *0      \n"
-                    )
-                    fp.write(
-                        "*0                   1.               1 0.8333333333333 \n"
-                    )
-
-                fp.write("ENDDATA\n")
+                fp = open(self.bdf_file, "a")
+                fp.write(rbe2_cards(rbe_eids, rbe_control_nodes, rbe_dependent_nodes))
                 fp.close()
+                write_bdf(self.dat_file, pre_lines + [spc_text] + post_lines)
+
+        # share the mesh, boundary conditions and non-dimensional coordinates
+        self.mesh = self.comm.bcast(self.mesh, root=0)
+        if symmetry:
+            self._full_nondim_xyz = self.comm.bcast(self._full_nondim_xyz, root=0)
+        scales = [self.geometry.a, self.geometry.b, self.geometry.h_w]
+        self.mesh.nondim_xyz = self.mesh.xyz / np.array(scales)
+        self._xi = self.mesh.nondim_xyz[:, 0]
+        self._eta = self.mesh.nondim_xyz[:, 1]
+        self._zeta = self.mesh.nondim_xyz[:, 2]
+        if self._use_caps and not edit_caps_files:
+            # the new CAPS mesh is cached, continue from the mesh arrays
+            if self.comm.rank == 0 and os.path.exists(self.caps_lock):
+                os.remove(self.caps_lock)
+            self._use_caps = False
+            self._write_bdf = write_bdf_file and not in_memory
+
+        # the bdf file of the structured mesh is only written once a solver needs it
+        self._bdf_pending = self._write_bdf and not self._use_caps
+        self.num_nodes = self.mesh.num_nodes
 
         self.comm.Barrier()
 
-    def post_analysis(self):
-        """no derivatives here so just clear capsLock file"""
+    def post_analysis(self, replicate=False):
+        """
+        clear the capsLock file and gather the pyTACS eigenvectors and node coordinates of
+        all procs to the root proc, with one Gatherv of the (num_modes, local_dof) array
+        and one of the coordinates. The root proc keeps them as set by eigvec_storage.
+        Only the root proc uses the modes (get_mac_global_mode), replicate also
+        broadcasts them to the other procs, else those only get the global mode flags
+        of the root proc for global_modes
+        """
         # remove the capsLock file after done with analysis
         if self.comm.rank == 0:
             if self._use_caps and os.path.exists(self.caps_lock):
                 os.remove(self.caps_lock)
 
-        if not self._use_caps:
-            Xpts = self.bucklingProb.Xpts.getArray()
-            _xi = Xpts[0::3]
-            _eta = Xpts[1::3]
-            _zeta = Xpts[2::3]
+        self._global_mode_flags = None
+        if not self._use_caps and self.backend == "tacs":
+            Xpts = np.ascontiguousarray(self.bucklingProb.Xpts.getArray())
+            local_eigvecs = np.ascontiguousarray(np.array(self._eigenvectors))
+            local_eigvecs = local_eigvecs.reshape((self.num_modes, -1))
 
-            all_xi = self.comm.gather(_xi, root=0)
-            all_eta = self.comm.gather(_eta, root=0)
-            all_zeta = self.comm.gather(_zeta, root=0)
-            all_num_nodes = self.comm.gather(_xi.shape[0], root=0)
+            # (num_coords, num_dof) on each proc
+            sizes = np.array(
+                self.comm.allgather((Xpts.shape[0], local_eigvecs.shape[1]))
+            )
+            self.num_nodes = int(np.sum(sizes[:, 0])) // 3
+            num_dof = int(np.sum(sizes[:, 1]))
 
+            X = eigvecs = X_recv = eigvecs_recv = None
             if self.comm.rank == 0:
-                xi_list = [xi for xi in all_xi if xi is not None]
-                self._xi = np.concatenate(xi_list) / self.geometry.a
+                X = np.zeros((3 * self.num_nodes,), dtype=Xpts.dtype)
+                eigvecs = np.zeros(
+                    (self.num_modes * num_dof,), dtype=local_eigvecs.dtype
+                )
+                X_recv = [X, sizes[:, 0]]
+                eigvecs_recv = [eigvecs, self.num_modes * sizes[:, 1]]
+            self.comm.Gatherv(Xpts, X_recv, root=0)
+            self.comm.Gatherv(local_eigvecs, eigvecs_recv, root=0)
 
-                eta_list = [eta for eta in all_eta if eta is not None]
-                self._eta = np.concatenate(eta_list) / self.geometry.b
+            self._eigenvectors = self._w_fractions = None
+            if self.comm.rank == 0:
+                # the (num_modes, local_dof) blocks of each proc side by side
+                offsets = np.cumsum(self.num_modes * sizes[:-1, 1])
+                eigvecs = np.concatenate(
+                    [
+                        block.reshape((self.num_modes, -1))
+                        for block in np.split(eigvecs, offsets)
+                    ],
+                    axis=1,
+                )
+                self._store_eigenvectors(eigvecs)
+                X = X.reshape((-1, 3))
+            elif replicate:
+                X = np.zeros((self.num_nodes, 3), dtype=Xpts.dtype)
+                num_kept = len(_EIGVEC_DOFS[self.eigvec_storage]) * (num_dof // 6)
+                self._eigenvectors = np.zeros(
+                    (self.num_modes, num_kept), dtype=self.eigvec_dtype
+                )
+                self._w_fractions = np.zeros((self.num_modes,))
+            if replicate:
+                self.comm.Bcast(X, root=0)
+                self.comm.Bcast(self._eigenvectors, root=0)
+                self.comm.Bcast(self._w_fractions, root=0)
+
+            if X is None:
+                self._xi = self._eta = self._zeta = None
+            else:
+                self._xi = X[:, 0] / self.geometry.a
+                self._eta = X[:, 1] / self.geometry.b
+                self._zeta = X[:, 2] / (self.geometry.h_w if self.geometry.num_stiff > 0 else 1.0)
 
-                zeta_list = [zeta for zeta in all_zeta if zeta is not None]
-                self._zeta = np.concatenate(zeta_list) / (self.geometry.h_w if self.geometry.num_stiff > 0 else 1.0)
+            if not replicate:
+                self._bcast_global_mode_flags()
 
-                self.num_nodes = sum(
-                    [num_nodes for num_nodes in all_num_nodes if num_nodes is not None]
-                )
+    def _store_eigenvectors(self, eigvecs):
+        """
+        keep the eigenvectors (num_modes, 6 * num_nodes) as one real contiguous array of
+        the eigvec_storage dofs in eigvec_dtype, and the w fraction of the uvw magnitude
+        of each mode for is_non_crippling_mode
+        """
+        modes = np.real(np.asarray(eigvecs))
+        modes = modes.reshape((modes.shape[0], -1, 6))
+        w_mag = np.linalg.norm(modes[:, :, 2], axis=1)
+        uvw_mag = np.linalg.norm(modes[:, :, :3], axis=(1, 2))
+        self._w_fractions = w_mag / np.maximum(uvw_mag, 1e-30)
+        dofs = list(_EIGVEC_DOFS[self.eigvec_storage])
+        self._eigenvectors = np.ascontiguousarray(
+            modes[:, :, dofs].reshape((modes.shape[0], -1)), dtype=self.eigvec_dtype
+        )
 
-            else:
-                self._xi = None
-                self._eta = None
-                self._zeta = None
-                self.num_nodes = None
-
-            # broadcast across all processors
-            self._xi = self.comm.bcast(self._xi, root=0)
-            self._eta = self.comm.bcast(self._eta, root=0)
-            self._zeta = self.comm.bcast(self._zeta, root=0)
-            self.num_nodes = self.comm.bcast(self.num_nodes, root=0)
-
-            # save eigenvectors that are aggregated across all modes
-            for imode in range(self.num_modes):
-                all_eigvecs = self.comm.gather(self._eigenvectors[imode], root=0)
-                if self.comm.rank == 0:
-                    eigvec_list = [
-                        eigvec for eigvec in all_eigvecs if eigvec is not None
-                    ]
-                    self._eigenvectors[imode] = np.concatenate(eigvec_list)
-                else:
-                    self._eigenvectors[imode] = None
-                self._eigenvectors[imode] = self.comm.bcast(
-                    self._eigenvectors[imode], root=0
-                )
+    def _eigvec_dof(self, imode, dof) -> np.ndarray:
+        """nodal values of the dof (0, 1, 2 for u, v, w) in the kept eigenvector imode"""
+        dofs = _EIGVEC_DOFS[self.eigvec_storage]
+        assert dof in dofs, f"eigvec_storage '{self.eigvec_storage}' has no dof {dof}"
+        return self._eigenvectors[imode][dofs.index(dof) :: len(dofs)]
+
+    def _bcast_global_mode_flags(self):
+        """is_global_mode of each mode on the root proc, for the procs without the modes"""
+        flags = None
+        if self.comm.rank == 0:
+            flags = [self.is_global_mode(imode) for imode in range(self.num_modes)]
+        self._global_mode_flags = self.comm.bcast(flags, root=0)
+
+    @property
+    def _fea_input(self):
+        """bdf file name, or the in-memory pyNastran model when no bdf file was written"""
+        if self._write_bdf:
+            self.emit_bdf()
+            return self.dat_file
+        return nastran_model(self.mesh, stiffener=self.geometry.num_stiff > 0)
+
+    def emit_bdf(self):
+        """write the bdf file of the structured mesh if it hasn't been written yet"""
+        if not self._bdf_pending:
+            return
+        if self.comm.rank == 0:
+            # write the whole bdf file at once with material and property cards
+            write_bdf(
+                self.bdf_file, bdf_deck(self.mesh, stiffener=self.geometry.num_stiff > 0)
+            )
+        self._bdf_pending = False
+        self.comm.Barrier()
+
+    def save_mesh(self, filename):
+        """save the mesh, constraints and non-dimensional coordinates as a npz file"""
+        if self.comm.rank == 0:
+            self.mesh.save(filename)
+        self.comm.Barrier()
 
     def _elemCallback(self):
         """element callback to set the stiffener, base, panel material properties"""
@@ -1254,23 +1216,14 @@ class StiffenedPlateAnalysis:
             # specific_heat = 463.0
 
             ref_axis = None
+            thickness = self.geometry.component_thickness(compDescript)
             if "panel" in compDescript:
                 material = self.plate_material
-                thickness = self.geometry.h
-            elif "base" in compDescript:
+            elif "base" in compDescript or "stiff" in compDescript:
                 material = self.stiffener_material
-                thickness = self.geometry.h + self.geometry.t_b
-            elif "stiff" in compDescript:
-                material = self.stiffener_material
-                thickness = self.geometry.t_w
-            elif "rib" in compDescript:
+            else:  # rib
                 material = self.plate_material
-                thickness = self.geometry.rib_h
                 ref_axis = np.array([0, 1, 0], dtype=TACS.dtype)
-            else:
-                raise AssertionError(
-                    "elem does not belong to oneof the main components"
-                )
 
             if ref_axis is None:
                 ref_axis = material.ref_axis
@@ -1282,8 +1235,10 @@ class StiffenedPlateAnalysis:
             if isotropic:
                 mat = constitutive.MaterialProperties(E=material.E11, nu=material.nu12)
 
-                # Set one thickness dv for every component
-                con = constitutive.IsoShellConstitutive(mat, t=thickness)
+                # Set one thickness dv for every component, so a solver context can
+                # update the thicknesses in place
+                con = constitutive.IsoShellConstitutive(mat, t=thickness, tNum=dvNum)
+                self._thickness_dvs[dvNum] = compDescript
 
             else:  # orthotropic
                 # assume G23, G13 = G12
@@ -1336,37 +1291,69 @@ class StiffenedPlateAnalysis:
 
         return elemCallBack
 
-    def run_static_analysis(self, base_path=None, write_soln=False):
+    def _prepare_assembler(self) -> float:
+        """
+        set up the pyTACS assembler of this mesh, or update the one kept in the solver
+        context in place. Returns the factor of the prescribed displacements over the ones
+        the assembler was built with (1 without a solver context)
+        """
+
+        assert pyTACS is not None, "TACS is not installed, use backend='scipy'"
+
+        def build():
+            FEAAssembler = pyTACS(self._fea_input, comm=self.comm)
+            self.comm.Barrier()
+            self._thickness_dvs = {}  # component of each thickness dv
+
+            # Set up constitutive objects and elements
+            FEAAssembler.initialize(self._elemCallback())
+            return FEAAssembler
+
+        if self.solver_context is None or self._use_caps:
+            if self.solver_context is not None:
+                self.solver_context.clear()
+            self._fea_assembler = build()
+            return 1.0
+        load_factor = self.solver_context.prepare(self, build)
+        self._fea_assembler = self.solver_context.fea_assembler
+        if self._write_bdf:
+            self.emit_bdf()
+        return load_factor
+
+    def run_static_analysis(self, base_path=None, write_soln=False, _load_factor=None):
         """
         run a linear static analysis on the flat plate with either isotropic or composite materials
         return the average stresses in the plate => to compute in-plane loads Nx, Ny, Nxy
         """
+        if self.backend == "scipy":
+            return self.shell_model.average_stresses(part_id=1)
 
-        # Instantiate FEAAssembler
-        # os.chdir(self._tacs_aim.root_analysis_dir)
-        FEAAssembler = pyTACS(self.dat_file, comm=self.comm)
-        self.comm.Barrier()
-
-        # Set up constitutive objects and elements
-        FEAAssembler.initialize(self._elemCallback())
+        # Instantiate FEAAssembler, or update the one kept in the solver context
+        # (unless the caller already prepared it and passes its load factor)
+        if _load_factor is None:
+            _load_factor = self._prepare_assembler()
+        load_factor = _load_factor
+        FEAAssembler = self._fea_assembler
 
         # set complex step Gmatrix into all elements through assembler
         # FEAAssembler.assembler.setComplexStepGmatrix(True)
 
         # debug the static problem first
-        SP = FEAAssembler.createStaticProblem(name="static")
+        if self.solver_context is None:
+            SP = FEAAssembler.createStaticProblem(name="static")
+        else:
+            SP = self.solver_context.static_problem(name="static")
         SP.solve()
         if write_soln:
-            if base_path is None:
-                base_path = os.getcwd()
-            static_folder = os.path.join(base_path, self.static_folder_name)
-            if not os.path.exists(static_folder) and self.comm.rank == 0:
-                os.mkdir(static_folder)
-            SP.writeSolution(outputDir=static_folder)
+            static_folder = self._solution_folder(base_path, self.static_folder_name)
+            if static_folder is not None:
+                SP.writeSolution(outputDir=static_folder)
 
         # test the average stresses routine
         # compNum = 0 is the panel, 1 is stiffener component
         avgStresses = FEAAssembler.assembler.getAverageStresses(compNum=0)
+        if load_factor != 1.0:
+            avgStresses = load_factor * np.asarray(avgStresses)
         return avgStresses
 
     def run_buckling_analysis(
@@ -1376,30 +1363,43 @@ class StiffenedPlateAnalysis:
         write_soln=False,
         derivatives=False,
         base_path=None,
+        v0=None,
+        _load_factor=None,
     ):
         """
         run a linear buckling analysis on the flat plate with either isotropic or composite materials
         return the sorted eigenvalues of the plate => would like to include M
+        v0 is the start vector of the eigensolver (scipy backend only, pyTACS ignores it)
         """
 
         # test bcast
         self._test_broadcast()
+        if self.backend == "scipy":
+            return self._run_sparse_buckling_analysis(
+                sigma=sigma, num_eig=num_eig, v0=v0
+            )
 
         # os.chdir(self._tacs_aim.root_analysis_dir)
 
-        # Instantiate FEAAssembler
-        FEAAssembler = pyTACS(self.dat_file, comm=self.comm)
-
-        # Set up constitutive objects and elements
-        FEAAssembler.initialize(self._elemCallback())
+        # Instantiate FEAAssembler, or update the one kept in the solver context
+        if _load_factor is None:
+            _load_factor = self._prepare_assembler()
+        load_factor = _load_factor
+        FEAAssembler = self._fea_assembler
 
         # set complex step Gmatrix into all elements through assembler
         # FEAAssembler.assembler.setComplexStepGmatrix(True)
 
-        # Setup buckling problem
-        self.bucklingProb = FEAAssembler.createBucklingProblem(
-            name="buckle", sigma=sigma, numEigs=num_eig
-        )
+        # Setup buckling problem, a context assembler solves the built bcs (load_factor
+        # times smaller) so its eigenvalues and shift are load_factor times larger
+        if self.solver_context is None:
+            self.bucklingProb = FEAAssembler.createBucklingProblem(
+                name="buckle", sigma=sigma, numEigs=num_eig
+            )
+        else:
+            self.bucklingProb = self.solver_context.buckling_problem(
+                sigma=sigma * load_factor, num_eig=num_eig, name="buckle"
+            )
         self.bucklingProb.setOption("printLevel", 2)
 
         # exit()
@@ -1411,13 +1411,12 @@ class StiffenedPlateAnalysis:
         self.bucklingProb.evalFunctions(funcs)
         if derivatives:
             self.bucklingProb.evalFunctionsSens(funcsSens)
+        if load_factor != 1.0:
+            funcs = {key: funcs[key] / load_factor for key in funcs}
         if write_soln:
-            if base_path is None:
-                base_path = os.getcwd()
-            buckling_folder = os.path.join(base_path, self.buckling_folder_name)
-            if not os.path.exists(buckling_folder) and self.comm.rank == 0:
-                os.mkdir(buckling_folder)
-            self.bucklingProb.writeSolution(outputDir=buckling_folder)
+            buckling_folder = self._solution_folder(base_path, self.buckling_folder_name)
+            if buckling_folder is not None:
+                self.bucklingProb.writeSolution(outputDir=buckling_folder)
 
         # save the eigenvectors for MAC and return errors from function
         self._eigenvectors = []
@@ -1426,6 +1425,7 @@ class StiffenedPlateAnalysis:
         errors = []
         for imode in range(num_eig):
             eigval, eigvec = self.bucklingProb.getVariables(imode)
+            eigval /= load_factor
             self._eigenvectors += [eigvec]
             self._eigenvalues += [eigval]
             error = self.bucklingProb.getModalError(imode)
@@ -1442,6 +1442,407 @@ class StiffenedPlateAnalysis:
         # return the eigenvalues here
         return np.array([funcs[key] for key in funcs]), np.array(errors)
 
+    def run_static_buckling_analysis(
+        self, sigma=None, num_eig=5, write_soln=False, base_path=None
+    ):
+        """
+        static and buckling analysis from one assembly of the mesh, returns the average
+        plate stresses and the (eigenvalues, errors) of run_buckling_analysis.
+        The scipy backend also reuses the stiffness factorization of the static solve for
+        the lowest eigenvalues when sigma is None, pyTACS (default shift 30 for sigma None)
+        builds the assembler once but its problems each factor their own matrices.
+        """
+        if self.backend == "scipy":
+            avgStresses = self.shell_model.average_stresses(part_id=1)
+            eigvals, errors = self._run_sparse_buckling_analysis(
+                sigma=sigma, num_eig=num_eig
+            )
+            return avgStresses, eigvals, errors
+
+        load_factor = self._prepare_assembler()
+        avgStresses = self.run_static_analysis(
+            base_path=base_path, write_soln=write_soln, _load_factor=load_factor
+        )
+        eigvals, errors = self.run_buckling_analysis(
+            sigma=30.0 if sigma is None else sigma,
+            num_eig=num_eig,
+            write_soln=write_soln,
+            base_path=base_path,
+            _load_factor=load_factor,
+        )
+        return avgStresses, eigvals, errors
+
+    @property
+    def shell_model(self) -> SparseShellModel:
+        """sparse shell model of the current mesh for the scipy backend, made once per mesh"""
+        if self._shell_model is None or self._shell_model.mesh is not self.mesh:
+            assert not self._use_caps, "the scipy backend needs the mesh elements"
+            materials = {1: (self.plate_material, self.geometry.h)}
+            if self.geometry.num_stiff > 0:
+                materials[2] = (self.stiffener_material, self.geometry.t_w)
+            self._shell_model = SparseShellModel.from_materials(self.mesh, materials)
+        return self._shell_model
+
+    def _run_sparse_buckling_analysis(self, sigma=30.0, num_eig=5, v0=None):
+        """
+        buckling solve of the scipy backend, each proc solves the whole (small) model
+        so the eigenvectors need no gather in post_analysis and are kept as set by
+        eigvec_storage right away. v0 is a start vector in any eigvec_storage layout,
+        the dofs it doesn't have start at zero. No solution files.
+        """
+        if v0 is not None:
+            v0 = np.asarray(v0)
+            dofs = {len(_dofs): _dofs for _dofs in _EIGVEC_DOFS.values()}[
+                v0.shape[0] // self.mesh.num_nodes
+            ]
+            full_v0 = np.zeros((self.mesh.num_nodes, 6))
+            full_v0[:, list(dofs)] = v0.reshape((self.mesh.num_nodes, len(dofs)))
+            v0 = full_v0.ravel()
+        eigvals, eigvecs, errors = self.shell_model.solve_buckling(
+            sigma=sigma, num_eig=num_eig, v0=v0
+        )
+        self._eigenvalues = list(eigvals)
+        self._store_eigenvectors(eigvecs)
+        self._errors = list(errors)
+        self._num_modes = eigvals.shape[0]
+        if self.comm.rank == 0:
+            pprint({f"eigsb.{imode}": eigval for imode, eigval in enumerate(eigvals)})
+        self._solved_buckling = True
+        self._alphas = {}
+        return np.array(eigvals), np.array(errors)
+
+    def run_symmetric_buckling_analysis(
+        self,
+        planes="x",
+        symmetry_classes: list = None,
+        sigma=5.0,
+        num_eig=10,
+        write_soln=False,
+        base_path=None,
+        **pre_analysis_kwargs,
+    ):
+        """
+        axial buckling analysis of the half (planes "x" or "y") or quarter ("xy") panel,
+        one pre_analysis and solve for each symmetry class such as {"x": "S", "y": "S"}.
+        Only the modes symmetric about the planes are found (odd m about x = a/2, odd n
+        about y = b/2), the antisymmetric classes conflict with the prestress BCs.
+        The modes of all classes are mirrored onto the full panel and sorted, so MAC and
+        nondim_X work as for the full panel (post_analysis is done here).
+        """
+        if symmetry_classes is None:
+            symmetry_classes = [{plane: "S" for plane in planes}]
+
+        eigenvalues, errors, eigenvectors, classes = [], [], [], []
+        w_fractions = []
+        for symmetry in symmetry_classes:
+            self.pre_analysis(**pre_analysis_kwargs, symmetry=symmetry)
+            self.run_buckling_analysis(
+                sigma=sigma, num_eig=num_eig, write_soln=write_soln, base_path=base_path
+            )
+            self.post_analysis()
+
+            if self._eigenvectors is not None:
+                nondim_xyz = np.stack([self._xi, self._eta, self._zeta], axis=1)
+                eigenvectors += mirror_modes(
+                    nondim_xyz,
+                    self._full_nondim_xyz,
+                    self._eigenvectors,
+                    symmetry,
+                    dofs=_EIGVEC_DOFS[self.eigvec_storage],
+                )
+                w_fractions += list(self._w_fractions)
+            eigenvalues += list(self._eigenvalues)
+            errors += list(self._errors)
+            classes += [symmetry] * self.num_modes
+
+        # eigenpairs of all classes on the full panel
+        order = np.argsort(np.real(eigenvalues), kind="stable")
+        self._eigenvalues = [eigenvalues[i] for i in order]
+        if self._eigenvectors is not None:
+            self._eigenvectors = np.ascontiguousarray(
+                [eigenvectors[i] for i in order], dtype=self.eigvec_dtype
+            )
+            self._w_fractions = np.array(w_fractions)[order]
+        self._errors = [errors[i] for i in order]
+        self.mode_symmetry = [classes[i] for i in order]
+        self._num_modes = order.shape[0]
+        self._xi = self._full_nondim_xyz[:, 0]
+        self._eta = self._full_nondim_xyz[:, 1]
+        self._zeta = self._full_nondim_xyz[:, 2]
+        self.num_nodes = self._full_nondim_xyz.shape[0]
+        if self._global_mode_flags is not None:
+            self._bcast_global_mode_flags()
+        return np.array(self._eigenvalues), np.array(self._errors)
+
+    def run_guided_buckling_analysis(
+        self,
+        axial: bool = True,
+        num_eig=10,
+        max_num_eig=100,
+        shift_factor=0.8,
+        fallback_sigma=5.0,
+        min_similarity=0.7,
+        local_mode_tol=0.7,
+        write_soln=False,
+        base_path=None,
+    ):
+        """
+        buckling solve with the shift from the closed-form global load and a small block of
+        eigenpairs, the block is doubled (up to max_num_eig) while no acceptable global mode
+        is found by get_mac_global_mode, then one last solve uses the fallback_sigma shift.
+        Runs post_analysis and returns the global eigenvalue (None if not found)
+        """
+        pred_lambda, _ = self.predict_crit_load(axial=axial)
+        return self._windowed_buckling_analysis(
+            sigma=shift_factor * pred_lambda,
+            select=lambda: self.get_mac_global_mode(
+                axial=axial,
+                min_similarity=min_similarity,
+                local_mode_tol=local_mode_tol,
+            ),
+            num_eig=num_eig,
+            max_num_eig=max_num_eig,
+            fallback_sigma=fallback_sigma,
+            write_soln=write_soln,
+            base_path=base_path,
+        )
+
+    def run_screened_buckling_analysis(
+        self,
+        axial: bool = True,
+        mesh_sizes: dict = None,
+        coarse_elems_per_half_wave=3,
+        coarse_num_eig=10,
+        coarse_max_num_eig=40,
+        num_eig=10,
+        max_num_eig=20,
+        shift_factor=0.95,
+        max_error=1e-8,
+        min_similarity=0.7,
+        local_mode_tol=0.7,
+        log_file=None,
+        write_soln=False,
+        base_path=None,
+        **pre_analysis_kwargs,
+    ):
+        """
+        two-stage buckling analysis, a coarse mesh with few eigenpairs first finds the
+        global mode and only accepted panels get the fine mesh solve (mesh_sizes, the
+        adaptive sizes by default) with the shift just below the coarse eigenvalue.
+        pre_analysis is run for both meshes with pre_analysis_kwargs (exx, exy, ...).
+        Rejected panels are appended to the csv log_file, the outcome is in self.screening.
+        Returns the fine global eigenvalue (None if rejected or lost)
+        """
+        shear = not axial
+        coarse_sizes = self.adaptive_mesh_sizes(
+            shear=shear, elems_per_half_wave=coarse_elems_per_half_wave
+        )
+        self.pre_analysis(**coarse_sizes, **pre_analysis_kwargs)
+        coarse_lambda = self.run_guided_buckling_analysis(
+            axial=axial,
+            num_eig=coarse_num_eig,
+            max_num_eig=coarse_max_num_eig,
+            fallback_sigma=None,
+            min_similarity=min_similarity,
+            local_mode_tol=local_mode_tol,
+        )
+        reason = self._screening_reason(coarse_lambda, max_error, "coarse")
+        self.screening = {
+            "accepted": reason is None,
+            "stage": "coarse",
+            "reason": reason,
+            "coarse_eigenvalue": self.comm.bcast(coarse_lambda, root=0),
+            "coarse_sizes": coarse_sizes,
+        }
+        if reason is not None:
+            self._log_screening(log_file)
+            return None
+
+        if mesh_sizes is None:
+            mesh_sizes = self.adaptive_mesh_sizes(shear=shear)
+        self.pre_analysis(**mesh_sizes, **pre_analysis_kwargs)
+        global_lambda_star = self._windowed_buckling_analysis(
+            sigma=shift_factor * self.screening["coarse_eigenvalue"],
+            select=lambda: self.get_mac_global_mode(
+                axial=axial,
+                min_similarity=min_similarity,
+                local_mode_tol=local_mode_tol,
+            ),
+            num_eig=num_eig,
+            max_num_eig=max_num_eig,
+            write_soln=write_soln,
+            base_path=base_path,
+        )
+        reason = self._screening_reason(global_lambda_star, max_error, "fine")
+        self.screening.update(accepted=reason is None, stage="fine", reason=reason)
+        if reason is not None:
+            self._log_screening(log_file)
+            return None
+        return global_lambda_star
+
+    def _screening_reason(self, eigval, max_error, stage) -> str:
+        """why the global mode of the last solve is rejected, None if accepted"""
+        reason = None
+        if self.comm.rank == 0:
+            if eigval is None:
+                reason = f"no global mode on the {stage} mesh"
+            elif abs(self._errors[self.min_global_mode_index]) > max_error:
+                reason = f"large modal error on the {stage} mesh"
+        return self.comm.bcast(reason, root=0)
+
+    def _log_screening(self, log_file):
+        """append the rejected panel to the csv log file"""
+        if self.comm.rank == 0:
+            print(f"panel rejected : {self.screening['reason']}")
+        if log_file is None or self.comm.rank != 0:
+            return
+        row = {
+            "name": self._name,
+            "rho_0": self.affine_aspect_ratio,
+            "xi": self.xi_plate,
+            "gamma": self.gamma,
+            "zeta": self.zeta_plate,
+            "stage": self.screening["stage"],
+            "reason": self.screening["reason"],
+            "coarse_eigenvalue": self.screening["coarse_eigenvalue"],
+        }
+        first_write = not os.path.exists(log_file)
+        with open(log_file, "a", newline="") as fp:
+            writer = csv.DictWriter(fp, fieldnames=list(row))
+            if first_write:
+                writer.writeheader()
+            writer.writerow(row)
+
+    def run_continuation_buckling_analysis(
+        self,
+        path: ContinuationPath,
+        param: float,
+        axial: bool = True,
+        num_eig=10,
+        max_num_eig=100,
+        min_similarity=0.7,
+        local_mode_tol=0.7,
+        write_soln=False,
+        base_path=None,
+    ):
+        """
+        buckling solve of the next panel of a continuation path (e.g. the rho0 sweep), the
+        shift is extrapolated from the previous eigenvalues of the path at param and the
+        previous mode interpolated onto this mesh picks the tracked mode by MAC.
+        The scipy backend also starts the Lanczos iterations from that interpolated mode,
+        pyTACS has no start vector option so its solves are only MAC-guided.
+        Empty paths or lost modes use run_guided_buckling_analysis. The tracked mode is
+        appended to the path (on the root proc), returns its eigenvalue (None if not found)
+        """
+        sigma = seed = None
+        if self.comm.rank == 0:
+            sigma = path.shift(param)
+            if self.backend == "scipy":
+                seed = path.seed(self.nondim_X)
+        sigma = self.comm.bcast(sigma, root=0)
+        seed = self.comm.bcast(seed, root=0)
+
+        global_lambda_star = None
+        if sigma is not None:
+            global_lambda_star = self._windowed_buckling_analysis(
+                sigma=sigma,
+                select=lambda: self._match_path_mode(
+                    path, min_similarity=min_similarity, local_mode_tol=local_mode_tol
+                ),
+                num_eig=num_eig,
+                max_num_eig=max_num_eig,
+                fallback_sigma=None,
+                write_soln=write_soln,
+                base_path=base_path,
+                v0=seed,
+            )
+        if not self.comm.bcast(global_lambda_star is not None, root=0):
+            global_lambda_star = self.run_guided_buckling_analysis(
+                axial=axial,
+                num_eig=num_eig,
+                max_num_eig=max_num_eig,
+                min_similarity=min_similarity,
+                local_mode_tol=local_mode_tol,
+                write_soln=write_soln,
+                base_path=base_path,
+            )
+
+        if self.comm.rank == 0 and global_lambda_star is not None:
+            path.append(
+                param, global_lambda_star, self.nondim_X, self.min_global_eigmode
+            )
+        return global_lambda_star
+
+    def _match_path_mode(self, path, min_similarity=0.7, local_mode_tol=0.7):
+        """eigenvalue of the global mode most similar to the last mode of the path"""
+        if self.comm.rank != 0:
+            return None
+        seed = path.seed(self.nondim_X)
+        num_dof = seed.shape[0]
+        similarities = [
+            self.cosine_mode_similarity(
+                seed, np.real(self._eigenvectors[imode][:num_dof])
+            )
+            for imode in range(self.num_modes)
+        ]
+        imode = int(np.argmax(similarities))
+        self._min_global_mode_shape = None
+        self._MAC_msg = (
+            f"continuation tracking of mode {imode} with sim {similarities[imode]:.4f}"
+        )
+        if similarities[imode] < min_similarity or not self.is_global_mode(
+            imode, local_mode_tol=local_mode_tol
+        ):
+            return None
+        self._min_global_imode = imode
+        self._min_global_eigval = np.real(self._eigenvalues[imode])
+        return self._min_global_eigval
+
+    def _windowed_buckling_analysis(
+        self,
+        sigma,
+        select,
+        num_eig=10,
+        max_num_eig=100,
+        fallback_sigma=None,
+        write_soln=False,
+        base_path=None,
+        v0=None,
+    ):
+        """
+        buckling solves around the shift sigma with num_eig eigenpairs doubled up to
+        max_num_eig until select() returns an eigenvalue on the root proc, then one solve
+        with max_num_eig eigenpairs at fallback_sigma (if given). v0 starts each solve
+        of the scipy backend
+        """
+        windows = []
+        _num_eig = min(num_eig, max_num_eig)
+        while True:
+            windows += [(sigma, _num_eig)]
+            if _num_eig >= max_num_eig:
+                break
+            _num_eig = min(2 * _num_eig, max_num_eig)
+        if fallback_sigma is not None:
+            windows += [(fallback_sigma, max_num_eig)]
+
+        self.eig_windows = []
+        eigval = None
+        for _sigma, _num_eig in windows:
+            self.run_buckling_analysis(
+                sigma=_sigma,
+                num_eig=_num_eig,
+                write_soln=write_soln,
+                base_path=base_path,
+                v0=v0,
+            )
+            self.post_analysis()
+            self.eig_windows += [(_sigma, _num_eig)]
+
+            eigval = select()
+            if self.comm.bcast(eigval is not None, root=0):
+                break
+        return eigval
+
     @property
     def nondim_X(self):
         """non-dimensional X matrix for Gaussian Process model"""
@@ -1458,15 +1859,14 @@ class StiffenedPlateAnalysis:
             return None
 
     def get_eigenvector(self, imode, uvw=False):
-        # convert eigenvectors to w coordinates only, 6 dof per shell
-        eigvector = self._eigenvectors[imode]
+        # w (or u, v then w) nodal values of the kept eigenvector, see eigvec_storage
         if uvw:
             uvw_subvector = np.concatenate(
-                [eigvector[0::6], eigvector[1::6], eigvector[2::6]], axis=0
+                [self._eigvec_dof(imode, dof) for dof in range(3)], axis=0
             )
             return uvw_subvector
         else:
-            return eigvector[2::6]
+            return self._eigvec_dof(imode, 2)
 
     @property
     def num_modes(self) -> int:
@@ -1483,53 +1883,45 @@ class StiffenedPlateAnalysis:
 
     def is_non_crippling_mode(self, imode):
         # ensure that the majority of the eigenvector magnitude is due to w displacement
-        # and not v displacement of stiffener, split into these two sub-vectors w_sub and total eigenvector
-        eigvector = self._eigenvectors[imode]
-        w_subvector = eigvector[2::6]
-        uvw_subvector = np.concatenate(
-            [eigvector[0::6], eigvector[1::6], eigvector[2::6]], axis=0
-        )
-
-        w_mag = np.sqrt(np.dot(w_subvector, w_subvector))
-        full_mag = np.sqrt(np.dot(uvw_subvector, uvw_subvector))
-        mag_frac = w_mag / full_mag
-        return mag_frac > 0.9
+        # and not v displacement of stiffener, the w fraction of the uvw magnitude is
+        # saved before eigvec_storage drops the u, v dofs
+        return self._w_fractions[imode] > 0.9
 
     def _in_tol(self, val1, val2, tol=1e-5):
         return np.abs(val1 - val2) < tol
 
+    @property
+    def nondim_node_sets(self) -> PanelNodeSets:
+        """index sets of the (xi, eta, zeta) nodes for the mode checks, rebuilt only when the coordinates change"""
+        if self._nondim_sets is None or self._nondim_sets.x is not self._xi:
+            self._nondim_sets = PanelNodeSets(
+                self._xi,
+                self._eta,
+                self._zeta,
+                stiff_locations=self.geometry.spec.stiff_locations / self.geometry.b,
+            )
+        return self._nondim_sets
+
     def is_local_mode(self, imode, just_check_local=False, local_mode_tol=0.5):
         """check if its a local mode by comparing the inf-norm (or max) w displacements along the stiffeners to the overall plate"""
-        N = self.geometry.num_stiff + 1
-        w = self._eigenvectors[imode][2::6]  # get only the w displacement entries
+        w = self._eigvec_dof(imode, 2)  # get only the w displacement entries
 
         # trim out and remove RBE elements if need be
         w = w[: self.num_nodes]
 
         # compute max w displacement in the stiffeners
-        mask = None
-        for i in range(1, self.geometry.num_stiff + 1):
-            # require at the panel surface only but under stiffener
-            _mask = np.logical_and(
-                self._in_tol(self._eta, i / N), self._in_tol(self._zeta, 0.0, tol=1e-5)
-            )
-            if mask is None:
-                mask = _mask
-            else:
-                mask = np.logical_or(mask, _mask)
-        
+        # require at the panel surface only but under stiffener
+        node_sets = self.nondim_node_sets
+        w_stiff = w[node_sets.stiffener_roots] if self.geometry.num_stiff > 0 else w
+
         # check for low relative deflections underneath the stiffeners
-        w_stiff = w[mask]
         w_stiff_max = np.max(np.abs(w_stiff))
         w_max = max([np.max(np.abs(w)), 1e-13]) # in overall plate
         low_stiff_deflection = w_stiff_max / w_max < local_mode_tol
 
         # also check the middle of the plate in case you have even # stiffeners
-        middle_dist = np.abs(0.5 - self._eta)
-        min_middle_dist = np.min(middle_dist) # sometimes no edge right at the middle
-        middle_plate_mask = np.logical_and(
-            self._in_tol(self._eta, 0.5 + min_middle_dist), self._in_tol(self._zeta, 0.0, tol=1e-5)
-        )
+        # sometimes no edge right at the middle
+        middle_plate_mask = node_sets.skin_middle
         w_middle = w[middle_plate_mask]
         w_middle_max = np.max(np.abs(w_middle))
         low_middle_deflection = w_middle_max / w_max < local_mode_tol
@@ -1556,6 +1948,9 @@ class StiffenedPlateAnalysis:
 
     @property
     def global_modes(self) -> list:
+        if self._eigenvectors is None:
+            # modes only kept on the root proc, see post_analysis
+            return [imode for imode, flag in enumerate(self._global_mode_flags) if flag]
         return [imode for imode in range(self.num_modes) if self.is_global_mode(imode)]
 
     @property
@@ -1734,7 +2129,9 @@ class StiffenedPlateAnalysis:
         # print(f"{other_plate_nondim_X=} {other_plate_nondim_X.shape=}")
         xi1 = other_plate_nondim_X[:,0].astype(np.double)
         eta1 = other_plate_nondim_X[:,1].astype(np.double)
-        phi1 = other_plate_eigmode[2::6].astype(np.double) # w component
+        # w component, the other plate may keep other dofs per node
+        dof_per_node = other_plate_eigmode.shape[0] // other_plate_nondim_X.shape[0]
+        phi1 = other_plate_eigmode[min(2, dof_per_node - 1)::dof_per_node].astype(np.double)
 
         self._min_global_mode_shape = 1
 
@@ -1753,7 +2150,7 @@ class StiffenedPlateAnalysis:
             # get current eigenmode data
             xi2 = self.nondim_X[:,0].astype(np.double)
             eta2 = self.nondim_X[:,1].astype(np.double)
-            phi2 = self._eigenvectors[imode][2::6].astype(np.double) # w component
+            phi2 = self._eigvec_dof(imode, 2).astype(np.double) # w component
 
             # get meshgrid format of new mesh
             xi2_unique = np.unique(np.round(xi2, 4))
@@ -1805,8 +2202,7 @@ class StiffenedPlateAnalysis:
         get nondim slopes for axial buckling mode shapes at x and y edges to see if solution is close to clamped BC or not
         this happens if gamma is high enough that the slopes at +x and -x go smaller
         """
-        eigvec = self._eigenvectors[imode]
-        w_eigvec = eigvec[2::6]
+        w_eigvec = self._eigvec_dof(imode, 2)
         wmax = np.max(np.abs(w_eigvec))
 
         yedge = not(xedge)
@@ -1815,13 +2211,10 @@ class StiffenedPlateAnalysis:
             SS_slope = m * np.pi
             
             # get points in panel nearest x = 0 but not 0
-            xvals_in_panel = self._xi[np.abs(self._zeta) < 1e-7]
-            unique_xvals = np.unique(xvals_in_panel)
-            dxi = np.diff(unique_xvals)[0]
+            dxi, _ = self.nondim_node_sets.skin_spacing
 
             # get closest point to middle at (dx,1/2) in xi,eta space
-            dist = np.abs(self._xi - dxi) + np.abs(self._eta - 0.5) + np.abs(self._zeta)
-            ind = np.argmin(dist)
+            ind = self.nondim_node_sets.nearest(dxi, 0.5)
 
             act_slope = np.abs(w_eigvec[ind] / wmax / dxi)
 
@@ -1830,11 +2223,9 @@ class StiffenedPlateAnalysis:
             SS_slope = n * np.pi
             
             # get points in panel nearest y = 0 but not 0
-            yvals_in_panel = self._eta[np.abs(self._zeta) < 1e-7]
-            deta = np.diff(np.unique(yvals_in_panel))[0]
+            _, deta = self.nondim_node_sets.skin_spacing
             # get closest point to middle at (1/2,deta) in xi,eta space
-            dist = np.abs(self._xi - 0.5) + np.abs(self._eta - deta) + np.abs(self._zeta)
-            ind = np.argmin(dist)
+            ind = self.nondim_node_sets.nearest(0.5, deta)
 
             act_slope = np.abs(w_eigvec[ind] / wmax / deta)
 
@@ -1858,62 +2249,23 @@ class StiffenedPlateAnalysis:
     def predict_crit_load_no_centroid(
         self, exx=0.0, exy=0.0, output_global=False, return_all=False
     ):
+        """
+        global closed-form load with the plate D11 about the skin mid-plane instead of
+        the modulus weighted centroid, the removed *_no_centroid properties are the
+        old_affine_aspect_ratio, old_gamma and old_xi_plate properties
+        """
 
         # haven't treated the combined case yet
         assert exx == 0.0 or exy == 0.0
 
+        rho0 = self.old_affine_aspect_ratio
+        gamma = self.old_gamma
+        xi = self.old_xi_plate
         if exx != 0.0:
-            # N11_plate = self.intended_Nxx
-            # _Darray = self.Darray_plate
-            # D11 = _Darray[0]; D22 = _Darray[2]
-
-            gamma = self.gamma_no_centroid
-            rho0 = self.affine_aspect_ratio_no_centroid
-            xi = self.xi_plate_no_centroid
-
-            lam_star_global = min(
-                [
-                    (1 + gamma) * m1 ** 2 / rho0 ** 2 + rho0 ** 2 / m1 ** 2 + 2 * xi
-                    for m1 in range(1, 50)
-                ]
-            )
-
-            return lam_star_global, "global"  # temp
-
+            lam_star_global, _ = global_axial_load(xi, rho0, gamma)
         else:  # exy != 0.0
-
-            # high aspect ratio soln
-            rho0 = self.affine_aspect_ratio_no_centroid
-            gamma = self.gamma_no_centroid
-            xi = self.xi_plate_no_centroid
-
-            def high_AR_resid(s2):
-                s1 = (1.0 + 2.0 * s2 ** 2 * xi + s2 ** 4 + gamma) ** 0.25
-                term1 = s2 ** 2 + s1 ** 2 + xi / 3
-                term2 = (
-                    (3 + xi) / 9.0 + 4.0 / 3.0 * s1 ** 2 * xi + 4.0 / 3.0 * s1 ** 4
-                ) ** 0.5
-                return term1 - term2
-
-            s2_bar = fsolve(high_AR_resid, 1.0)[0]
-            s1_bar = (1.0 + 2.0 * s2_bar ** 2 * xi + s2_bar ** 4 + gamma) ** 0.25
-            print(f"{s1_bar=}, {s2_bar=}")
-
-            N12cr_highAR = (
-                (
-                    1.0
-                    + gamma
-                    + s1_bar ** 4
-                    + 6 * s1_bar ** 2 * s2_bar ** 2
-                    + s2_bar ** 4
-                    + 2 * xi * (s1_bar ** 2 + s2_bar ** 2)
-                )
-                / 2.0
-                / s1_bar ** 2
-                / s2_bar
-            )
-            N12cr_lowAR = N12cr_highAR / rho0 ** 2
-            return np.max([N12cr_highAR, N12cr_lowAR]), "global"
+            lam_star_global = global_shear_load(xi, rho0, gamma)
+        return float(lam_star_global), "global"
 
     def predict_crit_load(
         self, axial: bool = True, output_global=False, return_all=False
@@ -1923,71 +2275,75 @@ class StiffenedPlateAnalysis:
         # assert exx == 0.0 or exy == 0.0
 
         if axial:
-            # N11_plate = self.intended_Nxx
-            # _Darray = self.Darray_plate
-            # D11 = _Darray[0]; D22 = _Darray[2]
-
-            lam_star_global = min(
-                [
-                    (1 + self.gamma) * m1 ** 2 / self.affine_aspect_ratio ** 2
-                    + self.affine_aspect_ratio ** 2 / m1 ** 2
-                    + 2 * self.xi_plate
-                    for m1 in range(1, 50)
-                ]
+            lam_star_global, _ = global_axial_load(
+                self.xi_plate, self.affine_aspect_ratio, self.gamma
             )
-
-            return lam_star_global, "global"  # temp
-
         else:  # exy != 0.0
-
-            # high aspect ratio soln
-            rho0 = self.affine_aspect_ratio
-            gamma = self.gamma
-            xi = self.xi_plate
-
-            def high_AR_resid(s2):
-                s1 = (1.0 + 2.0 * s2 ** 2 * xi + s2 ** 4 + gamma) ** 0.25
-                term1 = s2 ** 2 + s1 ** 2 + xi / 3
-                term2 = (
-                    (3 + xi) / 9.0 + 4.0 / 3.0 * s1 ** 2 * xi + 4.0 / 3.0 * s1 ** 4
-                ) ** 0.5
-                return term1 - term2
-
-            s2_bar = fsolve(high_AR_resid, 1.0)[0]
-            s1_bar = (1.0 + 2.0 * s2_bar ** 2 * xi + s2_bar ** 4 + gamma) ** 0.25
-            print(f"{s1_bar=}, {s2_bar=}")
-
-            N12cr_highAR = (
-                (
-                    1.0
-                    + gamma
-                    + s1_bar ** 4
-                    + 6 * s1_bar ** 2 * s2_bar ** 2
-                    + s2_bar ** 4
-                    + 2 * xi * (s1_bar ** 2 + s2_bar ** 2)
-                )
-                / 2.0
-                / s1_bar ** 2
-                / s2_bar
+            lam_star_global = global_shear_load(
+                self.xi_plate, self.affine_aspect_ratio, self.gamma
             )
-            N12cr_lowAR = N12cr_highAR / rho0 ** 2
-            return np.max([N12cr_highAR, N12cr_lowAR]), "global"
+        return float(lam_star_global), "global"
 
-    def size_stiffener(self, gamma, nx, nz, safety_factor=10, shear=False):
-        lam_stiff0, lam_global0, _ = self.predict_crit_load(
-            exx=(not shear) * self.affine_exx,
-            exy=shear * self.affine_exy,
+    def predict_rayleigh_ritz_load(self, axial: bool = True, num_eig=1, **kwargs):
+        """
+        lowest Rayleigh-Ritz global loads of the panel with its discrete stiffeners,
+        see rayleigh_ritz_buckling
+        """
+        eigvals = rayleigh_ritz_buckling(
+            self.affine_aspect_ratio,
+            self.xi_plate,
+            gamma=self.gamma,
+            delta=self.delta,
+            zeta=self.zeta_plate,
+            num_stiff=self.geometry.num_stiff,
+            axial=axial,
+            num_eig=num_eig,
+            **kwargs,
         )
+        return eigvals if num_eig > 1 else float(eigvals[0])
 
-        gamma0 = self.gamma
-        hw = self.geometry.h_w
-        tw = self.geometry.t_w
-        SAR0 = self.geometry.stiff_AR
-        factor1 = (gamma / gamma0 * tw * hw ** 3) ** 2
-        factor2 = SAR0 ** 2 * lam_stiff0 / safety_factor / lam_global0
-        hw_max = np.power(factor1 * factor2, 0.125)
-        tw_new = tw * gamma / gamma0 * hw ** 3 / hw_max ** 3
-        return hw_max, tw_new
+    def adaptive_mesh_sizes(self, shear=False, elems_per_half_wave=8, **kwargs) -> dict:
+        """
+        mesh keyword arguments of pre_analysis from the closed-form half-waves
+        of the global and local modes, see panel_mesh_sizes
+        """
+        return panel_mesh_sizes(
+            self.plate_material,
+            self.stiffener_material,
+            self.geometry,
+            shear=shear,
+            elems_per_half_wave=elems_per_half_wave,
+            **kwargs,
+        )
+
+    def mode_resolution(self, imode) -> float:
+        """
+        a-posteriori elements per half-wave in x of a computed mode, along the skin
+        line closest to the middle of the panel (compare to the sizing target)
+        """
+        line = self.nondim_node_sets.skin_middle
+        w = self._eigvec_dof(imode, 2)[line]
+        num_elems = np.unique(self._xi[line]).shape[0] - 1
+        return num_elems / mode_half_waves(self._xi[line], w)
+
+    def size_stiffener(self, gamma, safety_factor=10, shear=False):
+        """
+        new stiffener web height and thickness for a target gamma so that crippling
+        is safety_factor times above the global buckling load, see size_stiffeners
+        """
+        sizing = size_stiffeners(
+            plate_material=self.plate_material,
+            stiffener_material=self.stiffener_material,
+            a=self.geometry.a,
+            b=self.geometry.b,
+            h=self.geometry.h,
+            s_p=self.geometry.s_p,
+            num_stiff=self.geometry.num_stiff,
+            gamma=gamma,
+            safety_factor=safety_factor,
+            shear=shear,
+        )
+        return float(sizing["h_w"]), float(sizing["t_w"])
 
     def __str__(self):
         mystr = f"Stiffened panel analysis object '{self._name}':\n"
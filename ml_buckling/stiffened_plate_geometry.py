@@ -1,10 +1,119 @@
-__all__ = ["StiffenedPlateGeometry"]
+__all__ = ["StiffenedPlateGeometry", "StiffenedPlateGeometrySpec"]
 
 import numpy as np
 import math
 
 
+class StiffenedPlateGeometrySpec:
+    """
+    immutable, hashable value type of the stiffened panel geometry
+    with the stiffener pitch and number of stiffeners already resolved
+    """
+
+    __slots__ = (
+        "a",
+        "b",
+        "h",
+        "h_w",
+        "t_w",
+        "w_b",
+        "t_b",
+        "num_stiff",
+        "s_p",
+        "boundary_s_p",
+        "rib_h",
+        "_key",
+        "_hash",
+    )
+
+    def __init__(
+        self,
+        a,
+        b,
+        h,
+        h_w,
+        t_w,
+        w_b=None,
+        t_b=None,
+        s_p: float = None,
+        num_stiff=None,
+        rib_h=2e-3,
+    ):
+        assert num_stiff is not None or s_p is not None
+        # not implemented in closed-form yet so ignore this
+        assert t_b is None or t_b == 0.0
+
+        _set = lambda name, value: object.__setattr__(self, name, value)
+        _set("a", float(a))
+        _set("b", float(b))
+        _set("h", float(h))
+        _set("h_w", float(h_w))
+        _set("t_w", float(t_w))
+        _set("w_b", 0.0 if w_b is None else float(w_b))
+        _set("t_b", 0.0 if t_b is None else float(t_b))
+        _set("rib_h", float(rib_h))
+
+        if num_stiff is not None:
+            _set("num_stiff", int(num_stiff))
+            _set("s_p", self.b / (self.num_stiff + 1))
+            _set("boundary_s_p", self.s_p)
+        else:
+            # symmetricly placed stiffeners with extra space at ends
+            _set("s_p", float(s_p))
+            _set("num_stiff", 2 * math.ceil(self.b / 2.0 / self.s_p) - 1)
+            _set("boundary_s_p", (self.b / 2.0) % self.s_p)
+
+        # key holds the constructor arguments so the spec can be rebuilt when unpickled
+        key = (
+            self.a,
+            self.b,
+            self.h,
+            self.h_w,
+            self.t_w,
+            self.w_b,
+            self.t_b,
+            None if num_stiff is not None else self.s_p,
+            None if num_stiff is None else self.num_stiff,
+            self.rib_h,
+        )
+        _set("_key", key)
+        _set("_hash", hash(key))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable, can't set {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable, can't delete {name}")
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, StiffenedPlateGeometrySpec):
+            return NotImplemented
+        return self._hash == other._hash and self._key == other._key
+
+    def __reduce__(self):
+        return (StiffenedPlateGeometrySpec, self._key)
+
+    @property
+    def stiff_locations(self) -> np.ndarray:
+        """y locations of the stiffeners, same spacing as the panel mesh"""
+        return self.boundary_s_p + self.s_p * np.arange(self.num_stiff)
+
+    def __repr__(self):
+        return (
+            f"StiffenedPlateGeometrySpec(a={self.a}, b={self.b}, h={self.h}, "
+            f"h_w={self.h_w}, t_w={self.t_w}, num_stiff={self.num_stiff}, s_p={self.s_p})"
+        )
+
+
 class StiffenedPlateGeometry:
+    """
+    mutable facade over StiffenedPlateGeometrySpec, the frozen spec is rebuilt
+    lazily after any attribute is changed
+    """
+
     def __init__(
         self,
         a,
@@ -36,6 +145,34 @@ class StiffenedPlateGeometry:
 
         self.rib_h = rib_h
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != "_spec":
+            object.__setattr__(self, "_spec", None)
+
+    @property
+    def spec(self) -> StiffenedPlateGeometrySpec:
+        """frozen, hashable value of this geometry"""
+        if self._spec is None:
+            self._spec = StiffenedPlateGeometrySpec(
+                a=self.a,
+                b=self.b,
+                h=self.h,
+                h_w=self.h_w,
+                t_w=self.t_w,
+                w_b=self.w_b,
+                t_b=self.t_b,
+                s_p=self._s_p,
+                num_stiff=self._num_stiff,
+                rib_h=self.rib_h,
+            )
+        return self._spec
+
+    @classmethod
+    def from_spec(cls, spec: StiffenedPlateGeometrySpec):
+        """make a facade over an existing spec"""
+        return cls(*spec._key)
+
     @property
     def s_p(self) -> float:
         """stiffener pitch"""
@@ -124,6 +261,18 @@ class StiffenedPlateGeometry:
             rib_h=geometry.rib_h,
         )
 
+    def component_thickness(self, compDescript: str) -> float:
+        """shell thickness of the panel, base, stiff(ener) or rib component of the mesh"""
+        if "panel" in compDescript:
+            return self.h
+        elif "base" in compDescript:
+            return self.h + self.t_b
+        elif "stiff" in compDescript:
+            return self.t_w
+        elif "rib" in compDescript:
+            return self.rib_h
+        raise AssertionError("elem does not belong to oneof the main components")
+
     @property
     def volume(self) -> float:
         panel_volume = self.a * self.b * self.h
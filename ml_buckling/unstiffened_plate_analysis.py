@@ -1,14 +1,29 @@
 __all__ = ["UnstiffenedPlateAnalysis", "exp_kernel1"]
 
 import numpy as np
-from tacs import pyTACS, constitutive, elements, utilities
+try:
+    from tacs import pyTACS, constitutive, elements, utilities
+except ImportError:  # only the scipy backend without TACS
+    pyTACS = constitutive = elements = utilities = None
 import os
 from pprint import pprint
-from .composite_material_utility import CompositeMaterialUtility
+from .material_registry import material_registry
+from .workspace import AnalysisWorkspace
+from .composite_material import CompositeMaterial
+from .panel_mesh import PanelMesh
+from .sparse_shell import SparseShellModel
+from .bdf_writer import (
+    BDF_HEADER,
+    grid_cards,
+    cquad4_cards,
+    spc_cards,
+    shell_property_cards,
+    write_bdf,
+)
 
 # from typing_extensions import Self
 
-dtype = utilities.BaseUI.dtype
+dtype = float if utilities is None else utilities.BaseUI.dtype
 
 
 def exp_kernel1(xp, xq, sigma_f, L):
@@ -33,8 +48,13 @@ class UnstiffenedPlateAnalysis:
         material_name=None,
         ply_angle=None,
         plate_name=None,  # use the plate name to differentiate plate folder names
+        workspace: AnalysisWorkspace = None,  # relative bdf files and output go here
+        backend: str = "tacs",  # or "scipy" for the in-process sparse shell solver
     ):
+        assert backend in ["tacs", "scipy"]
         self.comm = comm
+        self.workspace = workspace
+        self.backend = backend
 
         # geometry properties
         self.a = a  # Lx
@@ -66,6 +86,8 @@ class UnstiffenedPlateAnalysis:
         self._alphas = None
         self._solved_buckling = False
         self._saved_alphas = False
+        self.mesh = None
+        self._shell_model = None
 
     MAC_THRESHOLD = 0.1  # 0.6
 
@@ -166,145 +188,173 @@ class UnstiffenedPlateAnalysis:
     # NIAR composite materials
 
     @classmethod
-    def solvay5320(cls, comm, bdf_file, a, b, h, ply_angle=0.0):
+    def solvay5320(
+        cls, comm, bdf_file, a, b, h, ply_angle=0.0, workspace=None, backend="tacs"
+    ):
         """
         NIAR dataset - Solvay 5320-1 material (thermoset)
         Fiber: T650 unitape, Resin: Cycom 5320-1
-        Room Temperature Dry (RTD) mean properties shown below
+        Room Temperature Dry (RTD) mean properties in NIAR_MATERIALS
         units in Pa, ND
         """
-        comp_utility = CompositeMaterialUtility(
-            E11=138.461e9, E22=9.177e9, nu12=0.326, G12=4.957e9
-        )
-        comp_utility.rotate_ply(ply_angle)
+        props = material_registry.rotated_properties("solvay5320", ply_angle)
 
         return cls(
             comm=comm,
             bdf_file=bdf_file,
+            workspace=workspace,
+            backend=backend,
             a=a,
             b=b,
             h=h,
             material_name="solvay5320",
             ply_angle=ply_angle,
-            E11=comp_utility.E11,
-            E22=comp_utility.E22,
-            nu12=comp_utility.nu12,
-            G12=comp_utility.G12,
+            E11=props["E11"],
+            E22=props["E22"],
+            nu12=props["nu12"],
+            G12=props["G12"],
         )
 
     @classmethod
-    def solvayMTM45(cls, comm, bdf_file, a, b, h, ply_angle=0.0):
+    def solvayMTM45(
+        cls, comm, bdf_file, a, b, h, ply_angle=0.0, workspace=None, backend="tacs"
+    ):
         """
         NIAR dataset - Solvay MTM45 material (thermoset)
         Style: 12K AS4 Unidirectional
-        Room Temperature Dry (RTD) mean properties shown below
+        Room Temperature Dry (RTD) mean properties in NIAR_MATERIALS
         units in Pa, ND
         """
-        comp_utility = CompositeMaterialUtility(
-            E11=129.5e9, E22=7.936e9, nu12=0.313, G12=4.764e9
-        )
-        comp_utility.rotate_ply(ply_angle)
+        props = material_registry.rotated_properties("solvayMTM45", ply_angle)
 
         return cls(
             comm=comm,
             bdf_file=bdf_file,
+            workspace=workspace,
+            backend=backend,
             a=a,
             b=b,
             h=h,
             material_name="solvayMTM45",
             ply_angle=ply_angle,
-            E11=comp_utility.E11,
-            E22=comp_utility.E22,
-            nu12=comp_utility.nu12,
-            G12=comp_utility.G12,
+            E11=props["E11"],
+            E22=props["E22"],
+            nu12=props["nu12"],
+            G12=props["G12"],
         )
 
     @classmethod
-    def torayBT250E(cls, comm, bdf_file, a, b, h, ply_angle=0.0):
+    def torayBT250E(
+        cls, comm, bdf_file, a, b, h, ply_angle=0.0, workspace=None, backend="tacs"
+    ):
         """
         NIAR dataset - Toray (formerly Tencate) BT250E-6 S2 Unitape Gr 284 material (thermoset)
-        Room Temperature Dry (RTD) mean properties shown below
+        Room Temperature Dry (RTD) mean properties in NIAR_MATERIALS
         units in Pa, ND
         """
-        comp_utility = CompositeMaterialUtility(
-            E11=44.74e9, E22=11.36e9, nu12=0.278, G12=3.77e9
-        )
-        comp_utility.rotate_ply(ply_angle)
+        props = material_registry.rotated_properties("torayBT250E", ply_angle)
 
         return cls(
             comm=comm,
             bdf_file=bdf_file,
+            workspace=workspace,
+            backend=backend,
             a=a,
             b=b,
             h=h,
             material_name="torayBT250E",
             ply_angle=ply_angle,
-            E11=comp_utility.E11,
-            E22=comp_utility.E22,
-            nu12=comp_utility.nu12,
-            G12=comp_utility.G12,
+            E11=props["E11"],
+            E22=props["E22"],
+            nu12=props["nu12"],
+            G12=props["G12"],
         )
 
     @classmethod
-    def victrexAE(cls, comm, bdf_file, a, b, h, ply_angle=0.0):
+    def victrexAE(
+        cls, comm, bdf_file, a, b, h, ply_angle=0.0, workspace=None, backend="tacs"
+    ):
         """
         NIAR dataset - Victrex AE 250 LMPAEK (thermoplastic)
-        Room Temperature Dry (RTD) mean properties shown below
+        Room Temperature Dry (RTD) mean properties in NIAR_MATERIALS
         units in Pa, ND
         """
-        comp_utility = CompositeMaterialUtility(
-            E11=131.69e9, E22=9.694e9, nu12=0.3192, G12=4.524e9
-        )
-        comp_utility.rotate_ply(ply_angle)
+        props = material_registry.rotated_properties("victrexAE", ply_angle)
 
         return cls(
             comm=comm,
             bdf_file=bdf_file,
+            workspace=workspace,
+            backend=backend,
             a=a,
             b=b,
             h=h,
             material_name="victrexAE",
             ply_angle=ply_angle,
-            E11=comp_utility.E11,
-            E22=comp_utility.E22,
-            nu12=comp_utility.nu12,
-            G12=comp_utility.G12,
+            E11=props["E11"],
+            E22=props["E22"],
+            nu12=props["nu12"],
+            G12=props["G12"],
         )
 
     @classmethod
-    def hexcelIM7(cls, comm, bdf_file, a, b, h, ply_angle=0.0):
+    def hexcelIM7(
+        cls, comm, bdf_file, a, b, h, ply_angle=0.0, workspace=None, backend="tacs"
+    ):
         """
         NIAR dataset - Hexcel 8552 IM7 Unidirectional Prepreg (thermoset)
-        Room Temperature Dry (RTD) mean properties shown below
+        Room Temperature Dry (RTD) mean properties in NIAR_MATERIALS
         units in Pa, ND
         """
-        comp_utility = CompositeMaterialUtility(
-            E11=158.51e9, nu12=0.316, E22=8.96e9, G12=4.688e9
-        )
-        comp_utility.rotate_ply(ply_angle)
+        props = material_registry.rotated_properties("hexcelIM7", ply_angle)
 
         return cls(
             comm=comm,
             bdf_file=bdf_file,
+            workspace=workspace,
+            backend=backend,
             a=a,
             b=b,
             h=h,
             material_name="hexcelIM7",
             ply_angle=ply_angle,
-            E11=comp_utility.E11,
-            E22=comp_utility.E22,
-            nu12=comp_utility.nu12,
-            G12=comp_utility.G12,
+            E11=props["E11"],
+            E22=props["E22"],
+            nu12=props["nu12"],
+            G12=props["G12"],
         )
 
     @property
     def bdf_file(self) -> str:
+        if self.workspace is not None and not os.path.isabs(self._bdf_file):
+            return self.workspace.file(self._bdf_file)
         return self._bdf_file
 
+    @property
+    def work_dir(self) -> str:
+        """folder of the solution output, the workspace or else the cwd"""
+        if self.workspace is not None:
+            return self.workspace.path
+        return os.getcwd()
+
     @bdf_file.setter
     def bdf_file(self, new_file: str):
         self._bdf_file = new_file
 
+    def _solution_folder(self, base_path, folder_name) -> str:
+        """
+        folder of the solution files in base_path (default work_dir), made on the root proc.
+        None for in-memory workspaces without a base_path, which write no solution files
+        """
+        if base_path is None:
+            base_path = self.work_dir
+        if base_path is None:
+            return None
+        folder = os.path.join(base_path, folder_name)
+        if not os.path.exists(folder) and self.comm.rank == 0:
+            os.mkdir(folder)
+        return folder
+
     @property
     def num_elements(self) -> int:
         return self._nx * self._ny
@@ -565,6 +615,57 @@ class UnstiffenedPlateAnalysis:
         """number of eigenvalues or modes that were recorded"""
         return self._num_modes
 
+    def _plate_mesh_cards(self, nodes, x, y):
+        """
+        grid indices (j outer loop, i inner loop), boundary mask and
+        the header, GRID* and CQUAD4 cards of the structured plate mesh,
+        the mesh arrays are kept as a PanelMesh for the scipy backend
+        """
+        nx = x.shape[0] - 1
+        ny = y.shape[0] - 1
+        j, i = [_.ravel() for _ in np.meshgrid(np.arange(ny + 1), np.arange(nx + 1), indexing="ij")]
+        bndry = (i == 0) | (j == 0) | (i == nx) | (j == ny)
+        xyz = np.stack([x[i], y[j], 0.0 * x[i]], axis=1)
+
+        je, ie = [_.ravel() for _ in np.meshgrid(np.arange(ny), np.arange(nx), indexing="ij")]
+        conn = np.stack(
+            [nodes[ie, je], nodes[ie + 1, je], nodes[ie + 1, je + 1], nodes[ie, je + 1]],
+            axis=1,
+        )
+        self.mesh = PanelMesh(
+            xyz, conn, np.ones((conn.shape[0],), dtype=int), node_ids=nodes[i, j]
+        )
+        mesh_cards = [
+            BDF_HEADER,
+            grid_cards(nodes[i, j], xyz),
+            cquad4_cards(np.arange(1, conn.shape[0] + 1), 1, conn),
+        ]
+        return i, j, bndry, mesh_cards
+
+    def _plate_disp_bcs(self, i, j, x, y, exx, eyy, exy):
+        """
+        u = uhat, v = vhat displacement control values of each grid node,
+        u = eps_xy * y, v = eps_xy * x in shear
+        """
+        nx = x.shape[0] - 1
+        ny = y.shape[0] - 1
+        u = exy * y[j]
+        v = exy * x[i]
+        u_axial = np.logical_or(i == nx, exy != 0)
+        v_axial = np.logical_and(np.logical_not(u_axial), j == ny)
+        u = u - u_axial * exx * x[i]
+        v = v - v_axial * eyy * y[j]
+        return u, v
+
+    def _plate_spc_cards(self, node_ids, bndry, slot_masks, slot_dofs, slot_values):
+        """SPC cards of the boundary nodes, each node writes its active slots in order"""
+        masks = np.stack(slot_masks, axis=1) & bndry[:, None]
+        dofs = np.broadcast_to(np.array(slot_dofs), masks.shape)
+        values = np.stack(slot_values, axis=1)
+        ids = np.broadcast_to(node_ids[:, None], masks.shape)
+        self.mesh.set_constraints(ids[masks], dofs[masks], values[masks])
+        return spc_cards(ids[masks], dofs[masks], values[masks])
+
     def generate_bdf(
         self, nx=30, ny=30, exx=0.0, eyy=0.0, exy=0.0, clamped=True, one_free=False
     ):
@@ -598,117 +699,29 @@ class UnstiffenedPlateAnalysis:
         self._eta = [self._y[int(i / self._M)] / self.b for i in range(self.num_nodes)]
 
         if self.comm.rank == 0:
-            if os.path.exists(self.bdf_file):
-                os.remove(self.bdf_file)
-
-            fp = open(self.bdf_file, "w")
-            fp.write("$ Input file for a square axial/shear-disp BC plate\n")
-            fp.write("SOL 103\nCEND\nBEGIN BULK\n")
-
-            # Write the grid points to a file
-            for j in range(ny + 1):
-                for i in range(nx + 1):
-                    # Write the nodal data
-                    spc = " "
-                    coord_disp = 0
-                    coord_id = 0
-                    seid = 0
-
-                    fp.write(
-                        "%-8s%16d%16d%16.9e%16.9e*       \n"
-                        % ("GRID*", nodes[i, j], coord_id, x[i], y[j])
-                    )
-                    fp.write(
-                        "*       %16.9e%16d%16s%16d        \n"
-                        % (0.0, coord_disp, spc, seid)
-                    )
-
-            # Output 2nd order elements
-            elem = 1
-            part_id = 1
-            for j in range(ny):
-                for i in range(nx):
-                    # Write the connectivity data
-                    # CQUAD4 elem id n1 n2 n3 n4
-                    fp.write(
-                        "%-8s%8d%8d%8d%8d%8d%8d\n"
-                        % (
-                            "CQUAD4",
-                            elem,
-                            part_id,
-                            nodes[i, j],
-                            nodes[i + 1, j],
-                            nodes[i + 1, j + 1],
-                            nodes[i, j + 1],
-                        )
-                    )
-                    elem += 1
-
-            # Set up the plate BCs so that it has u = uhat, for shear disp control
-            # u = eps * y, v = eps * x, w = 0
-            for j in range(ny + 1):
-                for i in range(nx + 1):
-                    u = exy * y[j]
-                    v = exy * x[i]
-
-                    if i == nx or exy != 0:
-                        u -= exx * x[i]
-                    elif j == ny:
-                        v -= eyy * y[j]
-                    elif i == 0 or j == 0:
-                        pass
-
-                    # check on boundary
-                    if i == 0 or j == 0 or i == nx or j == ny:
-                        if clamped or (i == 0 and j == 0):
-                            fp.write(
-                                "%-8s%8d%8d%8s%8.6f\n"
-                                % ("SPC", 1, nodes[i, j], "3456", 0.0)
-                            )  # w = theta_x = theta_y = theta_z = 0
-                        else:
-                            write_SS_BC = (one_free and not (j == ny)) or (not one_free)
-                            if write_SS_BC:
-                                fp.write(
-                                    "%-8s%8d%8d%8s%8.6f\n"
-                                    % ("SPC", 1, nodes[i, j], "36", 0.0)
-                                )  # w = theta_z = 0
-                        if exy != 0 or i == 0 or i == nx:
-                            fp.write(
-                                "%-8s%8d%8d%8s%8.6f\n" % ("SPC", 1, nodes[i, j], "1", u)
-                            )  # u = eps_xy * y
-                        if exy != 0.0 or j == 0:
-                            fp.write(
-                                "%-8s%8d%8d%8s%8.6f\n" % ("SPC", 1, nodes[i, j], "2", v)
-                            )  # v = eps_xy * x
-
-            # # plot the mesh to make sure it makes sense
-            # X, Y = np.meshgrid(x, y)
-            # W = X * 0.0
-            # for j in range(ny + 1):
-            #     for i in range(nx + 1):
-            #         if i == 0 or i == nx or j == 0 or j == ny:
-            #             W[i, j] = 1.0
-
-            # plt.scatter(X,Y)
-            # plt.contour(X,Y,W, corner_mask=True, antialiased=True)
-            # plt.show()
-
-            fp.write(
-                "MAT1*                 1              0.                              0. *0      \n"
-            )
-            fp.write(
-                "*0                   0.                                                 *1      \n"
-            )
-            fp.write("*1                   1.              0.              0. \n")
-            fp.write("$ Femap Property  : panel\n")
-            fp.write(
-                "PSHELL*               1               1           1.E-2               1 *0      \n"
+            i, j, bndry, mesh_cards = self._plate_mesh_cards(nodes, x, y)
+            u, v = self._plate_disp_bcs(i, j, x, y, exx, eyy, exy)
+
+            # one slot per possible SPC card of each boundary node, kept in node order
+            ss_edge = np.logical_or(not one_free, j != ny)
+            slot_masks = [
+                np.logical_or(clamped, np.logical_and(i == 0, j == 0)),
+                np.logical_and(np.logical_not(clamped), i + j > 0) & ss_edge,
+                np.logical_or(exy != 0, np.logical_or(i == 0, i == nx)),
+                np.logical_or(exy != 0.0, j == 0),
+            ]
+            slot_dofs = ["3456", "36", "1", "2"]
+            slot_values = [np.zeros_like(u), np.zeros_like(u), u, v]
+            spc_text = self._plate_spc_cards(
+                nodes[i, j], bndry, slot_masks, slot_dofs, slot_values
             )
-            fp.write("*0                   1.               1 0.8333333333333 \n")
 
-            fp.write("ENDDATA")
-            fp.close()
+            write_bdf(
+                self.bdf_file,
+                mesh_cards + [spc_text, shell_property_cards(stiffener=False), "ENDDATA"],
+            )
 
+        self.mesh = self.comm.bcast(self.mesh, root=0)
         self.comm.Barrier()
 
     def generate_tripping_bdf(self, nx=30, ny=30, exx=0.0, eyy=0.0, exy=0.0):
@@ -742,120 +755,26 @@ class UnstiffenedPlateAnalysis:
         self._eta = [self._y[int(i / self._M)] / self.b for i in range(self.num_nodes)]
 
         if self.comm.rank == 0:
-            if os.path.exists(self.bdf_file):
-                os.remove(self.bdf_file)
-
-            fp = open(self.bdf_file, "w")
-            fp.write("$ Input file for a square axial/shear-disp BC plate\n")
-            fp.write("SOL 103\nCEND\nBEGIN BULK\n")
-
-            # Write the grid points to a file
-            for j in range(ny + 1):
-                for i in range(nx + 1):
-                    # Write the nodal data
-                    spc = " "
-                    coord_disp = 0
-                    coord_id = 0
-                    seid = 0
-
-                    fp.write(
-                        "%-8s%16d%16d%16.9e%16.9e*       \n"
-                        % ("GRID*", nodes[i, j], coord_id, x[i], y[j])
-                    )
-                    fp.write(
-                        "*       %16.9e%16d%16s%16d        \n"
-                        % (0.0, coord_disp, spc, seid)
-                    )
-
-            # Output 2nd order elements
-            elem = 1
-            part_id = 1
-            for j in range(ny):
-                for i in range(nx):
-                    # Write the connectivity data
-                    # CQUAD4 elem id n1 n2 n3 n4
-                    fp.write(
-                        "%-8s%8d%8d%8d%8d%8d%8d\n"
-                        % (
-                            "CQUAD4",
-                            elem,
-                            part_id,
-                            nodes[i, j],
-                            nodes[i + 1, j],
-                            nodes[i + 1, j + 1],
-                            nodes[i, j + 1],
-                        )
-                    )
-                    elem += 1
-
-            # Set up the plate BCs so that it has u = uhat, for shear disp control
-            # u = eps * y, v = eps * x, w = 0
-            for j in range(ny + 1):
-                for i in range(nx + 1):
-                    u = exy * y[j]
-                    v = exy * x[i]
-
-                    if i == nx or exy != 0:
-                        u -= exx * x[i]
-                    elif j == ny:
-                        v -= eyy * y[j]
-                    elif i == 0 or j == 0:
-                        pass
-
-                    # check on boundary
-                    if i == 0 or j == 0 or i == nx or j == ny:
-                        if i == 0 and j == 0:  #  or (i == nx and j == 0):
-                            fp.write(
-                                "%-8s%8d%8d%8s%8.6f\n"
-                                % ("SPC", 1, nodes[i, j], "3456", 0.0)
-                            )  # w = theta_x = theta_y = theta_z = 0
-                        elif j == 0 or i == 0 or i == nx:  # SSSF BCs
-                            fp.write(
-                                "%-8s%8d%8d%8s%8.6f\n"
-                                % ("SPC", 1, nodes[i, j], "36", 0.0)
-                            )  # w = theta_z = 0
-                        if exy != 0 or i == 0 or i == nx:
-                            fp.write(
-                                "%-8s%8d%8d%8s%8.6f\n" % ("SPC", 1, nodes[i, j], "1", u)
-                            )  # u = eps_xy * y
-                        if exy != 0.0 or j == 0:
-                            fp.write(
-                                "%-8s%8d%8d%8s%8.6f\n" % ("SPC", 1, nodes[i, j], "2", v)
-                            )  # v = eps_xy * x
-
-            # write RBE2 elements
-            # left_control_node = None
-            # left_nodes = []
-            # right_control_node = None
-            # right_nodes = []
-            # for j in range(ny + 1):
-            #     for i in range(nx + 1):
-            #         if i == 0 and j == 0:
-            #             left_control_node = nodes[i,j]
-            #         elif i == nx and j == 0:
-            #             right_control_node = nodes[i,j]
-            #         elif i == 0:
-            #             left_nodes += [nodes[i,j]]
-            #         elif i == nx:
-            #             right_nodes += [nodes[i,j]]
-
-            # # also could do 123456 or 123 (but I don't really want no rotation here I don't think)
-            # print(f"writing RBE elements")
-            # fp.write("%-8s%8d%8d%8d" % ("RBE2", elem, left_control_node, 13456))
-            # for rbe_node in left_nodes:
-            #     fp.write("%8d" % (rbe_node))
-            # fp.write("\n")
-            # elem += 1
-
-            # fp.write("%-8s%8d%8d%8d" % ("RBE2", elem, right_control_node, 13456))
-            # for rbe_node in right_nodes:
-            #     fp.write("%8d" % (rbe_node))
-            # fp.write("\n")
-            # elem += 1
-
-            fp.write("ENDDATA")
-            fp.close()
+            i, j, bndry, mesh_cards = self._plate_mesh_cards(nodes, x, y)
+            u, v = self._plate_disp_bcs(i, j, x, y, exx, eyy, exy)
+
+            # SSSF BCs with the corner pinned
+            corner = np.logical_and(i == 0, j == 0)
+            slot_masks = [
+                corner,
+                np.logical_not(corner) & ((j == 0) | (i == 0) | (i == nx)),
+                np.logical_or(exy != 0, np.logical_or(i == 0, i == nx)),
+                np.logical_or(exy != 0.0, j == 0),
+            ]
+            slot_dofs = ["3456", "36", "1", "2"]
+            slot_values = [np.zeros_like(u), np.zeros_like(u), u, v]
+            spc_text = self._plate_spc_cards(
+                nodes[i, j], bndry, slot_masks, slot_dofs, slot_values
+            )
 
+            write_bdf(self.bdf_file, mesh_cards + [spc_text, "ENDDATA"])
+
+        self.mesh = self.comm.bcast(self.mesh, root=0)
         self.comm.Barrier()
 
     def _elemCallback(self):
@@ -924,13 +843,37 @@ class UnstiffenedPlateAnalysis:
 
         return elemCallBack
 
+    @property
+    def shell_model(self) -> SparseShellModel:
+        """sparse shell model of the generated mesh for the scipy backend"""
+        if self._shell_model is None or self._shell_model.mesh is not self.mesh:
+            assert self.mesh is not None, "generate the bdf file first"
+            material = CompositeMaterial(
+                E11=self.E11,
+                nu12=self.nu12,
+                E22=self._E22,
+                G12=self._G12,
+                _G23=self._G23,
+                _G13=self._G13,
+                ply_angles=[0.0],
+                ply_fractions=[1.0],
+                symmetric=False,
+            )
+            self._shell_model = SparseShellModel.from_materials(
+                self.mesh, {1: (material, self.h)}
+            )
+        return self._shell_model
+
     def run_static_analysis(self, base_path=None, write_soln=False):
         """
         run a linear static analysis on the flat plate with either isotropic or composite materials
         return the average stresses in the plate => to compute in-plane loads Nx, Ny, Nxy
         """
+        if self.backend == "scipy":
+            return self.shell_model.average_stresses()
 
         # Instantiate FEAAssembler
+        assert pyTACS is not None, "TACS is not installed, use backend='scipy'"
         FEAAssembler = pyTACS(self.bdf_file, comm=self.comm)
 
         # Set up constitutive objects and elements
@@ -943,12 +886,9 @@ class UnstiffenedPlateAnalysis:
         SP = FEAAssembler.createStaticProblem(name="static")
         SP.solve()
         if write_soln:
-            if base_path is None:
-                base_path = os.getcwd()
-            static_folder = os.path.join(base_path, self.static_folder_name)
-            if not os.path.exists(static_folder) and self.comm.rank == 0:
-                os.mkdir(static_folder)
-            SP.writeSolution(outputDir=static_folder)
+            static_folder = self._solution_folder(base_path, self.static_folder_name)
+            if static_folder is not None:
+                SP.writeSolution(outputDir=static_folder)
 
         # test the average stresses routine
         avgStresses = FEAAssembler.assembler.getAverageStresses()
@@ -967,8 +907,20 @@ class UnstiffenedPlateAnalysis:
         run a linear buckling analysis on the flat plate with either isotropic or composite materials
         return the sorted eigenvalues of the plate => would like to include M
         """
+        if self.backend == "scipy":
+            # every proc solves the whole plate, no solution files
+            eigvals, eigvecs, errors = self.shell_model.solve_buckling(
+                sigma=sigma, num_eig=num_eig
+            )
+            self._eigenvectors = list(eigvecs)
+            self._eigenvalues = list(eigvals)
+            self._num_modes = eigvals.shape[0]
+            self._solved_buckling = True
+            self._alphas = {}
+            return eigvals, errors
 
         # Instantiate FEAAssembler
+        assert pyTACS is not None, "TACS is not installed, use backend='scipy'"
         FEAAssembler = pyTACS(self.bdf_file, comm=self.comm)
 
         # Set up constitutive objects and elements
@@ -993,12 +945,9 @@ class UnstiffenedPlateAnalysis:
         if derivatives:
             bucklingProb.evalFunctionsSens(funcsSens)
         if write_soln:
-            if base_path is None:
-                base_path = os.getcwd()
-            buckling_folder = os.path.join(base_path, self.buckling_folder_name)
-            if not os.path.exists(buckling_folder) and self.comm.rank == 0:
-                os.mkdir(buckling_folder)
-            bucklingProb.writeSolution(outputDir=buckling_folder)
+            buckling_folder = self._solution_folder(base_path, self.buckling_folder_name)
+            if buckling_folder is not None:
+                bucklingProb.writeSolution(outputDir=buckling_folder)
 
         # save the eigenvectors for MAC and return errors from function
         self._eigenvectors = []
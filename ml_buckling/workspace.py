@@ -0,0 +1,70 @@
+"""
+Isolated scratch directories for the panel analyses, so several analyses
+can run in one working directory (threads, processes or sub-communicators).
+"""
+__all__ = ["AnalysisWorkspace"]
+
+import os
+import shutil
+import tempfile
+
+
+class AnalysisWorkspace:
+    """
+    unique scratch directory of one analysis, made on rank 0 of the communicator
+    and shared with the other ranks. The directory is removed on cleanup unless keep,
+    in_memory workspaces have no directory and the FEA model is built in memory instead.
+    """
+
+    def __init__(
+        self, comm=None, root=None, prefix="panel_", keep=False, in_memory=False
+    ):
+        self.comm = comm
+        self.keep = keep
+        self.in_memory = in_memory
+
+        path = None
+        if not in_memory and self._rank == 0:
+            if root is not None:
+                os.makedirs(root, exist_ok=True)
+            path = tempfile.mkdtemp(prefix=prefix, dir=root)
+        if comm is not None:
+            path = comm.bcast(path, root=0)
+        self._path = path
+        self._cleaned = False
+
+    @property
+    def _rank(self) -> int:
+        return 0 if self.comm is None else self.comm.rank
+
+    @property
+    def path(self) -> str:
+        """scratch directory, None for in-memory workspaces"""
+        return self._path
+
+    def file(self, name) -> str:
+        """path of a file in the workspace"""
+        assert not self.in_memory, "in-memory workspaces have no files"
+        return os.path.join(self._path, name)
+
+    def cleanup(self):
+        """remove the scratch directory (collective), unless the artifacts are kept"""
+        if self._cleaned:
+            return
+        if self.comm is not None:
+            self.comm.Barrier()
+        if self._rank == 0 and self._path is not None and not self.keep:
+            shutil.rmtree(self._path, ignore_errors=True)
+        self._cleaned = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+        return False
+
+    def __str__(self):
+        if self.in_memory:
+            return "Analysis workspace (in memory)"
+        return f"Analysis workspace {self._path}, keep = {self.keep}"
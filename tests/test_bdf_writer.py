@@ -0,0 +1,95 @@
+import ml_buckling as mlb
+import numpy as np
+import importlib.util, os, tempfile
+import unittest
+
+
+class TestBdfWriter(unittest.TestCase):
+    def test_bulk_cards(self):
+        # compare against the one card at a time formats of the analysis classes
+        np.random.seed(2)
+        xyz = np.random.rand(20, 3)
+        node_ids = np.arange(1, 21)
+        conn = np.random.randint(1, 21, size=(10, 4))
+        dofs = np.random.choice(["36", "3456", "1", "2"], size=20)
+        values = np.random.rand(20) - 0.5
+        wide = np.random.rand(20) < 0.5
+
+        grid_ref = ""
+        spc_ref = ""
+        for i in range(20):
+            grid_ref += "%-8s%16d%16d%16.9e%16.9e*       \n" % (
+                "GRID*",
+                node_ids[i],
+                0,
+                xyz[i, 0],
+                xyz[i, 1],
+            )
+            grid_ref += "*       %16.9e%16d%16s%16d        \n" % (xyz[i, 2], 0, " ", 0)
+            if wide[i]:
+                spc_ref += "%-8s%16d%16d%16s%16.9f\n" % (
+                    "SPC*",
+                    1,
+                    node_ids[i],
+                    dofs[i],
+                    values[i],
+                )
+            else:
+                spc_ref += "%-8s%8d%8d%8s%8.6f\n" % (
+                    "SPC",
+                    1,
+                    node_ids[i],
+                    dofs[i],
+                    values[i],
+                )
+        quad_ref = "".join(
+            "%-8s%8d%8d%8d%8d%8d%8d\n" % ("CQUAD4", ielem + 1, 2, *conn[ielem])
+            for ielem in range(10)
+        )
+
+        assert mlb.grid_cards(node_ids, xyz) == grid_ref
+        assert mlb.spc_cards(node_ids, dofs, values, wide=wide) == spc_ref
+        assert mlb.cquad4_cards(np.arange(1, 11), 2, conn) == quad_ref
+        assert (
+            mlb.rbe2_cards([7], [3], [[4, 5]])
+            == "RBE2           7       3      23       4       5\n"
+        )
+
+    @unittest.skipIf(importlib.util.find_spec("pyNastran") is None, "needs pyNastran")
+    def test_nastran_model(self):
+        # in-memory model has the same cards as the written deck
+        from pyNastran.bdf.bdf import read_bdf
+
+        geometry = mlb.StiffenedPlateGeometry(
+            a=1.0, b=0.6, h=0.01, h_w=0.05, t_w=0.005, num_stiff=2
+        )
+        mesh = mlb.PanelMesh.stiffened(geometry, nx_plate=5, ny_plate=4, nz_stiff=3)
+        spc_nodes = np.arange(1, 6)
+        mesh.set_constraints(
+            spc_nodes,
+            ["36", "1", "2", "3456", "1"],
+            1e-3 * spc_nodes,
+            [100],
+            [1],
+            [[20, 21]],
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bdf_file = os.path.join(tmp_dir, "panel.bdf")
+            mlb.write_bdf(bdf_file, mlb.bdf_deck(mesh))
+            file_model = read_bdf(bdf_file, xref=False, debug=None)
+        model = mlb.nastran_model(mesh)
+
+        assert sorted(model.nodes) == sorted(file_model.nodes)
+        for node_id in model.nodes:
+            assert np.allclose(model.nodes[node_id].xyz, file_model.nodes[node_id].xyz)
+        for elem_id in file_model.elements:
+            assert model.elements[elem_id].nodes == file_model.elements[elem_id].nodes
+        assert model.rigid_elements[100].Gmi == [20, 21]
+        assert model.spcs[1][0].nodes == spc_nodes.tolist()
+        assert [prop.comment for prop in model.properties.values()] == [
+            prop.comment for prop in file_model.properties.values()
+        ]
+
+
+if __name__ == "__main__":
+    unittest.main()
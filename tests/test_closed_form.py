@@ -0,0 +1,127 @@
+import ml_buckling as mlb
+import numpy as np
+import unittest
+from scipy.optimize import fsolve
+
+
+def _loop_Darray(material, h, centroid):
+    """per-ply D11 about the centroid as in StiffenedPlateAnalysis.Darray_plate"""
+    D11 = 0.0
+    zL = -h / 2.0 - centroid
+    for ply_angle, ply_thick in zip(
+        material.ply_angles, material.get_ply_thicknesses(h)
+    ):
+        zU = zL + ply_thick
+        util = mlb.CompositeMaterialUtility(
+            E11=material.E11, E22=material.E22, nu12=material.nu12, G12=material.G12
+        ).rotate_ply(ply_angle)
+        Q11 = util.E11 / (1 - util.nu12 * util.nu21)
+        D11 += 1.0 / 3 * Q11 * (zU ** 3 - zL ** 3)
+        zL = zU * 1.0
+    return D11
+
+
+class TestClosedForm(unittest.TestCase):
+    def setUp(self):
+        self.plate_material = mlb.CompositeMaterial.solvay5320(
+            ply_angles=[0, 90, 45, -45], ply_fractions=[0.4, 0.2, 0.2, 0.2]
+        )
+        self.stiff_material = mlb.CompositeMaterial.solvay5320(
+            ply_angles=[0, 90, 45, -45], ply_fractions=[0.6, 0.1, 0.15, 0.15]
+        )
+
+    def test_offset_laminate(self):
+        h = np.array([0.005, 0.01, 0.02])
+        centroid = np.array([0.0, 0.003, 0.01])
+        _, Darray = mlb.laminate_arrays(self.plate_material, h, z_offset=centroid)
+        for i in range(3):
+            D11 = _loop_Darray(self.plate_material, h[i], centroid[i])
+            assert abs(Darray[0, i] - D11) / D11 < 1e-12
+
+        # extra ply fractions are unused as in the per-ply loop
+        material = mlb.CompositeMaterial.solvay5320(
+            ply_angles=[0, 90], ply_fractions=[0.5] * 4
+        )
+        material.symmetric = False
+        _, Darray = mlb.laminate_arrays(material, h, z_offset=centroid)
+        for i in range(3):
+            D11 = _loop_Darray(material, h[i], centroid[i])
+            assert abs(Darray[0, i] - D11) / D11 < 1e-12
+
+    def test_global_loads(self):
+        np.random.seed(1)
+        xi = np.random.uniform(0.3, 1.5, 20)
+        rho_0 = np.random.uniform(0.2, 10.0, 20)
+        gamma = np.random.uniform(0.0, 20.0, 20)
+
+        lam, m = mlb.global_axial_load(xi, rho_0, gamma)
+        lam_shear = mlb.global_shear_load(xi, rho_0, gamma)
+        for i in range(20):
+            loads = [
+                (1 + gamma[i]) * m1 ** 2 / rho_0[i] ** 2
+                + rho_0[i] ** 2 / m1 ** 2
+                + 2 * xi[i]
+                for m1 in range(1, 50)
+            ]
+            assert abs(lam[i] - min(loads)) < 1e-12
+            assert m[i] == np.argmin(loads) + 1
+
+            # compare to the previous fsolve on the mode parameter
+            s2 = fsolve(
+                lambda s: mlb.closed_form._shear_resid(s, xi[i], gamma[i]), 1.0
+            )[0]
+            s1 = (1.0 + 2.0 * s2 ** 2 * xi[i] + s2 ** 4 + gamma[i]) ** 0.25
+            N12_high = (
+                1.0
+                + gamma[i]
+                + s1 ** 4
+                + 6 * s1 ** 2 * s2 ** 2
+                + s2 ** 4
+                + 2 * xi[i] * (s1 ** 2 + s2 ** 2)
+            ) / (2.0 * s1 ** 2 * s2)
+            N12_ref = max(N12_high, N12_high / rho_0[i] ** 2)
+            assert abs(lam_shear[i] - N12_ref) / N12_ref < 1e-8
+
+    def test_size_stiffeners(self):
+        gamma = np.array([0.5, 2.0, 8.0])
+        a = np.array([1.0, 1.5, 3.0])
+        b = np.array([1.0, 1.0, 1.0])
+        h = np.array([0.005, 0.01, 0.01])
+        sizing = mlb.size_stiffeners(
+            self.plate_material,
+            self.stiff_material,
+            a=a,
+            b=b,
+            h=h,
+            s_p=b / 4,
+            num_stiff=3,
+            gamma=gamma,
+            safety_factor=3.0,
+        )
+        print(f"sizing = {sizing}")
+        assert np.all(sizing["feasible"])
+        assert np.allclose(sizing["gamma"], gamma, rtol=1e-6)
+
+        # crippling is active unless the web reached the max aspect ratio
+        params = mlb.stiffened_panel_parameters(
+            self.plate_material,
+            self.stiff_material,
+            a=a,
+            b=b,
+            h=h,
+            h_w=sizing["h_w"],
+            t_w=sizing["t_w"],
+            s_p=b / 4,
+            num_stiff=3,
+        )
+        crip = mlb.crippling_strain(
+            self.stiff_material, a, sizing["h_w"], sizing["t_w"]
+        )
+        global_strain = sizing["lambda_global"] * params["affine_exx"]
+        active = sizing["stiff_AR"] < 100.0
+        assert np.all(crip >= 3.0 * global_strain * (1 - 1e-6))
+        assert np.allclose(crip[active], 3.0 * global_strain[active], rtol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
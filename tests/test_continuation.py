@@ -0,0 +1,38 @@
+import ml_buckling as mlb
+import numpy as np
+import unittest
+
+
+class TestContinuation(unittest.TestCase):
+    def test_extrapolate_eigenvalue(self):
+        params = [3.0, 2.5, 2.0]
+        eigvals = [p ** 2 + 1.0 for p in params]
+        # exact for quadratic paths, lower order on short paths
+        assert np.isclose(mlb.extrapolate_eigenvalue(params, eigvals, 1.5), 3.25)
+        assert mlb.extrapolate_eigenvalue(params[:1], eigvals[:1], 1.5) == 10.0
+        assert np.isclose(mlb.extrapolate_eigenvalue(params[:2], eigvals[:2], 2.0), 4.5)
+
+    def test_interpolate_modes(self):
+        xi, eta = np.meshgrid(np.linspace(0, 1, 21), np.linspace(0, 1, 11))
+        X = np.stack([xi.ravel(), eta.ravel(), np.zeros(xi.size)], axis=1)
+        mode = np.zeros((X.shape[0], 6))
+        mode[:, 2] = np.sin(np.pi * X[:, 0]) * np.sin(np.pi * X[:, 1])
+
+        # same mode on a finer mesh
+        xi2, eta2 = np.meshgrid(np.linspace(0, 1, 41), np.linspace(0, 1, 21))
+        X2 = np.stack([xi2.ravel(), eta2.ravel(), np.zeros(xi2.size)], axis=1)
+        exact = np.zeros((X2.shape[0], 6))
+        exact[:, 2] = np.sin(np.pi * X2[:, 0]) * np.sin(np.pi * X2[:, 1])
+        exact = exact.ravel() / np.linalg.norm(exact)
+
+        path = mlb.ContinuationPath()
+        assert path.seed(X2) is None and path.shift(1.0) is None
+        path.append(2.0, 4.0, X, mode.ravel())
+        seed = path.seed(X2)
+        assert seed.shape == exact.shape
+        assert abs(np.dot(seed, exact)) > 0.99
+        assert path.shift(1.5) == 4.0
+
+
+if __name__ == "__main__":
+    unittest.main()
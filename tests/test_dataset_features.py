@@ -0,0 +1,90 @@
+import ml_buckling as mlb
+import numpy as np
+import unittest
+
+
+def _loop_outlier_mask(slenderness, Dstar, affine_AR, kx0, bins):
+    """per-bin loop version of the outlier removal in 1_unstiffened_panels/_remove_outliers.py"""
+    slender_bins, Dstar_bins, aff_AR_bins = bins
+    n_data = Dstar.shape[0]
+    global_outlier_mask = np.full((n_data,), False, dtype=bool)
+
+    def in_bin(values, _bins, ibin):
+        lo, hi = _bins[ibin]
+        if ibin < len(_bins) - 1:
+            return np.logical_and(lo <= values, values < hi)
+        return np.logical_and(lo <= values, values <= hi)
+
+    for ibin in range(len(slender_bins)):
+        mask1 = in_bin(slenderness, slender_bins, ibin)
+        for iDstar in range(len(Dstar_bins)):
+            mask2 = np.logical_and(mask1, in_bin(Dstar, Dstar_bins, iDstar))
+            for iAR in range(len(aff_AR_bins)):
+                mask = np.logical_and(mask2, in_bin(affine_AR, aff_AR_bins, iAR))
+                N = np.sum(mask)
+                if N < 5:
+                    continue
+                loc_AR = affine_AR[mask][:, None]
+                t_local = kx0[mask][:, None]
+                X_fit = np.concatenate([np.ones((N, 1)), loc_AR, loc_AR ** 2], axis=1)
+                w_hat = np.linalg.solve(X_fit.T @ X_fit, X_fit.T @ t_local)
+                resids = t_local - X_fit @ w_hat
+                sigma = np.sqrt(np.sum(resids ** 2) / N)
+                outlier_mask = abs(resids[:, 0]) / sigma >= 2.0
+                global_outlier_mask[np.where(mask)[0][outlier_mask]] = True
+    return global_outlier_mask
+
+
+class TestDatasetFeatures(unittest.TestCase):
+    def test_outlier_mask(self):
+        np.random.seed(123)
+        n = 3000
+        slenderness = np.random.uniform(10.0, 200.0, n)
+        Dstar = np.random.uniform(0.0, 1.75, n)
+        affine_AR = np.random.uniform(0.0, 10.0, n)
+        kx0 = 2.0 + 0.5 * affine_AR + np.random.normal(0.0, 0.1, n)
+        kx0[::50] += 3.0  # add some outliers
+
+        slender_bins = [[10.0, 20.0], [20.0, 50.0], [50.0, 100.0], [100.0, 200.0]]
+        Dstar_bins = [[0.25 * i, 0.25 * (i + 1)] for i in range(7)]
+        aff_AR_bins = (
+            [[0.5 * i, 0.5 * (i + 1)] for i in range(4)]
+            + [[1.0 * i, 1.0 * (i + 1)] for i in range(2, 5)]
+            + [[2.0, 10.0]]
+        )
+        bins = (slender_bins, Dstar_bins, aff_AR_bins)
+
+        ref_mask = _loop_outlier_mask(slenderness, Dstar, affine_AR, kx0, bins)
+        mask = mlb.binned_outlier_mask(
+            [slenderness, Dstar, affine_AR], bins, x=affine_AR, y=kx0
+        )
+        print(f"num outliers = {np.sum(mask)}, loop version = {np.sum(ref_mask)}")
+        assert np.sum(ref_mask) > 0
+        assert np.array_equal(mask, ref_mask)
+
+    def test_plate_features(self):
+        materials = np.array(["solvay5320", "hexcelIM7", "victrexAE"])
+        ply_angles = np.array([0.0, 30.0, 45.0])
+        a = np.array([1.0, 2.0, 3.0])
+        b = np.array([0.5, 1.0, 1.5])
+        h = np.array([0.01, 0.01, 0.02])
+        features = mlb.unstiffened_plate_features(materials, ply_angles, a, b, h)
+
+        for i in range(3):
+            props = mlb.material_registry.base_properties(materials[i])
+            util = mlb.CompositeMaterialUtility(*props).rotate_ply(ply_angles[i])
+            denom = 1 - util.nu12 * util.nu21
+            D11 = util.E11 * h[i] ** 3 / 12.0 / denom
+            D22 = util.E22 * h[i] ** 3 / 12.0 / denom
+            D12 = util.nu12 * D22
+            D66 = util.G12 * h[i] ** 3 / 12.0
+            xi = (D12 + 2 * D66) / np.sqrt(D11 * D22)
+            rho_0 = (D22 / D11) ** 0.25 * a[i] / b[i]
+            zeta = 1.0 / (D66 / D11 * (b[i] / h[i]) ** 2)
+            assert abs(features["xi"][i] - xi) / xi < 1e-12
+            assert abs(features["rho_0"][i] - rho_0) / rho_0 < 1e-12
+            assert abs(features["zeta"][i] - zeta) / zeta < 1e-12
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import subprocess
+import sys
+import unittest
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_no_analysis_modules_on_import(self):
+        # check in a fresh interpreter since other tests may have loaded the analysis modules
+        code = (
+            "import sys, ml_buckling as mlb\n"
+            "heavy = ['tacs', 'scipy', 'mpi4py', 'ml_buckling.stiffened_plate_analysis',"
+            " 'ml_buckling.unstiffened_plate_analysis']\n"
+            "print([name for name in heavy if name in sys.modules])\n"
+            "mlb.CompositeMaterial.solvay5320(ply_angles=[0], ply_fractions=[1.0]).Q11\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert output.stdout.strip() == "[]"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import ml_buckling as mlb
+import numpy as np
+import unittest
+
+
+class TestMaterialRegistry(unittest.TestCase):
+    def test_matches_rotate_ply(self):
+        # table lookups and exact off-grid evaluation should match rotate_ply
+        registry = mlb.material_registry
+        for name in registry.material_names:
+            for angle in [0.0, 30.0, 45.0, 12.3456, -60.0, 179.5]:
+                util = mlb.CompositeMaterialUtility(
+                    *registry.base_properties(name)
+                ).rotate_ply(angle)
+                props = registry.rotated_properties(name, angle)
+                for key in ["E11", "E22", "nu12", "G12"]:
+                    ref = getattr(util, key)
+                    assert abs(props[key] - ref) / abs(ref) < 1e-12
+
+    def test_bulk_lookup(self):
+        registry = mlb.material_registry
+        names = np.array(["solvay5320", "hexcelIM7", "solvay5320", "victrexAE"])
+        angles = np.array([0.0, 22.5, 33.3333, 90.0])
+        bulk = registry.lookup(names, angles)
+        for i in range(names.shape[0]):
+            props = registry.rotated_properties(names[i], angles[i])
+            for key in registry.PROPERTY_NAMES:
+                assert abs(bulk[key][i] - props[key]) / abs(props[key]) < 1e-12
+
+    def test_composite_Q_array(self):
+        material = mlb.CompositeMaterial.solvay5320(
+            ply_angles=[0, 45, 90], ply_fractions=[0.5, 0.3, 0.2]
+        )
+        Q_ref = np.zeros((4,))
+        for angle, frac in zip(material.ply_angles, material.ply_fractions):
+            util = mlb.CompositeMaterialUtility(
+                E11=material.E11, E22=material.E22, nu12=material.nu12, G12=material.G12
+            ).rotate_ply(angle)
+            nu_denom = 1 - util.nu12 * util.nu21
+            Q_ref += (
+                np.array(
+                    [util.E11, util.E22 * util.nu12, util.E22, util.G12 * nu_denom]
+                )
+                / nu_denom
+                * frac
+            )
+        rel_err = np.max(np.abs(material.Q_array - Q_ref) / Q_ref)
+        print(f"Q array rel err = {rel_err}")
+        assert rel_err < 1e-12
+
+        # extra ply fractions are unused as in the per-ply loop
+        kwargs = dict(E11=material.E11, E22=material.E22, nu12=material.nu12)
+        kwargs.update(G12=material.G12, ply_angles=[0, 45, 90], symmetric=False)
+        Q_array = mlb.CompositeMaterial(ply_fractions=[0.5, 0.3, 0.2], **kwargs).Q_array
+        extra = mlb.CompositeMaterial(ply_fractions=[0.5, 0.3, 0.2, 0.1], **kwargs)
+        assert np.allclose(extra.Q_array, Q_array, rtol=1e-12)
+
+    def test_unregistered_material(self):
+        # materials outside the registry are evaluated exactly without adding a table
+        registry = mlb.material_registry
+        num_tables = len(registry._tables)
+        for E11 in [100e9, 120e9, 140e9]:
+            material = mlb.CompositeMaterial(E11=E11, E22=8e9, nu12=0.3, G12=5e9)
+            bulk = registry.lookup(material, [0.0, 30.0, 12.3456])
+            for i, angle in enumerate([0.0, 30.0, 12.3456]):
+                util = mlb.CompositeMaterialUtility(
+                    E11=E11, E22=8e9, nu12=0.3, G12=5e9
+                ).rotate_ply(angle)
+                props = registry.rotated_properties(material, angle)
+                for key in ["E11", "E22", "nu12", "G12"]:
+                    ref = getattr(util, key)
+                    assert abs(props[key] - ref) / abs(ref) < 1e-12
+                    assert abs(bulk[key][i] - ref) / abs(ref) < 1e-12
+        assert len(registry._tables) == num_tables
+
+
+if __name__ == "__main__":
+    unittest.main()
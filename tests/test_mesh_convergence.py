@@ -0,0 +1,92 @@
+import ml_buckling as mlb
+import numpy as np
+import os, tempfile
+import unittest
+
+
+class TestMeshConvergence(unittest.TestCase):
+    def test_richardson_extrapolate(self):
+        # exact for a pure power law, also with unequal refinement ratios
+        h = np.array([1.0 / 10, 1.0 / 14, 1.0 / 21])
+        f_ext, order = mlb.richardson_extrapolate(h, 3.0 + 2.0 * h ** 1.7)
+        assert abs(f_ext - 3.0) < 1e-10 and abs(order - 1.7) < 1e-8
+
+        # two meshes use the assumed order
+        f_ext, order = mlb.richardson_extrapolate(h[:2], 3.0 + 2.0 * h[:2] ** 2)
+        assert abs(f_ext - 3.0) < 1e-10 and order == 2.0
+
+    def test_early_stopping_and_cache(self):
+        def solve(nx, ny):
+            h = 1.0 / nx
+            return 4.0 + 5.0 * h ** 2 + 20.0 * h ** 3
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = os.path.join(tmp_dir, "conv.json")
+            study = mlb.MeshConvergence(
+                solve,
+                {"nx": 10, "ny": 10},
+                rtol=1e-4,
+                max_levels=10,
+                cache_file=cache_file,
+            )
+            result = study.run()
+            assert result["converged"]
+            assert study.num_solves == len(result["eigenvalues"]) < 10
+            assert abs(result["extrapolated"] - 4.0) < 1e-3
+
+            # a rerun of the study solves nothing new
+            rerun = mlb.MeshConvergence(
+                solve,
+                {"nx": 10, "ny": 10},
+                rtol=1e-4,
+                max_levels=10,
+                cache_file=cache_file,
+            )
+            assert rerun.run()["eigenvalues"] == result["eigenvalues"]
+            assert rerun.num_solves == 0
+
+            # another study in the same cache file solves its own meshes
+            other = mlb.MeshConvergence(
+                lambda nx, ny: 2.0 * solve(nx, ny),
+                {"nx": 10, "ny": 10},
+                rtol=1e-4,
+                max_levels=10,
+                cache_file=cache_file,
+                study_key="other panel",
+            )
+            assert other.run()["eigenvalues"] == [
+                2.0 * eigval for eigval in result["eigenvalues"]
+            ]
+            assert other.num_solves == len(result["eigenvalues"])
+            rerun = mlb.MeshConvergence(
+                solve,
+                {"nx": 10, "ny": 10},
+                rtol=1e-4,
+                max_levels=10,
+                cache_file=cache_file,
+            )
+            assert rerun.run()["eigenvalues"] == result["eigenvalues"]
+            assert rerun.num_solves == 0
+
+    def test_study_key(self):
+        def plate(h):
+            return mlb.UnstiffenedPlateAnalysis(
+                comm=None,
+                bdf_file="plate.bdf",
+                a=1.0,
+                b=1.0,
+                h=h,
+                E11=70e9,
+                nu12=0.33,
+                backend="scipy",
+            )
+
+        keys = [
+            mlb.MeshConvergence.unstiffened(plate(h), exx=exx).study_key
+            for h, exx in [(0.01, 1e-3), (0.01, 1e-3), (0.02, 1e-3), (0.01, 2e-3)]
+        ]
+        assert keys[0] == keys[1] and len(set(keys)) == 3
+
+
+if __name__ == "__main__":
+    unittest.main()
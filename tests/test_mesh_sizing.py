@@ -0,0 +1,51 @@
+import ml_buckling as mlb
+import numpy as np
+import unittest
+
+
+class TestMeshSizing(unittest.TestCase):
+    def test_resolves_half_waves(self):
+        material = mlb.CompositeMaterial.solvay5320(
+            ply_angles=[0, 90, 0], ply_fractions=[0.4, 0.2, 0.4]
+        )
+        for a in [0.5, 1.0, 3.0, 10.0]:
+            for num_stiff in [1, 3, 5]:
+                geometry = mlb.StiffenedPlateGeometry(
+                    a=a, b=1.0, h=0.01, h_w=0.05, t_w=0.005, num_stiff=num_stiff
+                )
+                for shear in [False, True]:
+                    waves = mlb.predicted_half_waves(
+                        material, material, geometry, shear=shear
+                    )
+                    sizes = mlb.panel_mesh_sizes(
+                        material, material, geometry, shear=shear
+                    )
+                    m_max = max(waves["m_global"], waves["m_local"])
+                    assert (sizes["nx_plate"] - 1) / m_max >= 8
+                    assert sizes["ny_plate"] - 1 >= 8
+                    dx = a / (sizes["nx_plate"] - 1)
+                    dy = geometry.s_p / (sizes["ny_plate"] - 1)
+                    assert max(dx / dy, dy / dx) <= 3.0 + 1e-12
+
+        # longer panels have more local half-waves
+        waves = [
+            mlb.predicted_half_waves(
+                material,
+                material,
+                mlb.StiffenedPlateGeometry(
+                    a=a, b=1.0, h=0.01, h_w=0.05, t_w=0.005, num_stiff=3
+                ),
+            )["m_local"]
+            for a in [1.0, 2.0, 4.0]
+        ]
+        assert waves[0] < waves[1] < waves[2]
+
+    def test_mode_half_waves(self):
+        xi = np.linspace(0.0, 1.0, 41)
+        np.random.shuffle(xi)
+        for m in [1, 2, 5]:
+            assert mlb.mode_half_waves(xi, np.sin(m * np.pi * xi)) == m
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+import ml_buckling as mlb
+import numpy as np
+import os, tempfile
+import unittest
+
+
+def _loop_mesh(geometry, nx_plate, ny_plate, nz_stiff, nx_stiff_mult):
+    """linear search mesher from the original StiffenedPlateAnalysis.pre_analysis"""
+    nodes = []
+    conn = []
+    part_ids = []
+
+    def add_node_at(x, y, z):
+        for node in nodes:
+            if abs(node[0] - x) < 1e-10 and abs(node[1] - y) < 1e-10:
+                if abs(node[2] - z) < 1e-10:
+                    return node[3]
+        nodes.append((x, y, z, len(nodes) + 1))
+        return len(nodes)
+
+    def add_element(x_list, y_list, z_list, part_id):
+        conn.append([add_node_at(*xyz) for xyz in zip(x_list, y_list, z_list)])
+        part_ids.append(part_id)
+
+    N = geometry.num_local
+    for ilocal in range(N):
+        if ilocal == 0:
+            ystart = 0
+        elif ilocal == 1:
+            ystart += geometry.boundary_s_p
+        else:
+            ystart += geometry.s_p
+        Ly = geometry.s_p if not (ilocal in [0, N - 1]) else geometry.boundary_s_p
+        dx = geometry.a / (nx_plate - 1)
+        dy = Ly / (ny_plate - 1)
+        for iy in range(ny_plate - 1):
+            y1 = dy * iy + ystart
+            y2 = y1 + dy
+            for ix in range(nx_plate - 1):
+                x1 = dx * ix
+                x2 = x1 + dx
+                add_element([x1, x2, x2, x1], [y1, y1, y2, y2], [0.0] * 4, 1)
+        if ilocal == N - 1:
+            continue
+        dz = geometry.h_w / (nz_stiff - 1)
+        dx_stiff = dx / nx_stiff_mult
+        for iz in range(nz_stiff - 1):
+            z1 = iz * dz
+            z2 = z1 + dz
+            for ix in range(nx_plate - 1):
+                for istiff_mult in range(nx_stiff_mult):
+                    x1 = dx * ix + istiff_mult * dx_stiff
+                    x2 = x1 + dx_stiff
+                    add_element(
+                        [x1, x2, x2, x1], [ystart + Ly] * 4, [z1, z1, z2, z2], 2
+                    )
+    xyz = np.array([node[:3] for node in nodes])
+    return xyz, np.array(conn), np.array(part_ids)
+
+
+class TestPanelMesh(unittest.TestCase):
+    def test_matches_loop_mesher(self):
+        geometries = [
+            mlb.StiffenedPlateGeometry(
+                a=1.0, b=0.6, h=0.01, h_w=0.05, t_w=0.005, num_stiff=3
+            ),
+            mlb.StiffenedPlateGeometry(
+                a=2.0, b=1.0, h=0.01, h_w=0.04, t_w=0.005, s_p=0.3
+            ),
+            mlb.StiffenedPlateGeometry(
+                a=1.0, b=1.0, h=0.01, h_w=0.05, t_w=0.005, num_stiff=0
+            ),
+        ]
+        for geometry in geometries:
+            settings = dict(nx_plate=7, ny_plate=5, nz_stiff=4, nx_stiff_mult=2)
+            xyz, conn, part_ids = _loop_mesh(geometry, **settings)
+            mesh = mlb.PanelMesh.stiffened(geometry, **settings)
+            assert np.array_equal(mesh.conn, conn)
+            assert np.array_equal(mesh.part_ids, part_ids)
+            assert np.allclose(mesh.xyz, xyz, atol=1e-12)
+            assert np.allclose(
+                mesh.stiff_locations, geometry.spec.stiff_locations, atol=1e-12
+            )
+
+    def test_node_sets_match_masks(self):
+        geometry = mlb.StiffenedPlateGeometry(
+            a=1.0, b=0.6, h=0.01, h_w=0.05, t_w=0.005, num_stiff=3
+        )
+        mesh = mlb.PanelMesh.stiffened(
+            geometry, nx_plate=7, ny_plate=5, nz_stiff=4, nx_stiff_mult=2
+        )
+        x, y, z = mesh.xyz.T
+        node_sets = mlb.PanelNodeSets(
+            x, y, z, a=1.0, b=0.6, stiff_locations=mesh.stiff_locations
+        )
+
+        def in_tol(val1, val2):
+            return np.abs(val1 - val2) < 1e-5
+
+        on_bndry = in_tol(x, 0.0) | in_tol(x, 1.0) | in_tol(y, 0.0) | in_tol(y, 0.6)
+        assert np.array_equal(node_sets.x_right, np.nonzero(in_tol(x, 1.0))[0])
+        assert np.array_equal(node_sets.boundary, np.nonzero(on_bndry)[0])
+        assert np.array_equal(node_sets.skin, np.nonzero(in_tol(z, 0.0))[0])
+        for istiff, yval in enumerate(mesh.stiff_locations):
+            line = np.nonzero(in_tol(y, yval))[0]
+            assert np.array_equal(node_sets.stiff_lines[istiff], line)
+            end = np.nonzero(on_bndry & in_tol(y, yval) & in_tol(x, 0.0))[0]
+            assert np.array_equal(node_sets.line_end(istiff, 0.0), end)
+        roots = np.any([in_tol(y, yval) for yval in mesh.stiff_locations], axis=0)
+        assert np.array_equal(
+            node_sets.stiffener_roots, np.nonzero(roots & in_tol(z, 0.0))[0]
+        )
+        ind = node_sets.nearest(0.2, 0.3)
+        assert ind == np.argmin(np.abs(x - 0.2) + np.abs(y - 0.3) + np.abs(z))
+
+    def test_template_cache_scaling(self):
+        settings = dict(nx_plate=7, ny_plate=5, nz_stiff=4, nx_stiff_mult=2)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = mlb.MeshTemplateCache(cache_dir=cache_dir)
+            for a, b, h_w in [(1.0, 0.6, 0.05), (2.5, 1.1, 0.02), (0.7, 0.3, 0.08)]:
+                geometry = mlb.StiffenedPlateGeometry(
+                    a=a, b=b, h=0.01, h_w=h_w, t_w=0.005, num_stiff=3
+                )
+                mesh, node_sets = cache.get(geometry, **settings)
+                ref_mesh = mlb.PanelMesh.stiffened(geometry, **settings)
+                ref_sets = mlb.PanelNodeSets(
+                    *ref_mesh.xyz.T, a=a, b=b, stiff_locations=ref_mesh.stiff_locations
+                )
+                assert np.array_equal(mesh.conn, ref_mesh.conn)
+                assert np.allclose(mesh.xyz, ref_mesh.xyz, atol=1e-12)
+                assert np.array_equal(node_sets.boundary, ref_sets.boundary)
+                assert np.array_equal(node_sets.line_end(2, a), ref_sets.line_end(2, a))
+            assert cache.misses == 1 and cache.hits == 2
+
+            # templates are reloaded from the npz files in a new cache
+            disk_cache = mlb.MeshTemplateCache(cache_dir=cache_dir)
+            mesh, node_sets = disk_cache.get(geometry, **settings)
+            assert disk_cache.hits == 1
+            assert np.allclose(mesh.xyz, ref_mesh.xyz, atol=1e-12)
+            assert np.array_equal(node_sets.stiffener_roots, ref_sets.stiffener_roots)
+
+    def test_save_load(self):
+        geometry = mlb.StiffenedPlateGeometry(
+            a=1.0, b=0.6, h=0.01, h_w=0.05, t_w=0.005, num_stiff=2
+        )
+        mesh = mlb.PanelMesh.stiffened(geometry, nx_plate=5, ny_plate=4, nz_stiff=3)
+        mesh.set_constraints(
+            [1, 2, 3],
+            ["36", "1", "2"],
+            [0.0, 1e-3, -2e-3],
+            rbe_elem_ids=[100, 101],
+            rbe_control_nodes=[1, 4],
+            rbe_dependent_nodes=[[20, 21], [22]],
+            spc_wide=[False, True, True],
+        )
+        mesh.nondim_xyz = mesh.xyz / np.array([1.0, 0.6, 0.05])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "panel.npz")
+            mesh.save(filename)
+            loaded = mlb.PanelMesh.load(filename)
+            bdf_file = os.path.join(tmp_dir, "panel.bdf")
+            mlb.write_bdf(bdf_file, mlb.bdf_deck(mesh))
+            assert os.path.getsize(filename) < os.path.getsize(bdf_file)
+
+        assert "".join(mlb.bdf_deck(loaded)) == "".join(mlb.bdf_deck(mesh))
+        assert np.array_equal(loaded.nondim_xyz, mesh.nondim_xyz)
+        assert np.array_equal(loaded.spc_wide, mesh.spc_wide)
+        assert [_.tolist() for _ in loaded.rbe_dependent_nodes] == [[20, 21], [22]]
+
+    def test_caps_mesh_cache(self):
+        geometry = mlb.StiffenedPlateGeometry(
+            a=1.0, b=0.6, h=0.01, h_w=0.05, t_w=0.005, num_stiff=2
+        )
+        mesh = mlb.PanelMesh.stiffened(geometry, nx_plate=5, ny_plate=4, nz_stiff=3)
+        mesh.set_constraints([1], ["36"], [0.0])
+        with tempfile.TemporaryDirectory() as cache_dir:
+            csm_file = os.path.join(cache_dir, "panel.csm")
+            with open(csm_file, "w") as fp:
+                fp.write("despmtr a 1.0\n")
+            cache = mlb.CapsMeshCache(cache_dir)
+            key = cache.key(geometry, csm_file, global_mesh_size=0.1, edge_pt_min=5)
+            assert cache.load(key) is None and cache.misses == 1
+            cache.store(key, mesh)
+            loaded = cache.load(key)
+            assert cache.hits == 1
+            assert np.array_equal(loaded.conn, mesh.conn)
+            assert np.array_equal(loaded.xyz, mesh.xyz)
+            # constraints are made by each analysis, not cached
+            assert loaded.spc_node_ids.shape[0] == 0
+
+            # other mesh settings or design parameters give new keys
+            assert key != cache.key(geometry, csm_file, global_mesh_size=0.2)
+            assert key in cache
+            geometry.h_w = 0.06
+            assert (
+                cache.key(geometry, csm_file, global_mesh_size=0.1, edge_pt_min=5)
+                not in cache
+            )
+
+    def test_clipped_mirror_modes(self):
+        geometry = mlb.StiffenedPlateGeometry(
+            a=1.2, b=0.8, h=0.01, h_w=0.05, t_w=0.005, num_stiff=2
+        )
+        mesh = mlb.PanelMesh.stiffened(geometry, nx_plate=11, ny_plate=5, nz_stiff=3)
+        scales = np.array([1.2, 0.8, 0.05])
+        full_X = mesh.xyz / scales
+        quarter, full_nodes = mesh.clipped(x_max=0.6, y_max=0.4)
+        assert 4 * quarter.num_elements == mesh.num_elements
+        assert np.array_equal(quarter.xyz, mesh.xyz[full_nodes])
+        assert np.all(quarter.conn <= quarter.num_nodes)
+
+        # (2, 1) mode is antisymmetric about xi = 1/2, symmetric about eta = 1/2
+        X = quarter.xyz / scales
+        exact = np.zeros((mesh.num_nodes, 6))
+        exact[:, 2] = np.sin(2 * np.pi * full_X[:, 0]) * np.sin(np.pi * full_X[:, 1])
+        exact[:, 4] = np.cos(2 * np.pi * full_X[:, 0]) * np.sin(np.pi * full_X[:, 1])
+        exact[:, 0] = -np.cos(2 * np.pi * full_X[:, 0]) * full_X[:, 2]
+        mode = exact[full_nodes].ravel()
+        mirrored = mlb.mirror_modes(X, full_X, [mode], {"x": "A", "y": "S"})[0]
+        assert np.allclose(mirrored, exact.ravel())
+        assert not np.allclose(
+            mlb.mirror_modes(X, full_X, [mode], {"x": "S", "y": "S"})[0], exact.ravel()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import ml_buckling as mlb
+import numpy as np
+import unittest
+
+
+class TestRayleighRitz(unittest.TestCase):
+    def test_smeared_axial_closed_form(self):
+        # sine terms are exact for smeared stiffeners under axial load
+        rho_0 = np.geomspace(0.3, 5.0, 7)
+        gamma = np.array([0.0, 1.0, 5.0])[:, None]
+        eigvals = mlb.rayleigh_ritz_buckling(rho_0, 0.8, gamma)
+        assert eigvals.shape == (3, 7, 1)
+        closed_form, _ = mlb.global_axial_load(0.8, rho_0, gamma)
+        assert np.allclose(eigvals[..., 0], closed_form, rtol=1e-12)
+
+    def test_isotropic_square_shear(self):
+        # classical k_s = 9.34 of a simply supported square plate
+        eigval = mlb.rayleigh_ritz_buckling(1.0, 1.0, axial=False, m_max=12, n_max=12)
+        assert abs(eigval[0] - 9.33) / 9.33 < 0.01
+
+    def test_discrete_stiffeners(self):
+        smeared = mlb.rayleigh_ritz_buckling(1.0, 1.0, 2.0, 0.5)[0]
+        for num_stiff in [1, 3, 9]:
+            eigvals = mlb.rayleigh_ritz_buckling(
+                1.0, 1.0, 2.0, 0.5, num_stiff=num_stiff, num_eig=3
+            )
+            # the n = 1 global mode sees the stiffeners like smeared ones
+            assert abs(eigvals[0] - smeared) < 1e-10
+            assert np.all(np.diff(eigvals) >= 0.0)
+
+    def test_transverse_shear_lowers_load(self):
+        eigvals = mlb.rayleigh_ritz_buckling(1.0, 1.0, zeta=[0.0, 0.01, 0.05])[:, 0]
+        assert np.all(np.diff(eigvals) < 0.0)
+
+    def test_modes(self):
+        eigvals, modes, basis = mlb.rayleigh_ritz_buckling(
+            2.0, 1.0, 1.0, num_eig=2, m_max=6, n_max=4, return_modes=True
+        )
+        assert modes.shape == (2, 24) and basis.shape == (24, 2)
+        assert np.allclose(eigvals, [5.0, 6.5])
+        assert tuple(basis[np.argmax(np.abs(modes[0]))]) == (2, 1)
+        assert tuple(basis[np.argmax(np.abs(modes[1]))]) == (1, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
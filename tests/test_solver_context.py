@@ -0,0 +1,102 @@
+import ml_buckling as mlb
+import numpy as np
+from types import SimpleNamespace
+import unittest
+
+
+def _panel(a=1.0, b=0.6, h_w=0.05, exx=1e-3, t_w=0.005, isotropic=False):
+    geometry = mlb.StiffenedPlateGeometry(
+        a=a, b=b, h=0.01, h_w=h_w, t_w=t_w, num_stiff=2
+    )
+    if isotropic:
+        material = mlb.CompositeMaterial(E11=70e9, nu12=0.3, material_name="aluminum")
+    else:
+        material = mlb.CompositeMaterial.solvay5320(
+            ply_angles=[0, 90], ply_fractions=[0.5, 0.5]
+        )
+    mesh = mlb.PanelMesh.stiffened(geometry, nx_plate=5, ny_plate=4, nz_stiff=3)
+    x_right = np.where(np.abs(mesh.xyz[:, 0] - a) < 1e-8)[0]
+    mesh.set_constraints(
+        mesh.node_ids[x_right], "1", -exx * a * np.ones(x_right.shape[0])
+    )
+    return SimpleNamespace(
+        mesh=mesh,
+        geometry=geometry,
+        plate_material=material,
+        stiffener_material=material,
+        _thickness_dvs={0: "panel", 1: "base", 2: "stiff"} if isotropic else {},
+    )
+
+
+class _Problem:
+    def __init__(self, xyz):
+        self.nodes = xyz.ravel().copy()
+
+    def getNodes(self):
+        return self.nodes.copy()
+
+    def setNodes(self, nodes):
+        self.nodes = nodes.copy()
+
+    def setDesignVars(self, x):
+        self.design_vars = x.copy()
+
+
+class TestSolverContext(unittest.TestCase):
+    def test_reuse_and_rebuild(self):
+        context = mlb.TacsSolverContext()
+        build = lambda: SimpleNamespace()
+
+        assert context.prepare(_panel(), build) == 1.0
+        assembler = context.fea_assembler
+        # same topology, scaled panel and proportional bcs reuse the assembler
+        c = context.prepare(_panel(a=1.5, h_w=0.07, exx=2e-3), build)
+        assert np.isclose(c, 3.0)
+        assert context.fea_assembler is assembler
+        assert context.num_builds == 1 and context.num_reuses == 1
+
+        # kept problems get the scaled nodes
+        panel = _panel(a=1.5, h_w=0.07, exx=2e-3)
+        context.fea_assembler.createStaticProblem = lambda name: _Problem(
+            _panel().mesh.xyz
+        )
+        problem = context.static_problem()
+        assert np.allclose(problem.getNodes().reshape((-1, 3)), panel.mesh.xyz)
+        assert context.static_problem() is problem
+
+        # new thicknesses are not in place updates
+        context.prepare(_panel(t_w=0.006), build)
+        assert context.fea_assembler is not assembler
+        assert context.num_builds == 2
+
+        # non-proportional bcs rebuild
+        panel = _panel(t_w=0.006)
+        panel.mesh.spc_values[0] *= 2.0
+        context.prepare(panel, build)
+        assert context.num_builds == 3
+
+    def test_isotropic_thickness_in_place(self):
+        context = mlb.TacsSolverContext()
+        build = lambda: SimpleNamespace(
+            getOrigDesignVars=lambda: np.array([0.01, 0.015, 0.005]),
+            getGlobalToLocalDVNums=lambda: {0: 0, 1: 1, 2: 2},
+            createStaticProblem=lambda name: _Problem(_panel().mesh.xyz),
+        )
+
+        context.prepare(_panel(isotropic=True), build)
+        assembler = context.fea_assembler
+        problem = context.static_problem()
+        assert not hasattr(problem, "design_vars")
+
+        # new isotropic thicknesses are set as design variables of the kept problems
+        panel = _panel(t_w=0.006, isotropic=True)
+        context.prepare(panel, build)
+        assert context.fea_assembler is assembler
+        assert context.num_builds == 1 and context.num_reuses == 1
+        assert context.static_problem() is problem
+        t_base = panel.geometry.h + panel.geometry.t_b
+        assert np.allclose(problem.design_vars, [0.01, t_base, 0.006])
+
+
+if __name__ == "__main__":
+    unittest.main()
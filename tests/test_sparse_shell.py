@@ -0,0 +1,200 @@
+import ml_buckling as mlb
+import numpy as np
+import unittest
+from mpi4py import MPI
+
+comm = MPI.COMM_WORLD
+
+
+class TestSparseShell(unittest.TestCase):
+    def test_laminate(self):
+        E, nu, h = 70e9, 0.33, 0.01
+        material = mlb.CompositeMaterial(E11=E, nu12=nu)
+        ABD, As = mlb.shell_laminate(material, h)
+        assert abs(ABD[0, 0] - E * h / (1 - nu ** 2)) / ABD[0, 0] < 1e-12
+        assert abs(ABD[3, 3] - E * h ** 3 / 12 / (1 - nu ** 2)) / ABD[3, 3] < 1e-12
+        assert abs(As[0, 0] - 5.0 / 6.0 * E / 2 / (1 + nu) * h) / As[0, 0] < 1e-12
+
+        # symmetric balanced laminate, no extension-bending or shear-extension coupling
+        material = mlb.CompositeMaterial.solvay5320(
+            ply_angles=[0, 90, 45, -45], ply_fractions=[0.4, 0.2, 0.2, 0.2]
+        )
+        ABD, _ = mlb.shell_laminate(material, h)
+        assert np.allclose(ABD, ABD.T)
+        assert np.max(np.abs(ABD[:3, 3:])) < 1e-12 * ABD[3, 3]
+        assert np.max(np.abs(ABD[:2, 2])) < 1e-12 * ABD[0, 0]
+
+    def test_unstiffened_abaqus(self):
+        # simply supported plate in uniaxial compression, see test_abaqus_unstiffened_buckle
+        with mlb.AnalysisWorkspace() as workspace:
+            flat_plate = mlb.UnstiffenedPlateAnalysis(
+                comm=comm,
+                bdf_file="plate.bdf",
+                a=1.0,
+                b=0.7,
+                h=0.07,
+                E11=70e9,
+                nu12=0.33,
+                workspace=workspace,
+                backend="scipy",
+            )
+            flat_plate.generate_bdf(nx=30, ny=20, exx=0.001, clamped=False)
+            eigvals, errors = flat_plate.run_buckling_analysis(sigma=30.0, num_eig=6)
+        abaqus_eigvals = np.array([36.083, 38.000, 51.634, 72.896, 96.711, 113.94])
+        assert np.max(np.abs(eigvals - abaqus_eigvals) / abaqus_eigvals) < 0.01
+        assert np.max(errors) < 1e-6
+        assert len(flat_plate.get_eigenvector(0)) == 31 * 21
+
+    def test_stiffened_panel(self):
+        material = mlb.CompositeMaterial(
+            E11=70e9, nu12=0.33, ply_angles=[0], ply_fractions=[1.0]
+        )
+        workspace = mlb.AnalysisWorkspace(in_memory=True)
+        for num_stiff in [0, 1]:
+            geometry = mlb.StiffenedPlateGeometry(
+                a=1.0, b=1.0, h=0.01, h_w=0.03, t_w=0.004, num_stiff=num_stiff
+            )
+            analysis = mlb.StiffenedPlateAnalysis(
+                comm=comm,
+                geometry=geometry,
+                plate_material=material,
+                stiffener_material=material,
+                workspace=workspace,
+                backend="scipy",
+            )
+            analysis.pre_analysis(
+                nx_plate=21, ny_plate=11, nz_stiff=4, exx=analysis.affine_exx
+            )
+            eigvals, errors = analysis.run_buckling_analysis(sigma=3.0, num_eig=4)
+            analysis.post_analysis()
+            assert np.all(np.diff(eigvals) >= 0.0) and np.max(errors) < 1e-6
+            assert analysis.min_global_mode_eigenvalue is not None
+            if num_stiff == 0:
+                # m = n = 1 mode of the square plate
+                assert abs(eigvals[0] - 4.0) / 4.0 < 0.02
+
+            # compressed panel skin
+            stresses = analysis.run_static_analysis()
+            assert stresses[0] < 0.0 and abs(stresses[2]) < 1e-6 * abs(stresses[0])
+
+            # one assembly and factorization for both solves
+            stresses2, eigvals2, errors2 = analysis.run_static_buckling_analysis(
+                num_eig=4
+            )
+            assert np.allclose(stresses2, stresses)
+            assert np.allclose(eigvals2, eigvals, rtol=1e-6)
+            assert np.max(errors2) < 1e-6
+
+    def test_eigvec_storage(self):
+        material = mlb.CompositeMaterial(
+            E11=70e9, nu12=0.33, ply_angles=[0], ply_fractions=[1.0]
+        )
+        geometry = mlb.StiffenedPlateGeometry(
+            a=1.0, b=1.0, h=0.01, h_w=0.03, t_w=0.004, num_stiff=1
+        )
+        analyses = {}
+        for storage, dtype in [("full", np.float64), ("w", np.float32)]:
+            analysis = mlb.StiffenedPlateAnalysis(
+                comm=comm,
+                geometry=geometry,
+                plate_material=material,
+                stiffener_material=material,
+                backend="scipy",
+                eigvec_storage=storage,
+                eigvec_dtype=dtype,
+            )
+            analysis.pre_analysis(
+                nx_plate=21, ny_plate=11, nz_stiff=4, exx=analysis.affine_exx
+            )
+            analysis.run_buckling_analysis(sigma=3.0, num_eig=6)
+            analysis.post_analysis()
+            analyses[storage] = analysis
+        full, w_only = analyses["full"], analyses["w"]
+
+        # one real float32 array of the w dofs, same modes and classification
+        assert w_only._eigenvectors.dtype == np.float32
+        assert w_only._eigenvectors.flags["C_CONTIGUOUS"]
+        assert w_only._eigenvectors.nbytes * 12 == full._eigenvectors.nbytes
+        for imode in range(full.num_modes):
+            w = full.get_eigenvector(imode)
+            assert np.allclose(
+                np.abs(w_only.get_eigenvector(imode)), np.abs(w), atol=1e-5
+            )
+        assert w_only.global_modes == full.global_modes
+        with self.assertRaises(AssertionError):
+            w_only.get_eigenvector(0, uvw=True)
+
+    def test_symmetric_buckling(self):
+        material = mlb.CompositeMaterial(
+            E11=70e9, nu12=0.33, ply_angles=[0], ply_fractions=[1.0]
+        )
+        geometry = mlb.StiffenedPlateGeometry(
+            a=1.0, b=1.0, h=0.01, h_w=0.03, t_w=0.004, num_stiff=0
+        )
+        analysis = mlb.StiffenedPlateAnalysis(
+            comm=comm,
+            geometry=geometry,
+            plate_material=material,
+            stiffener_material=material,
+            backend="scipy",
+        )
+        mesh_kwargs = dict(
+            nx_plate=21, ny_plate=11, nz_stiff=4, exx=analysis.affine_exx
+        )
+        analysis.pre_analysis(**mesh_kwargs)
+        full_eigvals, _ = analysis.run_buckling_analysis(sigma=1.0, num_eig=12)
+
+        # the half and quarter panel modes are modes of the full panel
+        for planes in ["x", "y", "xy"]:
+            eigvals, _ = analysis.run_symmetric_buckling_analysis(
+                planes=planes, sigma=1.0, num_eig=4, **mesh_kwargs
+            )
+            assert abs(eigvals[0] - full_eigvals[0]) / full_eigvals[0] < 1e-3
+            for eigval in eigvals:
+                assert np.min(np.abs(full_eigvals - eigval)) / eigval < 1e-3
+
+        for symmetry in [{"x": "A"}, {"y": "A"}]:
+            with self.assertRaises(AssertionError):
+                analysis.pre_analysis(**mesh_kwargs, symmetry=symmetry)
+
+    def test_continuation_start_vector(self):
+        material = mlb.CompositeMaterial(
+            E11=70e9, nu12=0.33, ply_angles=[0], ply_fractions=[1.0]
+        )
+        path = mlb.ContinuationPath()
+        for a in [1.0, 1.1, 1.2]:
+            geometry = mlb.StiffenedPlateGeometry(
+                a=a, b=1.0, h=0.01, h_w=0.03, t_w=0.004, num_stiff=1
+            )
+            eigvals = []
+            for seeded in [False, True]:
+                analysis = mlb.StiffenedPlateAnalysis(
+                    comm=comm,
+                    geometry=geometry,
+                    plate_material=material,
+                    stiffener_material=material,
+                    backend="scipy",
+                    eigvec_storage="w",
+                )
+                analysis.pre_analysis(
+                    nx_plate=21, ny_plate=11, nz_stiff=4, exx=analysis.affine_exx
+                )
+                if seeded:
+                    # the w-only path mode starts the Lanczos iterations
+                    eigvals += [analysis.run_continuation_buckling_analysis(path, a)]
+                else:
+                    eigvals += [analysis.run_guided_buckling_analysis(num_eig=10)]
+            assert abs(eigvals[1] - eigvals[0]) / eigvals[0] < 1e-6
+        assert len(path) == 3
+
+        # the same eigenpairs from a start vector
+        model = analysis.shell_model
+        cold_eigvals, eigvecs, _ = model.solve_buckling(sigma=5.0, num_eig=4)
+        warm_eigvals, _, errors = model.solve_buckling(
+            sigma=5.0, num_eig=4, v0=eigvecs[0]
+        )
+        assert np.allclose(warm_eigvals, cold_eigvals) and np.max(errors) < 1e-6
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import ml_buckling as mlb
+import pickle
+import unittest
+
+
+class TestValueTypes(unittest.TestCase):
+    def test_material_spec(self):
+        material = mlb.CompositeMaterial.solvay5320(
+            ply_angles=[0, 45, 90], ply_fractions=[0.4, 0.4, 0.2], ref_axis=[1, 0, 0]
+        )
+        same = mlb.CompositeMaterial.solvay5320(
+            ply_angles=[0, 45, 90], ply_fractions=[0.4, 0.4, 0.2], ref_axis=[1, 0, 0]
+        )
+        spec = material.spec
+        assert spec == same.spec and hash(spec) == hash(same.spec)
+        assert list(material.ply_angles) == [0, 45, 90, 90, 45, 0]
+        assert material.num_plies == 6
+        assert pickle.loads(pickle.dumps(spec)) == spec
+        assert mlb.CompositeMaterial.from_spec(spec).spec == spec
+
+        # facade changes give a new spec, the spec itself is frozen
+        same.E11 *= 1.01
+        assert same.spec != spec
+        with self.assertRaises(AttributeError):
+            spec.E11 = 1.0
+
+    def test_geometry_spec(self):
+        geometry = mlb.StiffenedPlateGeometry(
+            a=1.0, b=1.0, h=0.01, h_w=0.05, t_w=0.005, num_stiff=3
+        )
+        spec = geometry.spec
+        cache = {spec: "result"}
+        assert cache[mlb.StiffenedPlateGeometry.copy(geometry).spec] == "result"
+        assert spec.num_stiff == 3 and abs(spec.s_p - 0.25) < 1e-12
+        assert pickle.loads(pickle.dumps(spec)) == spec
+
+        geometry.h_w = 0.06
+        assert geometry.spec != spec
+        with self.assertRaises(AttributeError):
+            spec.h_w = 0.06
+
+
+if __name__ == "__main__":
+    unittest.main()
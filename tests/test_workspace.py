@@ -0,0 +1,70 @@
+import ml_buckling as mlb
+import os
+import tempfile
+import unittest
+from mpi4py import MPI
+
+
+class TestWorkspace(unittest.TestCase):
+    def test_unique_dirs_and_cleanup(self):
+        with tempfile.TemporaryDirectory() as root:
+            ws1 = mlb.AnalysisWorkspace(root=root)
+            ws2 = mlb.AnalysisWorkspace(root=root)
+            assert ws1.path != ws2.path
+            assert os.path.dirname(ws1.file("plate.bdf")) == ws1.path
+
+            with open(ws1.file("plate.bdf"), "w") as fp:
+                fp.write("ENDDATA\n")
+            ws1.cleanup()
+            assert not os.path.exists(ws1.path)
+
+            # kept workspaces retain their artifacts
+            with mlb.AnalysisWorkspace(root=root, keep=True) as ws3:
+                pass
+            assert os.path.isdir(ws3.path)
+            ws2.cleanup()
+
+    def test_in_memory(self):
+        ws = mlb.AnalysisWorkspace(in_memory=True)
+        assert ws.path is None
+        self.assertRaises(AssertionError, ws.file, "plate.bdf")
+        ws.cleanup()
+
+    def test_solution_folder(self):
+        # in-memory workspaces write no solution files unless given a base_path
+        material = mlb.CompositeMaterial(E11=70e9, nu12=0.33)
+        geometry = mlb.StiffenedPlateGeometry(
+            a=1.0, b=1.0, h=0.01, h_w=0.03, t_w=0.004, num_stiff=0
+        )
+        flat_plate = mlb.UnstiffenedPlateAnalysis(
+            comm=MPI.COMM_WORLD,
+            bdf_file="plate.bdf",
+            a=1.0,
+            b=1.0,
+            h=0.01,
+            E11=70e9,
+            nu12=0.33,
+            workspace=mlb.AnalysisWorkspace(in_memory=True),
+        )
+        stiff_analysis = mlb.StiffenedPlateAnalysis(
+            comm=MPI.COMM_WORLD,
+            geometry=geometry,
+            plate_material=material,
+            stiffener_material=material,
+            workspace=mlb.AnalysisWorkspace(in_memory=True),
+        )
+        with tempfile.TemporaryDirectory() as root:
+            for analysis in [flat_plate, stiff_analysis]:
+                assert analysis._solution_folder(None, "_buckling") is None
+                folder = analysis._solution_folder(root, "_buckling")
+                assert folder == os.path.join(root, "_buckling")
+                assert os.path.isdir(folder)
+
+            with mlb.AnalysisWorkspace(root=root) as ws:
+                stiff_analysis.workspace = ws
+                folder = stiff_analysis._solution_folder(None, "_static")
+                assert os.path.dirname(folder) == ws.path and os.path.isdir(folder)
+
+
+if __name__ == "__main__":
+    unittest.main()